@@ -1,7 +1,13 @@
 import streamlit as st
 import datetime
-from utils_github import GithubDataHandler
-from utils_ai import fetch_and_analyze_news
+from utils_github import get_shared_handler
+from utils_schema import article_display_text, group_articles, group_briefings, migrate_day
+from utils_archive import count_days, load_archive_index, load_archive_month
+from utils_merge import merge_counters, merge_feeds
+from utils_fetch import check_feed_url
+from utils_feeds import group_label, set_feed_group
+from utils_profile import (PROFILE_ENV, Profiler, load_profile_raw, profiled, profiling_enabled,
+                           recent_profiles, remember_profile, save_profile, saved_profiles)
 
 # 페이지 설정
 st.set_page_config(
@@ -28,9 +34,9 @@ if 'authenticated' not in st.session_state:
 if not st.session_state['authenticated']:
     st.title("🔐 접근 인증")
     st.info("이 앱에 접근하려면 비밀번호를 입력해주세요.")
-    
+
     password_input = st.text_input("비밀번호", type="password", key="password_input")
-    
+
     if st.button("로그인", type="primary"):
         if password_input == APP_PASSWORD:
             st.session_state['authenticated'] = True
@@ -39,333 +45,453 @@ if not st.session_state['authenticated']:
             st.error("❌ 비밀번호가 올바르지 않습니다.")
     st.stop()
 
-# 인증된 사용자만 아래 코드 실행
+# 인증된 사용자만 아래 코드 실행 (GitHub 클라이언트는 세션/재실행 간에 공유)
 try:
-    db = GithubDataHandler(GITHUB_TOKEN, REPO_NAME)
+    db = get_shared_handler(GITHUB_TOKEN, REPO_NAME)
 except Exception as e:
     st.error(f"GitHub 연결 실패: {e}")
     st.stop()
 
-# 방문자 통계 업데이트 (세션당 한 번만)
-if 'visited' not in st.session_state:
-    try:
-        stats = db.load_json("data/stats.json")
-        stats['visits'] = stats.get('visits', 0) + 1
-        db.save_json("data/stats.json", stats, "Increment visitor count")
-        st.session_state['visited'] = True
-    except Exception as e:
-        st.warning(f"통계 업데이트 실패: {e}")
 
-st.title("📰 나만의 AI IT 뉴스룸")
+@st.cache_data(ttl=3600, show_spinner="보관된 뉴스를 불러오는 중...")
+def load_archived_month(_db, month):
+    """월별 아카이브 (한 번 내려받은 달은 캐시에서 재사용)"""
+    return load_archive_month(_db, month)
 
-# 로그아웃 버튼
-if st.sidebar.button("🚪 로그아웃"):
-    st.session_state['authenticated'] = False
-    st.session_state['visited'] = False
-    st.rerun()
-
-menu = st.sidebar.selectbox("메뉴", ["뉴스룸", "대시보드"])
-
-if menu == "뉴스룸":
-    st.header("📰 뉴스룸")
-    
-    selected_date = st.date_input("날짜 선택", datetime.date.today())
-    date_str = selected_date.strftime("%Y-%m-%d")
-    
-    try:
-        news_data = db.load_json("data/news_data.json")
-        
-        if date_str in news_data:
-            daily_news = news_data[date_str]
-            
-            # 디버깅: image_path 확인
-            if 'image_path' in daily_news:
-                st.info(f"🔍 디버깅: image_path = {daily_news['image_path']}")
-            
-            # 인포그래픽 표시 (있는 경우)
-            if 'image_path' in daily_news and daily_news['image_path']:
-                try:
-                    # GitHub에서 직접 이미지 가져오기
-                    image_bytes = db.load_image(daily_news['image_path'])
-                    if image_bytes:
-                        from PIL import Image
-                        import io
-                        image = Image.open(io.BytesIO(image_bytes))
-                        st.image(image, use_container_width=True, caption=f"📊 {date_str} 인포그래픽")
-                        st.divider()
-                    else:
-                        # Fallback: GitHub Raw URL 시도
-                        try:
-                            image_url = f"https://raw.githubusercontent.com/{REPO_NAME}/main/{daily_news['image_path']}"
-                            st.info(f"🔍 Raw URL 시도: {image_url}")
-                            st.image(image_url, use_container_width=True, caption=f"📊 {date_str} 인포그래픽")
-                            st.divider()
-                        except Exception as url_error:
-                            st.warning(f"⚠️ 인포그래픽을 불러올 수 없습니다.")
-                            with st.expander("🔍 디버깅 정보"):
-                                st.write(f"이미지 경로: {daily_news['image_path']}")
-                                st.write(f"Raw URL: https://raw.githubusercontent.com/{REPO_NAME}/main/{daily_news['image_path']}")
-                                st.write(f"오류: {str(url_error)}")
-                except Exception as e:
-                    st.warning(f"인포그래픽 로드 실패: {e}")
-                    # 디버깅 정보 표시
-                    with st.expander("🔍 디버깅 정보"):
-                        st.write(f"이미지 경로: {daily_news.get('image_path', '없음')}")
-                        st.write(f"오류: {str(e)}")
-                        import traceback
-                        st.code(traceback.format_exc())
-            
-            # 전체 요약 표시
-            st.header(f"📅 {date_str} 주요 브리핑")
-            
-            if 'summary' in daily_news:
-                st.markdown(f"**전체 요약:**\n\n{daily_news['summary']}")
-            
-            if 'keywords' in daily_news and daily_news['keywords']:
-                keywords = ", ".join([f"`{kw}`" for kw in daily_news['keywords']])
-                st.markdown(f"**핵심 키워드:** {keywords}")
-            
-            if 'trends' in daily_news and daily_news['trends']:
-                st.info(f"**주요 트렌드:** {daily_news['trends']}")
-            
-            st.divider()
-            
-            # 개별 뉴스 카드
-            st.subheader("📰 상세 뉴스")
-            if 'articles' in daily_news and daily_news['articles']:
-                for idx, news in enumerate(daily_news['articles'], 1):
-                    with st.expander(f"📌 {idx}. {news.get('title', '제목 없음')}"):
-                        if 'ai_analysis' in news:
-                            st.markdown(f"**AI 분석:**\n\n{news['ai_analysis']}")
-                        elif 'summary' in news:
-                            st.markdown(f"**요약:**\n\n{news['summary']}")
-                        
-                        if 'link' in news and news['link']:
-                            st.link_button("🔗 원문 보기", news['link'])
-                        
-                        if 'published' in news and news['published']:
-                            st.caption(f"발행일: {news['published']}")
+
+@st.cache_data(ttl=300)
+def load_saved_profiles(_db):
+    """저장소에 저장된 프로파일 요약 (대시보드를 열 때마다 읽지 않도록 캐시)"""
+    return saved_profiles(_db)
+
+
+@st.cache_data(ttl=3600)
+def load_saved_profile_raw(_db, profile_id, _entry):
+    """저장된 프로파일 원본 (profile_id별로 캐시)"""
+    return load_profile_raw(_db, _entry)
+
+
+def find_archived_day(date_str):
+    """아카이브 인덱스에 있는 날짜만 해당 월 아카이브를 내려받아 조회"""
+    month = date_str[:7]
+    if date_str not in load_archive_index(db).get(month, []):
+        return None
+    return load_archived_month(db, month).get(date_str)
+
+
+def render_page():
+    """로그인 이후 화면 (사이드바 메뉴, 뉴스룸, 대시보드)"""
+    # 방문자 통계 업데이트 (세션당 한 번만)
+    if 'visited' not in st.session_state:
+        try:
+            stats = db.load_json("data/stats.json")
+            stats['visits'] = stats.get('visits', 0) + 1
+            db.save_json("data/stats.json", stats, "Increment visitor count", merge=merge_counters)
+            st.session_state['visited'] = True
+        except Exception as e:
+            st.warning(f"통계 업데이트 실패: {e}")
+
+    st.title("📰 나만의 AI IT 뉴스룸")
+
+    # 로그아웃 버튼
+    if st.sidebar.button("🚪 로그아웃"):
+        st.session_state['authenticated'] = False
+        st.session_state['visited'] = False
+        st.rerun()
+
+    menu = st.sidebar.selectbox("메뉴", ["뉴스룸", "대시보드"], key='menu')
+
+    if menu == "뉴스룸":
+        st.header("📰 뉴스룸")
+
+        view = st.radio("보기", ["일간", "주간", "월간"], horizontal=True)
+        selected_date = st.date_input("날짜 선택", datetime.date.today())
+        date_str = selected_date.strftime("%Y-%m-%d")
+
+        if view != "일간":
+            # 주간/월간 다이제스트 (수집할 때 날짜별 브리핑으로 만든 계층 요약)
+            from utils_digest import load_digest, month_weeks, update_digests, week_days, week_key
+            if view == "주간":
+                period = week_key(selected_date)
+                days = week_days(period)
+                st.header(f"🗓️ {period} 주간 다이제스트 ({days[0]} ~ {days[-1]})")
             else:
-                st.info("해당 날짜의 뉴스 기사가 없습니다.")
+                period = date_str[:7]
+                st.header(f"🗓️ {period} 월간 다이제스트")
+                st.caption(f"이 달에 속한 주(목요일 기준): {', '.join(month_weeks(period))}")
+            try:
+                digest = load_digest(db, period)
+                if digest:
+                    st.markdown(f"**기간 요약:**\n\n{digest['summary']}")
+                    if digest.get('keywords'):
+                        st.markdown(f"**핵심 키워드:** {', '.join(f'`{kw}`' for kw in digest['keywords'])}")
+                    if digest.get('trends'):
+                        st.info(f"**주요 흐름:** {digest['trends']}")
+                    st.caption(f"포함된 {'날짜' if view == '주간' else '주'}: {', '.join(digest.get('children', []))} "
+                               f"· 생성: {digest.get('generated', '')}")
+                else:
+                    st.info(f"📭 아직 {period} 다이제스트가 없습니다. 뉴스를 수집하면 자동으로 만들어집니다.")
+                if st.button("🔄 다이제스트 갱신", help="바뀐 날짜/주가 있을 때만 다시 요약합니다."):
+                    from utils_ai import init_gemini_model
+                    with st.spinner("다이제스트를 갱신하는 중..."):
+                        model, model_name = init_gemini_model(GEMINI_KEY)
+                        news_data = db.load_json("data/news_data.json")
+                        if view == "주간":
+                            outcome = update_digests(db, model, model_name, news_data, weeks=[period])
+                        else:
+                            outcome = update_digests(db, model, model_name, news_data, months=[period])
+                    for error in outcome['errors']:
+                        st.warning(f"⚠️ {error}")
+                    if outcome['updated']:
+                        st.rerun()
+                    st.success("✅ 바뀐 내용이 없어 기존 다이제스트를 그대로 사용합니다.")
+            except Exception as e:
+                st.error(f"다이제스트 로드 오류: {e}")
         else:
-            st.info(f"📭 {date_str} 날짜의 뉴스 데이터가 없습니다. 대시보드에서 뉴스를 수집해주세요.")
-    except Exception as e:
-        st.error(f"뉴스 데이터 로드 오류: {e}")
-
-elif menu == "대시보드":
-    st.header("⚙️ 관리 대시보드")
-    
-    # 통계 표시
-    st.subheader("📊 통계")
-    try:
-        stats = db.load_json("data/stats.json")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("총 방문자 수", stats.get('visits', 0))
-        with col2:
-            news_data = db.load_json("data/news_data.json")
-            total_news_days = len(news_data)
-            st.metric("수집된 뉴스 일수", total_news_days)
-    except Exception as e:
-        st.warning(f"통계 로드 오류: {e}")
-    
-    st.divider()
-    
-    # RSS 관리
-    st.subheader("🔗 RSS 피드 관리")
-    try:
-        feeds = db.load_json("data/feeds.json")
-        current_feeds = feeds.get("urls", [])
-        
-        # 현재 RSS 목록 표시
-        if current_feeds:
-            st.write("**현재 등록된 RSS 피드:**")
-            for idx, feed_url in enumerate(current_feeds, 1):
-                st.write(f"{idx}. {feed_url}")
-            
-            st.divider()
-            
-            # RSS 삭제
-            st.write("**RSS 피드 삭제:**")
-            if len(current_feeds) > 0:
-                selected_feeds = st.multiselect(
-                    "삭제할 RSS 피드를 선택하세요",
-                    options=current_feeds,
-                    key="delete_feeds"
-                )
-                if st.button("선택한 RSS 삭제", type="secondary"):
-                    if selected_feeds:
-                        updated_feeds = [f for f in current_feeds if f not in selected_feeds]
-                        if db.save_json("data/feeds.json", {"urls": updated_feeds}, "Delete RSS feeds"):
-                            st.success(f"{len(selected_feeds)}개의 RSS 피드가 삭제되었습니다.")
-                            st.rerun()
+            try:
+                news_data = db.load_json("data/news_data.json")
+                # 최근 데이터에 없으면 월별 압축 아카이브에서 조회
+                daily_news = news_data.get(date_str) or find_archived_day(date_str)
+
+                if daily_news:
+                    migrate_day(daily_news)
+
+                    # 피드 그룹별 브리핑이 있으면 그룹 선택
+                    briefings = group_briefings(daily_news)
+                    if len(briefings) > 1:
+                        group_labels = [group_label(group) for group, _ in briefings]
+                        selected_group = st.radio("📂 브리핑 그룹", group_labels, horizontal=True)
+                        daily_news = briefings[group_labels.index(selected_group)][1]
+                    elif briefings:
+                        daily_news = briefings[0][1]  # 기본 그룹 없이 피드 그룹 하나만 있는 경우
+
+                    # 디버깅: image_path 확인
+                    if 'image_path' in daily_news:
+                        st.info(f"🔍 디버깅: image_path = {daily_news['image_path']}")
+
+                    # 인포그래픽 표시 (있는 경우)
+                    if 'image_path' in daily_news and daily_news['image_path']:
+                        try:
+                            # GitHub에서 원본 그대로 스트리밍으로 가져오기 (1MB가 넘는 이미지 포함)
+                            image_bytes = db.load_image(daily_news['image_path'])
+                            if image_bytes:
+                                st.image(image_bytes, use_container_width=True, caption=f"📊 {date_str} 인포그래픽")
+                                st.divider()
+                            else:
+                                st.warning(f"⚠️ 인포그래픽을 불러올 수 없습니다.")
+                                with st.expander("🔍 디버깅 정보"):
+                                    st.write(f"이미지 경로: {daily_news['image_path']}")
+                        except Exception as e:
+                            st.warning(f"인포그래픽 로드 실패: {e}")
+                            # 디버깅 정보 표시
+                            with st.expander("🔍 디버깅 정보"):
+                                st.write(f"이미지 경로: {daily_news.get('image_path', '없음')}")
+                                st.write(f"오류: {str(e)}")
+                                import traceback
+                                st.code(traceback.format_exc())
+
+                    # 전체 요약 표시
+                    st.header(f"📅 {date_str} 주요 브리핑")
+
+                    if 'summary' in daily_news:
+                        st.markdown(f"**전체 요약:**\n\n{daily_news['summary']}")
+
+                    if 'keywords' in daily_news and daily_news['keywords']:
+                        keywords = ", ".join([f"`{kw}`" for kw in daily_news['keywords']])
+                        st.markdown(f"**핵심 키워드:** {keywords}")
+
+                    if 'trends' in daily_news and daily_news['trends']:
+                        st.info(f"**주요 트렌드:** {daily_news['trends']}")
+
+                    st.divider()
+
+                    # 개별 뉴스 카드 (주제별로 묶어서 표시)
+                    st.subheader("📰 상세 뉴스")
+                    if 'articles' in daily_news and daily_news['articles']:
+                        groups = group_articles(daily_news)
+                        idx = 0
+                        for topic, articles in groups:
+                            if topic:
+                                st.markdown(f"#### 🗂️ {topic} ({len(articles)}건)")
+                            elif len(groups) > 1:
+                                st.markdown("#### 📄 그 밖의 뉴스")
+                            for news in articles:
+                                idx += 1
+                                with st.expander(f"📌 {idx}. {news.get('title', '제목 없음')}"):
+                                    label, text = article_display_text(news)
+                                    st.markdown(f"**{label}:**\n\n{text}")
+
+                                    if 'link' in news and news['link']:
+                                        st.link_button("🔗 원문 보기", news['link'])
+
+                                    if 'published' in news and news['published']:
+                                        st.caption(f"발행일: {news['published']}")
+
+                                    if news.get('related'):
+                                        st.markdown("**🔁 이어지는 이야기:**")
+                                        for related in news['related']:
+                                            st.markdown(f"- {related.get('date', '')} [{related.get('title', '제목 없음')}]({related.get('link', '')})")
                     else:
-                        st.warning("삭제할 RSS 피드를 선택해주세요.")
-        else:
-            st.info("등록된 RSS 피드가 없습니다. 아래에서 추가해주세요.")
-        
+                        st.info("해당 날짜의 뉴스 기사가 없습니다.")
+                else:
+                    st.info(f"📭 {date_str} 날짜의 뉴스 데이터가 없습니다. 대시보드에서 뉴스를 수집해주세요.")
+            except Exception as e:
+                st.error(f"뉴스 데이터 로드 오류: {e}")
+
+    elif menu == "대시보드":
+        st.header("⚙️ 관리 대시보드")
+
+        # 통계 표시
+        st.subheader("📊 통계")
+        try:
+            stats = db.load_json("data/stats.json")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("총 방문자 수", stats.get('visits', 0))
+            with col2:
+                news_data = db.load_json("data/news_data.json")
+                total_news_days = count_days(news_data, load_archive_index(db))
+                st.metric("수집된 뉴스 일수", total_news_days)
+        except Exception as e:
+            st.warning(f"통계 로드 오류: {e}")
+
         st.divider()
-        
-        # RSS 추가
-        st.write("**새 RSS 피드 추가:**")
-        new_feed = st.text_input("RSS URL", placeholder="https://example.com/rss", key="new_feed_input")
-        
-        col1, col2 = st.columns([1, 4])
-        with col1:
-            if st.button("추가", type="primary"):
-                if new_feed:
-                    if new_feed not in current_feeds:
-                        current_feeds.append(new_feed)
-                        if db.save_json("data/feeds.json", {"urls": current_feeds}, "Add RSS feed"):
-                            st.success(f"RSS 피드가 추가되었습니다: {new_feed}")
+
+        # RSS 관리
+        st.subheader("🔗 RSS 피드 관리")
+        try:
+            feeds = db.load_json("data/feeds.json")
+            current_feeds = feeds.get("urls", [])
+
+            # 현재 RSS 목록 및 상태 표시
+            if current_feeds:
+                st.write("**현재 등록된 RSS 피드:**")
+                import pandas as pd
+                from utils_feeds import health_rows
+                st.dataframe(pd.DataFrame(health_rows(feeds)), use_container_width=True, hide_index=True)
+
+                st.divider()
+
+                # RSS 삭제
+                st.write("**RSS 피드 삭제:**")
+                if len(current_feeds) > 0:
+                    selected_feeds = st.multiselect(
+                        "삭제할 RSS 피드를 선택하세요",
+                        options=current_feeds,
+                        key="delete_feeds"
+                    )
+                    if st.button("선택한 RSS 삭제", type="secondary"):
+                        if selected_feeds:
+                            from utils_feeds import prune_health
+                            updated_feeds = [f for f in current_feeds if f not in selected_feeds]
+                            feeds = prune_health({**feeds, "urls": updated_feeds})
+                            if db.save_json("data/feeds.json", feeds, "Delete RSS feeds", merge=merge_feeds):
+                                st.success(f"{len(selected_feeds)}개의 RSS 피드가 삭제되었습니다.")
+                                st.rerun()
+                        else:
+                            st.warning("삭제할 RSS 피드를 선택해주세요.")
+
+                st.divider()
+
+                # 피드 그룹 지정 (그룹마다 브리핑을 따로 생성)
+                st.write("**피드 그룹 지정:**")
+                group_feeds = st.multiselect("그룹을 지정할 RSS 피드를 선택하세요", options=current_feeds, key="group_feeds")
+                group_name = st.text_input("그룹 이름 (비우면 기본 그룹)", placeholder="예: 해외 테크", key="group_name_input")
+                if st.button("그룹 지정", type="secondary"):
+                    if group_feeds:
+                        for url in group_feeds:
+                            set_feed_group(feeds, url, group_name)
+                        if db.save_json("data/feeds.json", feeds, "Update RSS feed groups", merge=merge_feeds):
+                            st.success(f"{len(group_feeds)}개의 RSS 피드를 '{group_label(group_name.strip())}' 그룹으로 지정했습니다.")
                             st.rerun()
                         else:
-                            st.error("RSS 피드 추가에 실패했습니다.")
+                            st.error("피드 그룹 저장에 실패했습니다.")
                     else:
-                        st.warning("이미 등록된 RSS 피드입니다.")
-                else:
-                    st.warning("RSS URL을 입력해주세요.")
-    except Exception as e:
-        st.error(f"RSS 관리 오류: {e}")
-    
-    st.divider()
-    
-    # 뉴스 수집 및 분석
-    st.subheader("🤖 뉴스 수집 및 분석")
-    
-    try:
-        feeds = db.load_json("data/feeds.json")
-        current_feeds = feeds.get("urls", [])
-        
-        if not current_feeds:
-            st.warning("⚠️ 먼저 RSS 피드를 추가해주세요.")
-        else:
-            st.write(f"**등록된 RSS 피드 {len(current_feeds)}개에서 뉴스를 수집합니다.**")
-            
-            if st.button("🚀 지금 수집 및 분석 시작", type="primary"):
-                if not GEMINI_KEY:
-                    st.error("Gemini API 키가 설정되지 않았습니다.")
-                else:
-                    # 진행 상황 표시 영역
-                    progress_container = st.container()
-                    with progress_container:
-                        st.markdown("### 📊 진행 상황")
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        detail_text = st.empty()
-                        time_text = st.empty()
-                    
-                    import time
-                    start_time = time.time()
-                    
-                    try:
-                        # 1. RSS 크롤링
-                        status_text.markdown("**1단계: 📡 RSS 피드에서 뉴스 수집 중...**")
-                        detail_text.info(f"RSS 피드 {len(current_feeds)}개를 확인하고 있습니다...")
-                        progress_bar.progress(10)
-                        time_text.text(f"경과 시간: {int(time.time() - start_time)}초")
-                        
-                        # RSS 수집 (실제로는 fetch_and_analyze_news 내부에서 처리되지만, 
-                        # 진행 상황을 보여주기 위해 분리)
-                        from utils_ai import fetch_rss_news
-                        news_list = fetch_rss_news(current_feeds)
-                        progress_bar.progress(30)
-                        detail_text.success(f"✅ {len(news_list)}개의 뉴스를 수집했습니다!")
-                        time_text.text(f"경과 시간: {int(time.time() - start_time)}초")
-                        
-                        if not news_list:
-                            st.warning("수집된 뉴스가 없습니다. RSS URL을 확인해주세요.")
+                        st.warning("그룹을 지정할 RSS 피드를 선택해주세요.")
+            else:
+                st.info("등록된 RSS 피드가 없습니다. 아래에서 추가해주세요.")
+
+            st.divider()
+
+            # RSS 추가
+            st.write("**새 RSS 피드 추가:**")
+            new_feed = st.text_input("RSS URL", placeholder="https://example.com/rss", key="new_feed_input")
+
+            col1, col2 = st.columns([1, 4])
+            with col1:
+                if st.button("추가", type="primary"):
+                    if new_feed:
+                        new_feed = new_feed.strip()
+                        url_error = check_feed_url(new_feed)
+                        if url_error:
+                            st.warning(f"잘못된 RSS URL입니다: {url_error}")
+                        elif new_feed not in current_feeds:
+                            current_feeds.append(new_feed)
+                            if db.save_json("data/feeds.json", {**feeds, "urls": current_feeds}, "Add RSS feed", merge=merge_feeds):
+                                st.success(f"RSS 피드가 추가되었습니다: {new_feed}")
+                                st.rerun()
+                            else:
+                                st.error("RSS 피드 추가에 실패했습니다.")
                         else:
-                            # 2. Gemini 분석
-                            status_text.markdown("**2단계: 🤖 AI가 뉴스를 분석하는 중...**")
-                            detail_text.info(f"뉴스 {len(news_list)}개를 분석하고 있습니다. 시간이 걸릴 수 있습니다...")
-                            progress_bar.progress(40)
-                            time_text.text(f"경과 시간: {int(time.time() - start_time)}초")
-                            
-                            # 분석 진행 상황을 보여주기 위해 스피너 추가
-                            analysis_spinner = st.spinner("AI 분석 중...")
-                            with analysis_spinner:
-                                from utils_ai import analyze_news_with_gemini
-                                result = analyze_news_with_gemini(news_list, GEMINI_KEY)
-                            
-                            progress_bar.progress(60)
-                            detail_text.success(f"✅ AI 분석 완료! (경과 시간: {int(time.time() - start_time)}초)")
+                            st.warning("이미 등록된 RSS 피드입니다.")
+                    else:
+                        st.warning("RSS URL을 입력해주세요.")
+        except Exception as e:
+            st.error(f"RSS 관리 오류: {e}")
+
+        st.divider()
+
+        # 뉴스 수집 및 분석
+        st.subheader("🤖 뉴스 수집 및 분석")
+
+        try:
+            feeds = db.load_json("data/feeds.json")
+            current_feeds = feeds.get("urls", [])
+
+            if not current_feeds:
+                st.warning("⚠️ 먼저 RSS 피드를 추가해주세요.")
+            else:
+                from utils_feeds import select_due_feeds
+                due_feeds = select_due_feeds(feeds)
+                force_all = st.checkbox("수집 주기와 관계없이 모든 피드 수집", value=False)
+                target_feeds = current_feeds if force_all else due_feeds
+                st.write(f"**등록된 RSS 피드 {len(current_feeds)}개 중 {len(target_feeds)}개에서 뉴스를 수집합니다.**")
+                if not force_all and len(due_feeds) < len(current_feeds):
+                    st.caption("나머지 피드는 수집 주기가 돌아오지 않아 건너뜁니다. (오늘 이미 수집된 기사는 유지됩니다)")
+
+                if st.button("🚀 지금 수집 및 분석 시작", type="primary"):
+                    if not GEMINI_KEY:
+                        st.error("Gemini API 키가 설정되지 않았습니다.")
+                    else:
+                        # 진행 상황 표시 영역
+                        progress_container = st.container()
+                        with progress_container:
+                            st.markdown("### 📊 진행 상황")
+                            progress_bar = st.progress(0)
+                            status_text = st.empty()
+                            detail_text = st.empty()
+                            time_text = st.empty()
+
+                        import time
+                        start_time = time.time()
+
+                        def show_progress(step, percent, message, level):
+                            status_text.markdown(f"**{step}**")
+                            getattr(detail_text, level)(message)
+                            progress_bar.progress(percent)
                             time_text.text(f"경과 시간: {int(time.time() - start_time)}초")
-                            
-                            # 3. 인포그래픽 생성 (선택적)
-                            image_path = None
-                            if result.get('summary'):
-                                status_text.markdown("**3단계: 🎨 인포그래픽 생성 중...**")
-                                detail_text.info("AI가 인포그래픽을 생성하고 있습니다...")
-                                progress_bar.progress(70)
-                                
-                                try:
-                                    from utils_ai import generate_infographic
-                                    # 키워드도 함께 전달 (대체 방법에서 사용)
-                                    keywords = result.get('keywords', [])
-                                    # Imagen API 키 가져오기 (선택적)
-                                    IMAGEN_KEY = st.secrets.get("api", {}).get("imagen_key", None)
-                                    infographic_image = generate_infographic(
-                                        GEMINI_KEY, 
-                                        result.get('summary', ''),
-                                        IMAGEN_KEY,
-                                        keywords
-                                    )
-                                    
-                                    if infographic_image:
-                                        today = datetime.date.today()
-                                        today_str = today.strftime("%Y-%m-%d")
-                                        # 년도/월별 폴더 구조로 저장 (예: images/2025/12/2025-12-06.png)
-                                        year = today.strftime("%Y")
-                                        month = today.strftime("%m")
-                                        image_path = f"images/{year}/{month}/{today_str}.png"
-                                        
-                                        if db.save_image(image_path, infographic_image, f"Create infographic for {today_str}"):
-                                            detail_text.success(f"✅ 인포그래픽 생성 완료!")
-                                            result['image_path'] = image_path
-                                        else:
-                                            detail_text.warning("⚠️ 인포그래픽 저장 실패 (분석은 완료됨)")
-                                    else:
-                                        detail_text.info("ℹ️ 인포그래픽 생성 건너뜀 (Imagen API 미활성화 또는 오류)")
-                                except Exception as e:
-                                    detail_text.warning(f"⚠️ 인포그래픽 생성 중 오류: {e} (분석은 완료됨)")
-                            
-                            # 4. news_data.json에 오늘 날짜 Key로 저장
-                            status_text.markdown("**4단계: 💾 데이터를 저장하는 중...**")
-                            detail_text.info("GitHub에 데이터를 저장하고 있습니다...")
-                            progress_bar.progress(90)
-                            
-                            news_data = db.load_json("data/news_data.json")
-                            today_str = datetime.date.today().strftime("%Y-%m-%d")
-                            news_data[today_str] = result
-                            
-                            if db.save_json("data/news_data.json", news_data, f"Update daily news for {today_str}"):
-                                progress_bar.progress(100)
-                                elapsed_time = int(time.time() - start_time)
-                                status_text.markdown("**✅ 완료!**")
+
+                        try:
+                            from utils_pipeline import run_collection, STATUS_NO_NEWS, STATUS_SAVE_FAILED
+                            # Imagen API 키 가져오기 (선택적)
+                            IMAGEN_KEY = st.secrets.get("api", {}).get("imagen_key", None)
+                            # 정적 사이트 주소 (선택적, JSON Feed의 절대 URL용)
+                            SITE_URL = st.secrets.get("general", {}).get("site_url", None)
+                            with st.spinner("뉴스 수집 및 AI 분석 중..."), \
+                                    profiled("수집 (대시보드)", enabled=profiling_enabled(st.session_state.get('profiling', False))) as profile:
+                                run = run_collection(db, GEMINI_KEY, IMAGEN_KEY, force_all=force_all,
+                                                     site_url=SITE_URL, on_progress=show_progress)
+                            elapsed_time = int(time.time() - start_time)
+                            if profile:
+                                remember_profile(profile)
+                                if save_profile(db, profile):
+                                    load_saved_profiles.clear()
+                                    st.caption("🔬 수집 프로파일이 저장되었습니다. 아래 프로파일링에서 확인하세요.")
+
+                            if run['status'] == STATUS_NO_NEWS:
+                                st.warning("수집된 뉴스가 없습니다. RSS URL을 확인해주세요.")
+                            elif run['status'] == STATUS_SAVE_FAILED:
+                                st.error("데이터 저장에 실패했습니다.")
+                            else:
+                                result = run['result']
                                 detail_text.success(f"모든 작업이 완료되었습니다! (총 소요 시간: {elapsed_time}초)")
                                 time_text.empty()
-                                
-                                st.success(f"✅ {today_str} 뉴스 수집 및 분석이 완료되었습니다! (소요 시간: {elapsed_time}초)")
+
+                                st.success(f"✅ {run['date']} 뉴스 수집 및 분석이 완료되었습니다! (소요 시간: {elapsed_time}초)")
+                                for error in run['errors']:
+                                    st.warning(f"⚠️ {error}")
                                 st.balloons()
-                                
+
                                 # 결과 미리보기
                                 with st.expander("📊 수집 결과 미리보기"):
-                                    st.write(f"**수집된 뉴스 수:** {len(result.get('articles', []))}")
+                                    st.write(f"**수집된 뉴스 수:** {run['articles_total']}")
+                                    if len(run['groups']) > 1:
+                                        st.write("**그룹별 브리핑:** " + ", ".join(
+                                            f"{label} {group['articles']}개" for label, group in run['groups'].items()))
                                     if result.get('keywords'):
                                         st.write(f"**핵심 키워드:** {', '.join(result.get('keywords', []))}")
                                     if result.get('summary'):
                                         st.write(f"**요약:** {result.get('summary', '')[:300]}...")
-                            else:
-                                st.error("데이터 저장에 실패했습니다.")
-                    except Exception as e:
-                        elapsed_time = int(time.time() - start_time)
-                        st.error(f"❌ 뉴스 수집 중 오류 발생: {e}")
-                        detail_text.error(f"오류 발생 (경과 시간: {elapsed_time}초)")
-                        progress_bar.empty()
-                        import traceback
-                        with st.expander("🔍 상세 오류 정보"):
-                            st.code(traceback.format_exc())
-    except Exception as e:
-        st.error(f"뉴스 수집 설정 오류: {e}")
+                        except Exception as e:
+                            elapsed_time = int(time.time() - start_time)
+                            st.error(f"❌ 뉴스 수집 중 오류 발생: {e}")
+                            detail_text.error(f"오류 발생 (경과 시간: {elapsed_time}초)")
+                            progress_bar.empty()
+                            import traceback
+                            with st.expander("🔍 상세 오류 정보"):
+                                st.code(traceback.format_exc())
+        except Exception as e:
+            st.error(f"뉴스 수집 설정 오류: {e}")
+
+        st.divider()
 
+        # 프로파일링
+        st.subheader("🔬 프로파일링")
+        # 위젯 상태는 대시보드를 벗어나면 지워지므로 별도 키에 보관 (뉴스룸 재실행도 측정)
+        st.session_state['profiling'] = st.toggle(
+            "이 세션의 화면 재실행과 수집 측정",
+            value=st.session_state.get('profiling', False),
+            help="켜면 다음 재실행부터 측정합니다. 재실행 프로파일은 서버 메모리에만, 수집 프로파일은 저장소에도 보관됩니다."
+        )
+        if profiling_enabled():
+            st.caption(f"{PROFILE_ENV} 환경 변수가 설정되어 모든 세션을 측정하고 있습니다.")
+
+        try:
+            profiles = recent_profiles()
+            recent_ids = {profile['id'] for profile in profiles}
+            profiles += [entry for entry in load_saved_profiles(db) if entry['id'] not in recent_ids]
+
+            if not profiles:
+                st.info("아직 측정된 프로파일이 없습니다. 측정을 켜거나 collect.py를 --profile로 실행해주세요.")
+            else:
+                profile_labels = [f"{profile['started']} · {profile['label']} ({profile['elapsed']:.2f}초)" for profile in profiles]
+                selected_profile = profiles[profile_labels.index(st.selectbox("프로파일 선택", profile_labels))]
+
+                col1, col2, col3 = st.columns(3)
+                col1.metric("소요 시간", f"{selected_profile['elapsed']:.2f}초")
+                col2.metric("함수 호출 수", f"{selected_profile['total_calls']:,}")
+                col3.metric("측정한 스레드", selected_profile['threads'])
+
+                sort_by = st.radio("정렬 기준", ["자체 시간", "누적 시간"], horizontal=True)
+                import pandas as pd
+                rows = selected_profile['top_self' if sort_by == "자체 시간" else 'top_cumulative']
+                st.dataframe(
+                    pd.DataFrame(rows).rename(columns={'function': '함수', 'calls': '호출 수',
+                                                       'self': '자체 시간(초)', 'cumulative': '누적 시간(초)'}),
+                    use_container_width=True, hide_index=True
+                )
+
+                if 'raw' in selected_profile:
+                    raw = load_profile_raw(db, selected_profile)
+                else:
+                    raw = load_saved_profile_raw(db, selected_profile['id'], selected_profile)
+                if raw:
+                    st.download_button("📥 원본 내려받기 (.prof)", raw, file_name=f"{selected_profile['id']}.prof",
+                                       help="python -m pstats 또는 snakeviz로 열 수 있습니다.")
+                else:
+                    st.caption("원본이 더 새로운 프로파일로 교체되어 요약만 볼 수 있습니다.")
+        except Exception as e:
+            st.warning(f"프로파일 로드 오류: {e}")
+
+
+# 선택적 프로파일링 (대시보드의 관리자 토글 또는 NEWSROOM_PROFILE 환경 변수, 재실행이 끝나면 메모리에 보관)
+rerun_profiler = None
+if profiling_enabled(st.session_state.get('profiling', False)):
+    rerun_profiler = Profiler("재실행").start()
+try:
+    render_page()
+finally:
+    # st.rerun()/st.stop()/예외로 중간에 끝나도 측정을 멈추고 보관 (Streamlit 예외는 그대로 전달)
+    if rerun_profiler is not None:
+        menu = st.session_state.get('menu')
+        remember_profile(rerun_profiler.stop(f"재실행 ({menu})" if menu else None))
@@ -0,0 +1,249 @@
+"""
+저장된 기사로 지난 날짜의 브리핑을 다시 생성하는 백필 스크립트
+
+프롬프트, 모델, 스키마가 바뀐 뒤 과거 날짜의 요약/키워드/인포그래픽(선택적으로 기사별 분석)을
+새로 만듭니다. RSS는 다시 수집하지 않고, news_data.json과 월별 아카이브에 저장된 기사를 사용합니다.
+
+- 날짜 여러 개를 동시에 처리하고 (--concurrency), Gemini 호출은 분당 횟수로 제한 (--rate)
+- --batch-size일씩 모아서 커밋 하나로 저장 (news_data.json, 아카이브, 인포그래픽)
+- 저장이 끝난 날짜는 체크포인트 파일에 기록하므로, 중간에 멈춰도 같은 명령으로 이어서 실행
+
+설정은 collect.py와 같습니다 (환경 변수 또는 --config).
+
+사용법:
+    python backfill.py --from 2025-11-01 --to 2025-11-30 --config .streamlit/secrets.toml
+    python backfill.py --from 2025-11-01 --to 2025-11-30 --reanalyze-articles --rate 20 --batch-size 5
+    python backfill.py --from 2025-11-01 --to 2025-11-30 --reset   # 체크포인트를 지우고 처음부터
+
+종료 코드: 0 성공, 1 일부 날짜 실패, 2 설정 오류, 4 저장 실패, 5 예상치 못한 오류
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+
+from collect import EXIT_CONFIG_ERROR, EXIT_OK, EXIT_PARTIAL, EXIT_SAVE_FAILED, EXIT_UNEXPECTED, load_config
+
+
+CHECKPOINT_PATH = ".backfill_checkpoint.json"
+DEFAULT_CONCURRENCY = 2      # 동시에 처리할 날짜 수
+DEFAULT_RATE = 30            # 분당 최대 Gemini 호출 수
+DEFAULT_BATCH_SIZE = 7       # 커밋 하나에 담을 날짜 수
+
+log = logging.getLogger('backfill')
+
+
+def date_range(start: datetime.date, end: datetime.date):
+    """start부터 end까지(포함) 날짜 문자열 목록"""
+    return [(start + datetime.timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days + 1)]
+
+
+def load_checkpoint(path, options, reset=False):
+    """
+    체크포인트 읽기 (옵션이 다르면 이어서 실행하지 않음)
+
+    Returns:
+        dict: options, done (저장이 끝난 날짜 목록), failed ({날짜: 오류})
+
+    Raises:
+        ValueError: 기존 체크포인트의 옵션이 이번 실행과 다른 경우
+    """
+    if reset or not os.path.exists(path):
+        return {'options': options, 'done': [], 'failed': {}}
+    with open(path, encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('options') != options:
+        raise ValueError(f"체크포인트({path})의 옵션이 이번 실행과 다릅니다. "
+                         f"이어서 실행하려면 같은 옵션을 사용하고, 새로 시작하려면 --reset을 사용하세요.\n"
+                         f"기존 옵션: {json.dumps(checkpoint.get('options'), ensure_ascii=False)}")
+    checkpoint.setdefault('done', [])
+    checkpoint.setdefault('failed', {})
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    """체크포인트 저장 (임시 파일에 쓴 뒤 교체해서 중간에 멈춰도 깨지지 않음)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_backfill(db, gemini_key, imagen_key, dates, checkpoint, checkpoint_path,
+                 concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, batch_size=DEFAULT_BATCH_SIZE,
+                 with_infographic=True, reanalyze_articles=False, with_digests=True):
+    """
+    날짜 목록의 브리핑을 다시 생성하고 batch_size일씩 커밋
+
+    모두 저장한 뒤 날짜 범위의 주간/월간 다이제스트를 갱신합니다 (입력이 바뀐 주/달만 다시 요약하므로,
+    중단 후 이어서 실행해도 앞서 다시 만든 날짜의 주/달까지 반영됨).
+
+    Returns:
+        dict: 실행 요약 (dates, skipped, rebuilt, failed, commits, images, digests, saved)
+    """
+    from utils_ai import init_gemini_model
+    from utils_archive import NEWS_DATA_PATH, archive_path, encode_archive, load_archive_index, load_archive_month
+    from utils_digest import periods_for_dates, update_digests
+    from utils_images import IMAGE_INDEX_PATH, ImageIndex
+    from utils_merge import merge_days, merge_nested_keys
+    from utils_pipeline import rebrief_day
+    from utils_resilience import CallBudget, Deadline, stream
+    from utils_schema import migrate_news_data
+
+    hot_data = db.load_json(NEWS_DATA_PATH)
+    migrate_news_data(hot_data)
+    archive_index = load_archive_index(db)
+    archived_dates = {date_str for days in archive_index.values() for date_str in days}
+    done = set(checkpoint['done'])
+    todo = [d for d in dates if d not in done and (d in hot_data or d in archived_dates)]
+    summary = {'dates': len(dates), 'skipped': len(dates) - len(todo), 'rebuilt': 0, 'failed': 0,
+               'commits': 0, 'images': 0, 'digests': [], 'saved': True}
+    if not todo and not with_digests:
+        return summary
+
+    model, model_name = init_gemini_model(gemini_key)
+    budget = CallBudget(None, max_concurrent=concurrency * 2, per_minute=rate)
+    image_index = ImageIndex(db.load_json(IMAGE_INDEX_PATH)) if with_infographic else ImageIndex()
+    months = {}
+
+    def find(date_str):
+        if date_str in hot_data:
+            return hot_data[date_str]
+        month = date_str[:7]
+        if month not in months:
+            months[month] = load_archive_month(db, month)
+        return months[month].get(date_str)
+
+    for start in range(0, len(todo), batch_size):
+        batch = todo[start:start + batch_size]
+        days = {date_str: find(date_str) for date_str in batch}
+        tasks = {
+            date_str: (lambda date_str=date_str: rebrief_day(
+                days[date_str], datetime.date.fromisoformat(date_str), model, model_name, budget,
+                gemini_key, imagen_key, with_infographic, reanalyze_articles, image_index))
+            for date_str in batch if days[date_str]
+        }
+
+        files = {}
+        changed_months = set()
+        rebuilt = []
+        failed = set()
+        for date_str, outcome, error in stream(tasks, Deadline(None), max_workers=concurrency):
+            errors = [str(error)] if error is not None else outcome['errors']
+            if errors:
+                checkpoint['failed'][date_str] = "; ".join(errors)
+                failed.add(date_str)
+                summary['failed'] += 1
+                log.warning(f"{date_str} 실패: {'; '.join(errors)}")
+            if error is not None or outcome['day'] is days[date_str]:
+                continue
+            # 일부 그룹만 실패한 날짜도 성공한 그룹은 저장 (실패 기록은 남김)
+            if date_str in hot_data:
+                hot_data[date_str] = outcome['day']
+            else:
+                months[date_str[:7]][date_str] = outcome['day']
+                changed_months.add(date_str[:7])
+            files.update(outcome['images'])
+            rebuilt.append(date_str)
+            log.info(f"{date_str} 다시 생성 (새 인포그래픽 {len(outcome['images'])}개)")
+
+        if rebuilt:
+            if any(date_str in hot_data for date_str in rebuilt):
+                files[NEWS_DATA_PATH] = hot_data
+            for month in changed_months:
+                files[archive_path(month)] = encode_archive(months[month])
+            if image_index.changed:
+                files[IMAGE_INDEX_PATH] = image_index.to_dict()
+            rebuilt.sort()
+            message = f"Backfill briefings {rebuilt[0]}..{rebuilt[-1]} ({len(rebuilt)} days)"
+            if not db.commit_files(files, message,
+                                   merges={NEWS_DATA_PATH: merge_days, IMAGE_INDEX_PATH: merge_nested_keys}):
+                summary['saved'] = False
+                log.error(f"저장 실패: {batch[0]}..{batch[-1]} (체크포인트에 기록하지 않음)")
+                break
+            summary['commits'] += 1
+            image_index.changed = False
+            summary['rebuilt'] += len(rebuilt)
+            summary['images'] += sum(1 for path in files if path.startswith('images/'))
+
+        # 오류 없이 저장까지 끝난 날짜만 완료로 기록 (일부 그룹만 실패한 날짜도 다음 실행에서 다시 시도)
+        for date_str in batch:
+            if date_str not in failed:
+                checkpoint['failed'].pop(date_str, None)
+                checkpoint['done'].append(date_str)
+        checkpoint['done'] = sorted(set(checkpoint['done']))
+        save_checkpoint(checkpoint_path, checkpoint)
+        log.info(f"진행: {len(set(checkpoint['done']) & set(dates))}/{len(dates)}일")
+
+    if with_digests and summary['saved']:
+        weeks, months = periods_for_dates(d for d in dates if d in hot_data or d in archived_dates)
+        updated = update_digests(db, model, model_name, hot_data, weeks, months, budget=budget)
+        summary['digests'] = updated['updated']
+        for error in updated['errors']:
+            log.warning(error)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 기사로 지난 날짜의 브리핑 다시 생성")
+    parser.add_argument('--from', dest='start', required=True, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='end', required=True, help="끝 날짜 (YYYY-MM-DD, 포함)")
+    parser.add_argument('--config', help="secrets.toml 형식의 설정 파일")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="동시에 처리할 날짜 수")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="분당 최대 Gemini 호출 수")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="커밋 하나에 담을 날짜 수")
+    parser.add_argument('--no-infographic', action='store_true', help="인포그래픽은 다시 만들지 않고 기존 것 유지")
+    parser.add_argument('--reanalyze-articles', action='store_true', help="기사별 분석도 다시 생성")
+    parser.add_argument('--no-digest', action='store_true', help="주간/월간 다이제스트 갱신 건너뛰기")
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH, help="체크포인트 파일 경로")
+    parser.add_argument('--reset', action='store_true', help="기존 체크포인트를 무시하고 처음부터 실행")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr, format='%(asctime)s %(message)s')
+
+    try:
+        config = load_config(args.config)
+        start = datetime.date.fromisoformat(args.start)
+        end = datetime.date.fromisoformat(args.end)
+        if end < start:
+            raise ValueError("끝 날짜가 시작 날짜보다 앞섭니다.")
+        options = {'from': args.start, 'to': args.end, 'infographic': not args.no_infographic,
+                   'reanalyze_articles': args.reanalyze_articles}
+        checkpoint = load_checkpoint(args.checkpoint, options, args.reset)
+    except ValueError as e:
+        print(json.dumps({'status': 'config_error', 'errors': [str(e)]}, ensure_ascii=False))
+        sys.exit(EXIT_CONFIG_ERROR)
+
+    try:
+        from utils_github import GithubDataHandler
+
+        db = GithubDataHandler(config['github_token'], config['repo_name'])
+        summary = run_backfill(db, config['gemini_key'], config['imagen_key'], date_range(start, end),
+                               checkpoint, args.checkpoint, concurrency=max(1, args.concurrency),
+                               rate=args.rate, batch_size=max(1, args.batch_size),
+                               with_infographic=not args.no_infographic,
+                               reanalyze_articles=args.reanalyze_articles,
+                               with_digests=not args.no_digest)
+    except Exception as e:
+        log.exception("백필 중 예상치 못한 오류")
+        print(json.dumps({'status': 'error', 'errors': [str(e)]}, ensure_ascii=False))
+        sys.exit(EXIT_UNEXPECTED)
+
+    summary['failed_dates'] = checkpoint['failed']
+    if not summary['saved']:
+        summary['status'] = 'save_failed'
+        code = EXIT_SAVE_FAILED
+    elif summary['failed']:
+        summary['status'] = 'partial'
+        code = EXIT_PARTIAL
+    else:
+        summary['status'] = 'ok'
+        code = EXIT_OK
+    print(json.dumps(summary, ensure_ascii=False))
+    sys.exit(code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,436 @@
+"""
+동시 세션 부하 테스트 (app.py를 Streamlit AppTest로 헤드리스 실행)
+
+여러 독자가 동시에 앱을 열었을 때를 흉내 냅니다. 세션마다 다음 순서로 화면을 그립니다.
+
+1. 뉴스룸 첫 화면 (방문자 통계 읽기/쓰기, news_data.json 전체 읽기, 인포그래픽 이미지 읽기)
+2. 뉴스룸에서 어제 날짜 선택
+3. 대시보드
+
+GitHub 대신 로컬 디렉터리를 읽고 쓰는 LocalDataHandler를 사용하고, 요청마다
+--latency-ms 만큼 기다려 GitHub API 왕복 시간을 흉내 냅니다. 데이터(기사, 피드, PNG 이미지)는
+--seed로 매번 같게 생성하므로 반복 실행해 결과를 비교할 수 있습니다.
+
+출력: 화면별/전체 렌더링 시간 p50/p95/p99, 세션당 저장소 호출 수와 읽은 바이트, 세션당 메모리
+
+사용법:
+    python bench_load.py
+    python bench_load.py --sessions 50 --concurrency 10 --latency-ms 80
+    python bench_load.py --json bench_load.json                        # 결과 저장
+    python bench_load.py --baseline bench_load.json --max-regression 0.2  # 기준보다 20% 넘게 느려지면 종료 코드 1
+"""
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+import streamlit as st
+from streamlit.logger import set_log_level
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.secrets import Secrets
+from streamlit.testing.v1 import AppTest, app_test
+from streamlit.testing.v1.util import patch_config_options
+
+import utils_github
+from utils_json import dumps_for_path, loads
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+SECRETS = {
+    'api': {'github_token': 'bench-token', 'gemini_key': 'bench-key'},
+    'general': {'repo_name': 'bench/newsroom', 'password': 'bench'},
+}
+SESSION_KEY = 'bench_session'
+STEPS = ("뉴스룸", "날짜 변경", "대시보드")
+
+
+class LocalDataHandler:
+    """
+    로컬 디렉터리를 저장소로 쓰는 GithubDataHandler 대용 (세션마다 하나, 파일은 함께 사용)
+
+    호출 수와 읽은 바이트를 세고, 요청마다 latency초 기다립니다.
+    save_json은 GithubDataHandler처럼 읽은 뒤 다른 세션이 먼저 저장했으면 merge로 합칩니다.
+    """
+
+    _write_lock = threading.Lock()
+
+    def __init__(self, root, latency=0.0):
+        self.root = root
+        self.latency = latency
+        self.calls = collections.Counter()
+        self.bytes_read = 0
+        self._bases = {}
+
+    def _path(self, file_path):
+        return os.path.join(self.root, file_path)
+
+    def _request(self, name):
+        self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _read(self, file_path):
+        try:
+            with open(self._path(file_path), 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        self.bytes_read += len(content)
+        return content
+
+    def _write(self, file_path, content):
+        path = self._path(file_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+    def health_check(self, force=False):
+        return True
+
+    def load_json(self, file_path):
+        self._request('load_json')
+        content = self._read(file_path)
+        self._bases[file_path] = content
+        return loads(content) if content else {}
+
+    def save_json(self, file_path, data, message="Update data", merge=None, attempts=4):
+        self._request('save_json')
+        with self._write_lock:
+            remote = self._read(file_path)
+            payload = data
+            if merge is not None and file_path in self._bases and remote is not None and remote != self._bases[file_path]:
+                base = self._bases[file_path]
+                payload = merge(loads(base) if base else {}, data, loads(remote))
+            content = dumps_for_path(file_path, payload)
+            self._write(file_path, content)
+        self._bases[file_path] = content
+        if payload is not data:
+            data.clear()
+            data.update(payload)
+        return True
+
+    def load_bytes(self, file_path):
+        self._request('load_bytes')
+        return self._read(file_path)
+
+    def save_bytes(self, file_path, content, message="Update file"):
+        self._request('save_bytes')
+        with self._write_lock:
+            self._write(file_path, content)
+        return True
+
+    def load_image(self, file_path):
+        return self.load_bytes(file_path)
+
+    def save_image(self, file_path, image_obj, message="Update image"):
+        return self.save_bytes(file_path, utils_github.image_to_bytes(image_obj), message)
+
+
+def make_fixture(root, days, articles_per_day, feeds_count, image_px, seed):
+    """
+    부하 테스트용 데이터 생성 (news_data.json, feeds.json, stats.json, 날짜별 PNG 인포그래픽)
+
+    이미지는 압축되지 않는 무작위 픽셀이라 크기가 실제 인포그래픽(수 MB)과 비슷합니다.
+    """
+    from PIL import Image
+
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    feeds = [f"https://feed{i}.example.com/rss" for i in range(feeds_count)]
+    news_data = {}
+    for offset in range(days):
+        date_str = (today - datetime.timedelta(days=offset)).strftime("%Y-%m-%d")
+        articles = []
+        for i in range(articles_per_day):
+            article = {
+                'title': f"{date_str} 기사 {i} " + " ".join(rng.choice("AI 클라우드 반도체 보안 모바일 플랫폼".split())
+                                                           for _ in range(6)),
+                'link': f"https://news{i % feeds_count}.example.com/{date_str}/{i}",
+                'summary': "기사 요약 문장입니다. " * rng.randint(5, 20),
+                'published': f"{date_str}T0{i % 10}:00:00+09:00",
+            }
+            if i % 2 == 0:
+                article['ai_analysis'] = "업계에 주는 의미를 설명하는 분석입니다. " * 4
+            articles.append(article)
+        image_path = f"images/{date_str[:4]}/{date_str[5:7]}/{date_str}.png"
+        news_data[date_str] = {
+            'schema_version': 2,
+            'summary': "오늘의 IT 뉴스 요약입니다. " * 20,
+            'keywords': ["AI", "클라우드", "반도체", "보안", "모바일"],
+            'trends': "주요 트렌드 설명입니다. " * 5,
+            'image_path': image_path,
+            'articles': articles,
+            'topics': [{'label': articles[0]['title'], 'articles': [0, 1, 2]}],
+        }
+        if offset < 2:
+            # 화면에 나오는 날짜(오늘, 어제)만 새로 만들고, 나머지 날짜는 어제 이미지를 재사용
+            buffer = io.BytesIO()
+            Image.frombytes('RGB', (image_px, image_px), rng.randbytes(image_px * image_px * 3)).save(buffer, format='PNG')
+            image = buffer.getvalue()
+        LocalDataHandler(root).save_bytes(image_path, image)
+
+    handler = LocalDataHandler(root)
+    handler.save_json("data/news_data.json", news_data)
+    handler.save_json("data/feeds.json", {
+        'urls': feeds,
+        'health': {url: {'last_success': today.isoformat(), 'failures': 0} for url in feeds},
+    })
+    handler.save_json("data/stats.json", {'visits': 0})
+
+
+@contextlib.contextmanager
+def shared_app_runtime():
+    """
+    동시에 실행되는 AppTest들이 Streamlit 서버 하나처럼 런타임과 스크립트 캐시를 함께 쓰도록 설정
+
+    AppTest는 실행할 때마다 전역 Runtime 인스턴스를 새로 만들었다가 지우고 스크립트를 다시 컴파일하므로,
+    그대로 여러 스레드에서 실행하면 다른 세션의 런타임이 사라지거나 컴파일이 엇갈립니다.
+    실제 서버처럼 런타임(미디어 파일, st.cache_data 저장소)과 컴파일된 스크립트를 모든 세션이 공유합니다.
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    script_cache = ScriptCache()
+
+    class SessionRuntime(Runtime):
+        """AppTest가 실행마다 바꾸는 런타임 자리 (공유 런타임에는 영향 없음)"""
+
+    saved = app_test.Runtime, app_test.ScriptCache, Runtime._instance
+    app_test.Runtime, app_test.ScriptCache = SessionRuntime, lambda: script_cache
+    Runtime._instance = runtime
+    try:
+        with patch_config_options({"global.appTest": True, "logger.level": "error"}):
+            set_log_level("error")
+            yield
+    finally:
+        app_test.Runtime, app_test.ScriptCache, Runtime._instance = saved
+
+
+def percentile(values, p):
+    """최근접 순위 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def run_session(session_id, timeout):
+    """
+    세션 하나의 화면 순서를 실행
+
+    Returns:
+        tuple: (AppTest, {화면 이름: 렌더링 시간 ms}, 오류 메시지 목록)
+    """
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state['authenticated'] = True
+    at.session_state[SESSION_KEY] = session_id
+    yesterday = datetime.date.today() - datetime.timedelta(days=1)
+    actions = {
+        "뉴스룸": lambda: at.run(),
+        "날짜 변경": lambda: at.date_input[0].set_value(yesterday).run(),
+        "대시보드": lambda: at.sidebar.selectbox[0].set_value("대시보드").run(),
+    }
+    timings, errors = {}, []
+    for step in STEPS:
+        start = time.perf_counter()
+        try:
+            actions[step]()
+        except Exception as e:
+            errors.append(f"{step}: {e}")
+            break
+        timings[step] = (time.perf_counter() - start) * 1000
+        errors.extend(f"{step}: {element.value}" for element in list(at.exception) + list(at.error))
+    return at, timings, errors
+
+
+def run_load(root, sessions, concurrency, latency, timeout):
+    """
+    sessions개 세션을 concurrency개씩 동시에 실행
+
+    Returns:
+        dict: 화면별 렌더링 시간, 세션별 저장소 호출 수/읽은 바이트, 오류, 전체 시간, AppTest 목록
+    """
+    handlers = {i: LocalDataHandler(root, latency) for i in range(sessions)}
+    shared_handler = utils_github.get_shared_handler
+    # app.py는 실행할 때마다 get_shared_handler를 가져오므로, 세션의 핸들러를 돌려주도록 교체
+    utils_github.get_shared_handler = lambda token, repo_name: handlers[st.session_state[SESSION_KEY]]
+    st.cache_data.clear()
+    try:
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(lambda i: run_session(i, timeout), range(sessions)))
+        elapsed = time.perf_counter() - start
+    finally:
+        utils_github.get_shared_handler = shared_handler
+    return {
+        'timings': [timings for _, timings, _ in results],
+        'errors': [error for _, _, errors in results for error in errors],
+        'calls': [handler.calls for handler in handlers.values()],
+        'bytes_read': [handler.bytes_read for handler in handlers.values()],
+        'elapsed': elapsed,
+        'apps': [at for at, _, _ in results],
+    }
+
+
+def measure_memory(root, sessions, concurrency, latency, timeout):
+    """
+    세션당 메모리 (tracemalloc)
+
+    Returns:
+        tuple: (세션 상태를 유지한 채 남은 메모리 / 세션 수 KB, 실행 중 최대 메모리 KB)
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    result = run_load(root, sessions, concurrency, latency, timeout)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return (current - baseline) / sessions / 1024, (peak - baseline) / 1024
+
+
+def summarize(result, sessions, concurrency, latency_ms, memory):
+    """측정 결과를 비교 가능한 dict로 정리"""
+    steps = {}
+    for step in STEPS:
+        values = [timings[step] for timings in result['timings'] if step in timings]
+        steps[step] = {f"p{p}": round(percentile(values, p), 1) for p in (50, 95, 99)}
+    renders = [value for timings in result['timings'] for value in timings.values()]
+    calls = collections.Counter()
+    for counter in result['calls']:
+        calls.update(counter)
+    summary = {
+        'sessions': sessions,
+        'concurrency': concurrency,
+        'latency_ms': latency_ms,
+        'render_ms': {f"p{p}": round(percentile(renders, p), 1) for p in (50, 95, 99)},
+        'steps_ms': steps,
+        'storage_calls_per_session': {name: round(count / sessions, 2) for name, count in sorted(calls.items())},
+        'bytes_read_per_session': round(sum(result['bytes_read']) / sessions),
+        'sessions_per_second': round(sessions / result['elapsed'], 2),
+        'errors': len(result['errors']),
+    }
+    if memory:
+        summary['memory_kb_per_session'] = round(memory[0], 1)
+        summary['peak_memory_kb'] = round(memory[1], 1)
+    return summary
+
+
+def print_summary(summary):
+    print(f"세션 {summary['sessions']}개, 동시 {summary['concurrency']}개, 저장소 지연 {summary['latency_ms']}ms")
+    print(f"{'화면':<12}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for step, values in [*summary['steps_ms'].items(), ("전체", summary['render_ms'])]:
+        print(f"{step:<12}" + "".join(f"{values[p]:>8.1f}ms" for p in ('p50', 'p95', 'p99')))
+    calls = ", ".join(f"{name} {count}" for name, count in summary['storage_calls_per_session'].items())
+    print(f"세션당 저장소 호출: {calls} (읽은 데이터 {summary['bytes_read_per_session'] / 1024:,.0f}KB)")
+    if 'memory_kb_per_session' in summary:
+        print(f"세션당 메모리: {summary['memory_kb_per_session']:,.0f}KB (최대 {summary['peak_memory_kb']:,.0f}KB)")
+    print(f"처리량: {summary['sessions_per_second']} 세션/초, 오류 {summary['errors']}건")
+
+
+def compare(summary, baseline, max_regression):
+    """
+    기준 결과와 비교
+
+    Returns:
+        list: 허용 범위를 넘은 항목 설명 (없으면 빈 리스트)
+    """
+    regressions = []
+    for key in ('sessions', 'concurrency', 'latency_ms'):
+        if baseline.get(key) != summary[key]:
+            print(f"⚠️ 기준 결과와 설정이 다릅니다 ({key}: {baseline.get(key)} → {summary[key]})")
+    for p in ('p50', 'p95', 'p99'):
+        old, new = baseline['render_ms'][p], summary['render_ms'][p]
+        if old and new > old * (1 + max_regression):
+            regressions.append(f"렌더링 {p}: {old}ms → {new}ms")
+    old_calls = sum(baseline['storage_calls_per_session'].values())
+    new_calls = sum(summary['storage_calls_per_session'].values())
+    if new_calls > old_calls:
+        regressions.append(f"세션당 저장소 호출: {old_calls} → {new_calls}")
+    old_memory, new_memory = baseline.get('memory_kb_per_session'), summary.get('memory_kb_per_session')
+    if old_memory and new_memory and new_memory > old_memory * (1 + max_regression):
+        regressions.append(f"세션당 메모리: {old_memory}KB → {new_memory}KB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 부하 테스트")
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=5, help="동시에 실행할 세션 수")
+    parser.add_argument('--latency-ms', type=float, default=50, help="저장소 요청당 지연 (GitHub API 왕복 흉내)")
+    parser.add_argument('--days', type=int, default=30, help="news_data.json의 날짜 수")
+    parser.add_argument('--articles', type=int, default=40, help="날짜별 기사 수")
+    parser.add_argument('--feeds', type=int, default=20)
+    parser.add_argument('--image-px', type=int, default=768, help="인포그래픽 가로/세로 픽셀")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=60, help="화면 하나의 최대 렌더링 시간 (초)")
+    parser.add_argument('--no-memory', action='store_true', help="메모리 측정(tracemalloc으로 한 번 더 실행) 생략")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--baseline', help="비교할 기준 결과 JSON 파일")
+    parser.add_argument('--max-regression', type=float, default=0.2, help="기준 대비 허용하는 증가 비율")
+    args = parser.parse_args()
+
+    # AppTest에 secrets를 넘기면 실행할 때마다 전역 st.secrets를 바꿨다가 되돌리므로, 전체 실행 동안 한 번만 설정
+    st.secrets = Secrets()
+    st.secrets._secrets = SECRETS
+
+    root = tempfile.mkdtemp(prefix="bench_load_")
+    try:
+        make_fixture(root, args.days, args.articles, args.feeds, args.image_px, args.seed)
+        latency = args.latency_ms / 1000
+        with shared_app_runtime():
+            # 첫 실행은 모듈 import 비용이 포함되므로 측정에서 제외
+            warmup = run_load(root, 1, 1, 0, args.timeout)
+            if warmup['errors']:
+                print(f"❌ 앱 실행 오류: {warmup['errors']}")
+                sys.exit(2)
+            result = run_load(root, args.sessions, args.concurrency, latency, args.timeout)
+            memory = None if args.no_memory else measure_memory(root, args.sessions, args.concurrency, latency,
+                                                                args.timeout)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    summary = summarize(result, args.sessions, args.concurrency, args.latency_ms, memory)
+    print_summary(summary)
+    for error in result['errors'][:5]:
+        print(f"  ⚠️ {error}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(summary, json.load(f), args.max_regression)
+        if regressions:
+            print("❌ 기준 대비 성능 저하:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("✅ 기준 대비 성능 저하 없음")
+    if result['errors']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+RSS 파서 벤치마크 (빠른 iterparse 파서 vs feedparser)
+
+fixtures/rss/ 의 기록된 피드 문서로 파싱 시간과 최대 메모리 사용량을 비교합니다.
+malformed_entities.xml 처럼 XML 오류가 있는 문서는 빠른 파서가 feedparser로 대체되므로
+두 방식의 결과가 비슷하게 나옵니다.
+
+사용법:
+    python bench_rss.py
+    python bench_rss.py --repeat 50 --max-items 10
+"""
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+
+import feedparser
+
+from utils_rss import parse_feed
+
+
+def measure(func, content: bytes, repeat: int):
+    """(평균 시간 ms, 최대 메모리 KB)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(content)
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    func(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS 파서 벤치마크")
+    parser.add_argument('--fixtures', default='fixtures/rss')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--max-items', type=int, default=10, help="피드당 항목 수 (fetch_rss_news 기본값과 같음)")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.fixtures, '*.xml')))
+    if not paths:
+        print(f"❌ 피드 문서가 없습니다: {args.fixtures}")
+        return
+
+    fast = lambda content: parse_feed(content, args.max_items)
+    slow = lambda content: feedparser.parse(content).entries[:args.max_items]
+
+    print(f"{'파일':<28}{'크기':>9}{'feedparser':>14}{'빠른 파서':>12}{'배속':>8}{'메모리(fp)':>13}{'메모리(빠른)':>13}")
+    total_slow = total_fast = 0.0
+    for path in paths:
+        with open(path, 'rb') as f:
+            content = f.read()
+        slow_ms, slow_kb = measure(slow, content, args.repeat)
+        fast_ms, fast_kb = measure(fast, content, args.repeat)
+        total_slow += slow_ms
+        total_fast += fast_ms
+        print(f"{os.path.basename(path):<28}{len(content) / 1024:>7.0f}KB"
+              f"{slow_ms:>12.2f}ms{fast_ms:>10.2f}ms{slow_ms / fast_ms:>7.1f}x"
+              f"{slow_kb:>11.0f}KB{fast_kb:>11.0f}KB")
+    print(f"{'합계':<37}{total_slow:>12.2f}ms{total_fast:>10.2f}ms{total_slow / total_fast:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
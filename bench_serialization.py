@@ -0,0 +1,92 @@
+"""
+JSON 직렬화 벤치마크 (기존 들여쓰기 형식 vs compact 형식, 표준 json vs orjson)
+
+실제 news_data.json으로 방식별 인코딩/디코딩 시간과 크기를 비교합니다.
+저장소와 주고받는 형태 그대로 UTF-8 bytes로 만들고 bytes에서 읽는 시간을 잽니다
+(기존 방식: json.dumps → encode, decoded_content.decode → json.loads).
+--scale로 날짜 레코드를 복제해서 데이터가 쌓였을 때(예: HOT_DAYS일)의 크기도 측정할 수 있습니다.
+orjson이 설치되어 있지 않으면 orjson 행은 건너뜁니다.
+
+사용법:
+    python bench_serialization.py
+    python bench_serialization.py data/news_data.json --repeat 50 --scale 10
+"""
+import argparse
+import datetime
+import json
+import sys
+import time
+
+import utils_json
+
+
+def scaled(news_data, scale: int):
+    """날짜 레코드를 scale배로 복제 (복제본은 이전 날짜 키로 저장)"""
+    if scale <= 1:
+        return news_data
+    days = {datetime.date.fromisoformat(date_str): day for date_str, day in news_data.items()}
+    span = datetime.timedelta(days=(max(days) - min(days)).days + 1)  # 복제본끼리 날짜가 겹치지 않도록
+    result = dict(news_data)
+    for copy_index in range(1, scale):
+        for date, day in days.items():
+            result[(date - span * copy_index).isoformat()] = day
+    return result
+
+
+def measure(func, repeat: int) -> float:
+    """평균 시간 (밀리초)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def codecs():
+    """(이름, 인코딩 함수, 디코딩 함수) 목록 — 첫 번째가 기준(기존 save_json/load_json 방식)"""
+    decode_text = lambda content: json.loads(content.decode('utf-8'))
+    rows = [
+        ("json 들여쓰기 (기존)", lambda data: json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8'),
+         decode_text),
+        ("json compact", lambda data: json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+         decode_text),
+    ]
+    if utils_json.orjson is not None:
+        orjson = utils_json.orjson
+        rows.append(("orjson compact", orjson.dumps, orjson.loads))
+    rows.append((f"utils_json ({utils_json.BACKEND})", utils_json.dumps, utils_json.loads))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 직렬화 벤치마크")
+    parser.add_argument('path', nargs='?', default='data/news_data.json')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--scale', type=int, default=1, help="날짜 레코드를 몇 배로 복제할지")
+    args = parser.parse_args()
+
+    try:
+        with open(args.path, 'r', encoding='utf-8') as f:
+            news_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"❌ 파일을 읽을 수 없습니다: {e}")
+        sys.exit(1)
+    news_data = scaled(news_data, args.scale)
+
+    print(f"파일: {args.path} (날짜 {len(news_data)}개, 반복 {args.repeat}회)")
+    print(f"{'방식':<26}{'크기':>12}{'인코딩':>12}{'디코딩':>12}{'합계 배속':>10}")
+    baseline = None
+    for name, encode, decode in codecs():
+        content = encode(news_data)
+        if decode(content) != news_data:
+            print(f"⚠️ {name}: 다시 읽은 내용이 원본과 다릅니다")
+        size = len(content)
+        encode_ms = measure(lambda: encode(news_data), args.repeat)
+        decode_ms = measure(lambda: decode(content), args.repeat)
+        total_ms = encode_ms + decode_ms
+        baseline = baseline or (size, total_ms)
+        print(f"{name:<26}{size / 1024:>10.0f}KB{encode_ms:>10.2f}ms{decode_ms:>10.2f}ms"
+              f"{baseline[1] / total_ms:>9.1f}x  (크기 {size / baseline[0] * 100:.0f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+헤드리스 뉴스 수집 스크립트 (cron / CI 러너용)
+
+Streamlit 없이 수집 → 분석 → 인포그래픽 → 저장을 실행하고,
+실행 요약을 JSON 한 줄로 표준 출력에 씁니다. (진행 로그는 표준 에러)
+
+설정 (환경 변수가 TOML 파일보다 우선):
+    NEWSROOM_GITHUB_TOKEN   [api] github_token
+    NEWSROOM_REPO_NAME      [general] repo_name
+    NEWSROOM_GEMINI_KEY     [api] gemini_key
+    NEWSROOM_IMAGEN_KEY     [api] imagen_key (선택)
+    NEWSROOM_SITE_URL       [general] site_url (선택, 정적 사이트 주소)
+    NEWSROOM_PROFILE        1이면 --profile과 같음 (수집을 프로파일링해서 data/profiles/에 저장)
+
+사용법:
+    python collect.py --config .streamlit/secrets.toml
+    NEWSROOM_GITHUB_TOKEN=... NEWSROOM_REPO_NAME=... NEWSROOM_GEMINI_KEY=... python collect.py --all
+
+종료 코드:
+    0  성공
+    1  일부 실패 (저장은 되었지만 분석 또는 인포그래픽 실패)
+    2  설정 오류
+    3  수집된 뉴스 없음 (또는 등록된 피드 없음)
+    4  저장 실패
+    5  예상치 못한 오류
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_CONFIG_ERROR = 2
+EXIT_NO_NEWS = 3
+EXIT_SAVE_FAILED = 4
+EXIT_UNEXPECTED = 5
+
+# (환경 변수, TOML 섹션, TOML 키)
+CONFIG_KEYS = {
+    'github_token': ('NEWSROOM_GITHUB_TOKEN', 'api', 'github_token'),
+    'repo_name': ('NEWSROOM_REPO_NAME', 'general', 'repo_name'),
+    'gemini_key': ('NEWSROOM_GEMINI_KEY', 'api', 'gemini_key'),
+    'imagen_key': ('NEWSROOM_IMAGEN_KEY', 'api', 'imagen_key'),
+    'site_url': ('NEWSROOM_SITE_URL', 'general', 'site_url'),
+}
+REQUIRED_KEYS = ('github_token', 'repo_name', 'gemini_key')
+
+
+def load_config(config_path=None):
+    """
+    환경 변수와 TOML 파일에서 설정 읽기
+
+    Args:
+        config_path: secrets.toml 형식의 설정 파일 경로 (선택적)
+
+    Returns:
+        dict: github_token, repo_name, gemini_key, imagen_key, site_url
+
+    Raises:
+        ValueError: 설정 파일을 읽을 수 없거나 필수 값이 없는 경우
+    """
+    file_config = {}
+    if config_path:
+        try:
+            with open(config_path, 'rb') as f:
+                file_config = tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError) as e:
+            raise ValueError(f"설정 파일을 읽을 수 없습니다 ({config_path}): {e}")
+
+    config = {}
+    for name, (env_name, section, key) in CONFIG_KEYS.items():
+        config[name] = os.environ.get(env_name) or file_config.get(section, {}).get(key)
+
+    missing = [CONFIG_KEYS[name][0] for name in REQUIRED_KEYS if not config[name]]
+    if missing:
+        raise ValueError(f"필수 설정이 없습니다: {', '.join(missing)}")
+    return config
+
+
+def exit_code_for(status):
+    from utils_pipeline import (
+        STATUS_OK, STATUS_PARTIAL, STATUS_NO_FEEDS, STATUS_NO_NEWS, STATUS_SAVE_FAILED
+    )
+    return {
+        STATUS_OK: EXIT_OK,
+        STATUS_PARTIAL: EXIT_PARTIAL,
+        STATUS_NO_FEEDS: EXIT_NO_NEWS,
+        STATUS_NO_NEWS: EXIT_NO_NEWS,
+        STATUS_SAVE_FAILED: EXIT_SAVE_FAILED,
+    }.get(status, EXIT_UNEXPECTED)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="헤드리스 뉴스 수집")
+    parser.add_argument('--config', help="secrets.toml 형식의 설정 파일")
+    parser.add_argument('--all', action='store_true', help="수집 주기와 관계없이 모든 피드 수집")
+    parser.add_argument('--no-infographic', action='store_true', help="인포그래픽 생성 건너뛰기")
+    parser.add_argument('--no-export', action='store_true', help="정적 사이트(docs/) 내보내기 건너뛰기")
+    parser.add_argument('--hedge-infographic', action='store_true',
+                        help="대체 인포그래픽을 병렬로 렌더링하고 먼저 완성된 이미지 사용")
+    parser.add_argument('--no-digest', action='store_true', help="주간/월간 다이제스트 갱신 건너뛰기")
+    parser.add_argument('--profile', action='store_true',
+                        help="수집을 프로파일링해서 data/profiles/에 저장 (NEWSROOM_PROFILE 환경 변수와 같음)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr, format='%(asctime)s %(message)s')
+    log = logging.getLogger('collect')
+
+    try:
+        config = load_config(args.config)
+    except ValueError as e:
+        print(json.dumps({'status': 'config_error', 'errors': [str(e)]}, ensure_ascii=False))
+        sys.exit(EXIT_CONFIG_ERROR)
+
+    try:
+        from utils_github import GithubDataHandler
+        from utils_pipeline import run_collection
+        from utils_profile import profiled, profiling_enabled, save_profile
+
+        db = GithubDataHandler(config['github_token'], config['repo_name'])
+        with profiled("수집 (collect.py)", enabled=args.profile or profiling_enabled()) as profile:
+            summary = run_collection(
+                db,
+                config['gemini_key'],
+                config['imagen_key'],
+                force_all=args.all,
+                with_infographic=not args.no_infographic,
+                hedge_infographic=args.hedge_infographic,
+                export=not args.no_export,
+                site_url=config['site_url'],
+                on_progress=lambda step, percent, message, level: log.info(f"[{percent:3d}%] {step} {message}"),
+                digests=not args.no_digest,
+            )
+        if profile:
+            summary['profile'] = profile['id'] if save_profile(db, profile) else None
+    except Exception as e:
+        log.exception("수집 중 예상치 못한 오류")
+        print(json.dumps({'status': 'error', 'errors': [str(e)]}, ensure_ascii=False))
+        sys.exit(EXIT_UNEXPECTED)
+
+    summary.pop('result', None)
+    print(json.dumps(summary, ensure_ascii=False))
+    sys.exit(exit_code_for(summary['status']))
+
+
+if __name__ == '__main__':
+    main()
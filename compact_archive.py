@@ -0,0 +1,47 @@
+"""
+오래된 뉴스 날짜를 월별 압축 아카이브로 옮기는 스크립트
+
+data/news_data.json에는 최근 N일만 남기고, 그 이전 날짜는
+data/archive/YYYY-MM.json.gz로 옮깁니다. (.streamlit/secrets.toml의 GitHub 설정 사용)
+
+사용법:
+    python compact_archive.py                 # 최근 30일만 남기기
+    python compact_archive.py --hot-days 14
+"""
+import argparse
+import json
+import sys
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+
+from utils_archive import HOT_DAYS, compact_news_data
+from utils_github import GithubDataHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="뉴스 데이터 아카이브 압축")
+    parser.add_argument('--hot-days', type=int, default=HOT_DAYS,
+                        help=f"news_data.json에 남길 최근 일수 (기본값: {HOT_DAYS})")
+    parser.add_argument('--secrets', default='.streamlit/secrets.toml')
+    args = parser.parse_args()
+
+    try:
+        with open(args.secrets, 'rb') as f:
+            secrets = tomllib.load(f)
+        github_token = secrets['api']['github_token']
+        repo_name = secrets['general']['repo_name']
+    except (OSError, KeyError, tomllib.TOMLDecodeError) as e:
+        print(f"❌ 설정을 읽을 수 없습니다 ({args.secrets}): {e}")
+        sys.exit(1)
+
+    db = GithubDataHandler(github_token, repo_name)
+    result = compact_news_data(db, hot_days=args.hot_days)
+    print(json.dumps(result, ensure_ascii=False))
+    sys.exit(0 if result['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
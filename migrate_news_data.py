@@ -0,0 +1,69 @@
+"""
+news_data.json 스키마 마이그레이션 스크립트 (버전 1 → 현재 버전)
+
+변환 전후의 파일 크기와 파싱 시간을 측정해서 출력합니다.
+
+사용법:
+    python migrate_news_data.py                       # data/news_data.json 측정만
+    python migrate_news_data.py --write               # 변환 결과를 파일에 저장
+    python migrate_news_data.py path/to/news_data.json --write
+"""
+import argparse
+import copy
+import json
+import sys
+import time
+
+from utils_schema import SCHEMA_VERSION, migrate_news_data
+
+
+def measure(content: str, repeat: int = 20) -> float:
+    """json.loads 평균 시간 (밀리초)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        json.loads(content)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="news_data.json 스키마 마이그레이션")
+    parser.add_argument('path', nargs='?', default='data/news_data.json')
+    parser.add_argument('--write', action='store_true', help="변환 결과를 파일에 저장")
+    args = parser.parse_args()
+
+    try:
+        with open(args.path, 'r', encoding='utf-8') as f:
+            before_text = f.read()
+    except OSError as e:
+        print(f"❌ 파일을 읽을 수 없습니다: {e}")
+        sys.exit(1)
+
+    news_data = json.loads(before_text)
+    migrated = copy.deepcopy(news_data)
+    changed = migrate_news_data(migrated)
+    after_text = json.dumps(migrated, indent=4, ensure_ascii=False)
+
+    before_bytes = len(before_text.encode('utf-8'))
+    after_bytes = len(after_text.encode('utf-8'))
+    before_ms = measure(before_text)
+    after_ms = measure(after_text)
+
+    print("=" * 60)
+    print(f"news_data.json 스키마 마이그레이션 (→ 버전 {SCHEMA_VERSION})")
+    print("=" * 60)
+    print(f"파일: {args.path}")
+    print(f"날짜 수: {len(news_data)} (변환 대상 {changed}개)")
+    print(f"크기: {before_bytes:,} bytes → {after_bytes:,} bytes "
+          f"({(1 - after_bytes / before_bytes) * 100:.1f}% 감소)")
+    print(f"파싱 시간: {before_ms:.2f} ms → {after_ms:.2f} ms")
+
+    if args.write and changed:
+        with open(args.path, 'w', encoding='utf-8') as f:
+            f.write(after_text)
+        print(f"✅ 저장 완료: {args.path}")
+    elif args.write:
+        print("ℹ️ 이미 최신 스키마입니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+RSS 요약 정규화 테스트 스크립트 (python test_text.py 또는 pytest로 실행)
+"""
+from utils_text import normalize_summary
+
+
+def test_keeps_summary_starting_with_read_more():
+    text = "Read more about why this matters: Google said 10x growth in AI usage over the year."
+    assert normalize_summary(text) == text
+
+
+def test_strips_trailing_read_more():
+    assert normalize_summary("Big news. Continue reading at The Verge.com") == "Big news."
+    assert normalize_summary("Big news … Read more »") == "Big news …"
+
+
+def test_keeps_read_more_inside_summary():
+    text = "He said you can read more about it in the report. Then it ended."
+    assert normalize_summary(text) == text
+
+
+def test_splits_glued_sentences():
+    assert normalize_summary("완료했다.6일 발표") == "완료했다. 6일 발표"
+    assert normalize_summary("launched today.The company") == "launched today. The company"
+
+
+def test_keeps_abbreviations_and_domains():
+    for text in ["U.S.A 정부", "Node.JS 출시", "v1.2B 모델", "Amazon.Com 실적"]:
+        assert normalize_summary(text) == text
+
+
+if __name__ == '__main__':
+    tests = [(name, func) for name, func in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for name, func in tests:
+        try:
+            func()
+            print(f"✅ {name}")
+        except AssertionError:
+            failed += 1
+            print(f"❌ {name}")
+    raise SystemExit(1 if failed else 0)
@@ -1,61 +1,185 @@
-import feedparser
 import google.generativeai as genai
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import json
+import time
+import datetime
 from PIL import Image
 import io
+import requests
+import utils_feeds
+from utils_text import normalize_summary, normalize_title
+from utils_prompt import build_analysis_prompt
+from utils_fetch import MAX_API_BYTES, MAX_FEED_BYTES, fetch_feed_bytes, read_bounded
+from utils_rss import parse_feed
+from utils_cluster import build_topics, cluster_articles, cluster_sizes_summary
+from utils_insights import MAX_CHUNKS, article_id, build_insight_chunks, parse_insights
+from utils_schema import SCHEMA_VERSION, make_article
+from urllib.parse import urlparse
+from utils_resilience import (
+    Deadline, DeadlineExceeded, CircuitOpenError, BudgetExhausted, BackgroundTask, CallBudget,
+    get_breaker, call_with_policy, race, stream
+)
 
 
-def fetch_rss_news(rss_urls: List[str], max_items_per_feed: int = 10) -> List[Dict[str, Any]]:
+# 복원력 정책 (최악의 경우 수집 시간이 예측 가능하도록 모든 외부 호출에 상한을 둠)
+FEED_TIMEOUT = 10              # 피드 요청당 timeout (초)
+FEED_RETRY_ATTEMPTS = 2        # 피드당 최대 시도 횟수
+FETCH_STAGE_DEADLINE = 90      # RSS 수집 단계 전체 마감 (초)
+FEED_CONCURRENCY = 6           # 동시에 내려받을 최대 피드 수
+GEMINI_TIMEOUT = 60            # Gemini 호출당 timeout (초)
+GEMINI_RETRY_ATTEMPTS = 3      # Gemini 호출당 최대 시도 횟수
+ANALYSIS_DEADLINE = 180        # 분석 단계 전체 마감 (초)
+GEMINI_CONCURRENCY = 4         # 한 번의 수집에서 동시에 진행할 최대 Gemini 호출 수 (모든 피드 그룹 합계)
+GEMINI_CALLS_PER_RUN = 30      # 한 번의 수집에서 사용할 최대 Gemini 호출 수 (모든 피드 그룹 합계)
+BREAKER_FAILURE_THRESHOLD = 3  # 연속 실패 몇 번이면 차단할지
+BREAKER_COOLDOWN = 30 * 60     # 차단 유지 시간 (초)
+
+INSIGHT_GENERATION_CONFIG = {'response_mime_type': 'application/json'}  # 기사별 분석은 JSON으로만 응답
+RSS_REQUEST_HEADERS = {'User-Agent': 'my-ai-newsroom/1.0 (+RSS reader)'}
+
+
+def _feed_breaker(url: str):
+    return get_breaker(f"feed:{url}", BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN)
+
+
+def _gemini_breaker(model_name: str):
+    return get_breaker(f"gemini:{model_name}", BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN)
+
+
+def _download_feed(url: str, deadline: Deadline, max_items: int) -> List[Dict[str, Any]]:
+    """피드를 크기/시간 제한 안에서 내려받아 앞쪽 max_items개 항목만 파싱"""
+    content = fetch_feed_bytes(url, deadline.timeout(FEED_TIMEOUT), MAX_FEED_BYTES, RSS_REQUEST_HEADERS)
+    return parse_feed(content, max_items)
+
+
+def generate_content_with_policy(model, model_name: str, prompt: str,
+                                 deadline: Optional[Deadline] = None,
+                                 timeout: float = GEMINI_TIMEOUT,
+                                 attempts: int = GEMINI_RETRY_ATTEMPTS,
+                                 budget: Optional[CallBudget] = None,
+                                 reserve: int = 0,
+                                 **kwargs):
     """
-    RSS URL 리스트에서 최신 뉴스를 수집
+    timeout/재시도/서킷 브레이커를 적용해 Gemini generate_content 호출
     
     Args:
-        rss_urls: RSS URL 리스트
-        max_items_per_feed: 피드당 최대 수집 개수
+        model: genai.GenerativeModel 객체
+        model_name: 브레이커 구분용 모델 이름
+        prompt: 프롬프트
+        deadline: 전체 마감 시간 (없으면 호출 단위로만 제한)
+        timeout: 호출당 timeout (초)
+        attempts: 최대 시도 횟수
+        budget: 실행 단위 호출 예산 (주어지면 1회 차감하고 동시 호출 수를 제한)
+        reserve: budget에서 남겨둘 호출 수 (중요도가 낮은 호출용)
         
     Returns:
-        뉴스 리스트 (제목, 링크, 요약 포함)
+        generate_content 응답
     """
-    all_news = []
+    deadline = deadline or Deadline(None)
     
-    for url in rss_urls:
-        try:
-            feed = feedparser.parse(url)
-            
-            for entry in feed.entries[:max_items_per_feed]:
-                news_item = {
-                    'title': entry.get('title', '제목 없음'),
-                    'link': entry.get('link', ''),
-                    'summary': entry.get('summary', entry.get('description', '요약 없음')),
-                    'published': entry.get('published', '')
-                }
-                all_news.append(news_item)
-        except Exception as e:
-            print(f"RSS 파싱 오류 ({url}): {e}")
-            continue
+    def _call():
+        return model.generate_content(
+            prompt, request_options={'timeout': deadline.timeout(timeout)}, **kwargs
+        )
     
-    return all_news
+    if budget is None:
+        return call_with_policy(_gemini_breaker(model_name), _call, attempts=attempts, deadline=deadline)
+    with budget.slot(reserve, deadline):
+        return call_with_policy(_gemini_breaker(model_name), _call, attempts=attempts, deadline=deadline)
+
+
+def _normalize_entry(entry: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """정규화: HTML/상투 문구 제거 및 길이 제한 (프롬프트와 저장 데이터 모두 평문 사용)"""
+    return {
+        'title': normalize_title(entry['title']),
+        'link': entry['link'],
+        'summary': normalize_summary(entry['summary']),
+        'published': entry['published'],
+        'source': source
+    }
 
 
-def analyze_news_with_gemini(news_list: List[Dict[str, Any]], api_key: str) -> Dict[str, Any]:
+def iter_rss_news(rss_urls: List[str], max_items_per_feed: int = 10,
+                  deadline: Optional[Deadline] = None,
+                  feed_health: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
     """
-    Gemini AI를 사용해 뉴스들을 분석하고 요약
+    RSS 피드를 동시에 내려받고, 도착하는 순서대로 피드별 뉴스를 내보내기
+
+    느린 피드를 기다리는 동안 먼저 도착한 피드의 기사를 다음 단계(중복 제거, 분석)에서
+    바로 처리할 수 있습니다. 실패한 피드는 내보내지 않습니다.
     
     Args:
-        news_list: 분석할 뉴스 리스트
-        api_key: Google Gemini API 키
+        rss_urls: RSS URL 리스트
+        max_items_per_feed: 피드당 최대 수집 개수
+        deadline: 수집 단계 마감 시간 (기본값: FETCH_STAGE_DEADLINE초)
+        feed_health: feeds.json의 health dict (주어지면 피드별 결과를 기록)
         
-    Returns:
-        분석 결과 dict (summary, keywords, articles 포함)
+    Yields:
+        tuple: (RSS URL, 뉴스 리스트)
     """
-    if not news_list:
-        return {
-            'summary': '수집된 뉴스가 없습니다.',
-            'keywords': [],
-            'articles': []
-        }
+    deadline = deadline or Deadline(FETCH_STAGE_DEADLINE)
+    # health 기록은 호출한 스레드에서만 수정 (작업 스레드는 내려받기만 함)
+    healths = {url: feed_health.setdefault(url, {}) if feed_health is not None else {} for url in rss_urls}
+
+    def _fetch(url: str):
+        started = time.monotonic()
+        entries = call_with_policy(_feed_breaker(url), _download_feed, url, deadline, max_items_per_feed,
+                                   attempts=FEED_RETRY_ATTEMPTS, deadline=deadline)
+        return entries, time.monotonic() - started
+
+    tasks = {url: (lambda url=url: _fetch(url)) for url in dict.fromkeys(rss_urls)}
+    for url, result, error in stream(tasks, deadline, FEED_CONCURRENCY):
+        if isinstance(error, CircuitOpenError):
+            print(f"RSS 피드 건너뜀: {error}")
+            continue
+        if isinstance(error, DeadlineExceeded):
+            print(f"RSS 수집 마감 시간 초과: {url}")
+            continue
+        if error is not None:
+            print(f"RSS 파싱 오류 ({url}): {error}")
+            utils_feeds.record_failure(healths[url], error)
+            continue
+        entries, elapsed = result
+        utils_feeds.record_success(healths[url], elapsed, [entry['published_at'] for entry in entries])
+        source = urlparse(url).netloc
+        yield url, [_normalize_entry(entry, source) for entry in entries]
+
+
+def fetch_rss_news(rss_urls: List[str], max_items_per_feed: int = 10,
+                   deadline: Optional[Deadline] = None,
+                   feed_health: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    RSS URL 리스트에서 최신 뉴스를 수집
+    
+    계속 실패하는 피드는 서킷 브레이커로 일정 시간 건너뛰고,
+    전체 수집은 deadline 안에서 끝납니다.
     
+    Args:
+        rss_urls: RSS URL 리스트
+        max_items_per_feed: 피드당 최대 수집 개수
+        deadline: 수집 단계 마감 시간 (기본값: FETCH_STAGE_DEADLINE초)
+        feed_health: feeds.json의 health dict (주어지면 피드별 결과를 기록)
+        
+    Returns:
+        뉴스 리스트 (제목, 링크, 요약 포함, rss_urls 순서)
+    """
+    by_url = dict(iter_rss_news(rss_urls, max_items_per_feed, deadline, feed_health))
+    return [news for url in rss_urls if url in by_url for news in by_url.pop(url)]
+
+
+def init_gemini_model(api_key: str) -> Tuple[Any, str]:
+    """
+    분석에 사용할 Gemini 모델 초기화 (gemini-2.0-flash, 없으면 사용 가능한 모델)
+
+    Args:
+        api_key: Google Gemini API 키
+
+    Returns:
+        tuple: (genai.GenerativeModel, 모델 이름)
+
+    Raises:
+        Exception: 사용할 수 있는 모델이 없는 경우
+    """
     # Gemini 설정
     genai.configure(api_key=api_key)
     
@@ -93,28 +217,117 @@ def analyze_news_with_gemini(news_list: List[Dict[str, Any]], api_key: str) -> D
         except Exception as e2:
             raise Exception(f"Gemini 모델을 초기화할 수 없습니다: {str(e2)}")
     
-    # 뉴스 내용을 텍스트로 정리
-    news_text = "\n\n".join([
-        f"제목: {news.get('title', '제목 없음')}\n요약: {str(news.get('summary', ''))[:200]}..."
-        for news in news_list[:20]  # 최대 20개만 분석
-    ])
-    
-    # 프롬프트 작성
-    prompt = f"""다음 IT 뉴스들을 IT 전문가 관점에서 분석해주세요.
+    return model, model_name
+
+
+class InsightBatcher:
+    """
+    기사별 분석 호출을 묶음 단위로 바로 시작하고, 결과는 마지막에 모아서 받기
+
+    파이프라인에서는 피드가 도착할 때마다 묶음을 보내므로, 기사별 분석이
+    나머지 피드 수집과 전체 요약 호출과 겹쳐서 실행됩니다.
+    """
+
+    def __init__(self, model, model_name: str, deadline: Deadline, max_batches: int = MAX_CHUNKS,
+                 budget: Optional[CallBudget] = None, reserve: int = 0):
+        """
+        Args:
+            model: genai.GenerativeModel 객체
+            model_name: 모델 이름
+            deadline: 분석 마감 시간 (각 호출과 collect()의 대기에 적용)
+            max_batches: 보낼 최대 묶음 수 (초과한 묶음은 분석하지 않음)
+            budget: 실행 단위 호출 예산 (선택적)
+            reserve: budget에서 전체 요약 등을 위해 남겨둘 호출 수
+        """
+        self.model = model
+        self.model_name = model_name
+        self.deadline = deadline
+        self.max_batches = max_batches
+        self.budget = budget
+        self.reserve = reserve
+        self._batches: List[Tuple[BackgroundTask, List[str]]] = []
+
+    def submit(self, prompt: str, ids: List[str]) -> bool:
+        """
+        기사별 분석 호출 하나를 백그라운드에서 시작
+
+        Args:
+            prompt: build_insight_prompt() / build_insight_chunks()의 프롬프트
+            ids: 프롬프트에 포함된 기사 ID 목록
+
+        Returns:
+            bool: 시작했으면 True (최대 묶음 수를 넘으면 False)
+        """
+        if not ids or len(self._batches) >= self.max_batches:
+            return False
+        task = BackgroundTask(
+            lambda: generate_content_with_policy(self.model, self.model_name, prompt, self.deadline,
+                                                 budget=self.budget, reserve=self.reserve,
+                                                 generation_config=INSIGHT_GENERATION_CONFIG),
+            name=f"insights:{len(self._batches)}"
+        )
+        self._batches.append((task, ids))
+        return True
+
+    def collect(self) -> Dict[str, str]:
+        """
+        보낸 호출의 결과를 검증해서 합치기 (실패한 묶음은 건너뜀)
+
+        Returns:
+            dict: {기사 ID: 분석}
+        """
+        insights: Dict[str, str] = {}
+        for task, ids in self._batches:
+            try:
+                batch_insights = parse_insights(task.result(self.deadline).text, ids)
+            except Exception as e:
+                print(f"기사별 분석 실패 (기사 {len(ids)}개): {e}")
+                continue
+            if len(batch_insights) < len(ids):
+                print(f"기사별 분석 일부 누락: {len(batch_insights)}/{len(ids)}개")
+            insights.update(batch_insights)
+        return insights
 
-{news_text}
 
-다음 JSON 형식으로 응답해주세요:
-{{
-    "summary": "전체 뉴스를 종합한 3줄 요약",
-    "keywords": ["키워드1", "키워드2", "키워드3"],
-    "trends": "주요 트렌드나 인사이트"
-}}
+def failed_summary(error: Any, message: Optional[str] = None) -> Dict[str, Any]:
+    """전체 요약 실패 시 저장할 기본 형식 (error 포함)"""
+    return {
+        'summary': message or f'AI 분석 중 오류가 발생했습니다: {error}',
+        'keywords': [],
+        'trends': '',
+        'error': str(error)
+    }
 
-반드시 유효한 JSON 형식으로만 응답해주세요."""
 
+def summarize_news(news_list: List[Dict[str, Any]], model, model_name: str,
+                   deadline: Optional[Deadline] = None,
+                   token_budget: Optional[int] = None,
+                   budget: Optional[CallBudget] = None) -> Dict[str, Any]:
+    """
+    뉴스 전체 요약 (주제 묶기 → 프롬프트 → Gemini 호출 → JSON 파싱)
+
+    Args:
+        news_list: 분석할 뉴스 리스트
+        model: genai.GenerativeModel 객체
+        model_name: 모델 이름 (토큰 예산 결정)
+        deadline: 분석 마감 시간 (기본값: ANALYSIS_DEADLINE초)
+        token_budget: 프롬프트 토큰 예산 (기본값: 모델별 MODEL_TOKEN_BUDGETS)
+        budget: 실행 단위 호출 예산 (선택적)
+
+    Returns:
+        dict: summary, keywords, trends, topics (실패 시 error 포함)
+    """
+    # 비슷한 기사를 주제로 묶고, 중요한 주제의 대표 기사부터 모델별 토큰 예산만큼 프롬프트에 포함
+    clusters = cluster_articles(news_list)
+    print(f"주제 묶기: {cluster_sizes_summary(clusters)}")
+    topics = build_topics(news_list, clusters)
+    prompt, _ = build_analysis_prompt(news_list, model_name, token_budget, clusters)
+
+    deadline = deadline or Deadline(ANALYSIS_DEADLINE)
+    response_text = ''
+    
     try:
-        response = model.generate_content(prompt)
+        response = generate_content_with_policy(model, model_name, prompt, deadline, budget=budget)
         response_text = response.text.strip()
         
         # JSON 추출 (마크다운 코드 블록 제거)
@@ -125,79 +338,76 @@ def analyze_news_with_gemini(news_list: List[Dict[str, Any]], api_key: str) -> D
         
         analysis_result = json.loads(response_text)
         
-        # 각 뉴스에 AI 분석 추가
-        # 성능 최적화: 개별 분석 대신 원본 요약 사용 (전체 요약에서 충분한 정보 제공)
-        articles = []
-        
-        for news in news_list:
-            # 원본 요약을 AI 분석으로 사용 (전체 요약에서 이미 충분한 분석 제공)
-            # 개별 API 호출을 제거하여 시간을 대폭 단축
-            summary_text = news.get('summary', '')
-            if len(summary_text) > 300:
-                ai_analysis = summary_text[:300] + "..."
-            else:
-                ai_analysis = summary_text if summary_text else "요약 없음"
-            
-            articles.append({
-                'title': news['title'],
-                'link': news['link'],
-                'summary': news['summary'],
-                'ai_analysis': ai_analysis,
-                'published': news.get('published', '')
-            })
-        
         return {
             'summary': analysis_result.get('summary', '분석 결과를 생성할 수 없습니다.'),
             'keywords': analysis_result.get('keywords', []),
             'trends': analysis_result.get('trends', ''),
-            'articles': articles
+            'topics': topics
         }
         
     except json.JSONDecodeError as e:
         # JSON 파싱 실패 시 기본 형식 반환
-        return {
-            'summary': f'AI 분석 중 오류가 발생했습니다. (JSON 파싱 실패)\n응답: {response_text[:200]}',
-            'keywords': [],
-            'trends': '',
-            'articles': [
-                {
-                    'title': news['title'],
-                    'link': news['link'],
-                    'summary': news['summary'],
-                    'ai_analysis': news['summary'],
-                    'published': news.get('published', '')
-                }
-                for news in news_list
-            ]
-        }
+        result = failed_summary(f'JSON 파싱 실패: {e}',
+                                f'AI 분석 중 오류가 발생했습니다. (JSON 파싱 실패)\n응답: {response_text[:200]}')
     except Exception as e:
         error_msg = str(e)
-        # 사용 가능한 모델 정보 추가
-        try:
-            available_models = []
-            for m in genai.list_models():
-                if 'generateContent' in m.supported_generation_methods:
-                    available_models.append(m.name.replace('models/', ''))
-            if available_models:
-                error_msg += f"\n\n사용 가능한 모델: {', '.join(available_models[:5])}"
-        except:
-            pass
+        # 사용 가능한 모델 정보 추가 (차단/마감 초과 시에는 추가 호출을 하지 않음)
+        if not isinstance(e, (CircuitOpenError, DeadlineExceeded, BudgetExhausted)):
+            try:
+                available_models = []
+                for m in genai.list_models(request_options={'timeout': FEED_TIMEOUT}):
+                    if 'generateContent' in m.supported_generation_methods:
+                        available_models.append(m.name.replace('models/', ''))
+                if available_models:
+                    error_msg += f"\n\n사용 가능한 모델: {', '.join(available_models[:5])}"
+            except:
+                pass
+        result = failed_summary(e, f'AI 분석 중 오류가 발생했습니다: {error_msg}')
+    result['topics'] = topics
+    return result
+
+
+def analyze_news_with_gemini(news_list: List[Dict[str, Any]], api_key: str,
+                             deadline: Optional[Deadline] = None,
+                             token_budget: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Gemini AI를 사용해 뉴스들을 분석하고 요약
+
+    기사별 분석(기사 묶음당 1회) 호출을 먼저 백그라운드에서 시작하고, 그동안 전체 요약을 호출합니다.
+    기사별 분석은 일부 묶음이 실패해도 성공한 기사만 저장합니다.
+    
+    Args:
+        news_list: 분석할 뉴스 리스트
+        api_key: Google Gemini API 키
+        deadline: 분석 단계 마감 시간 (기본값: ANALYSIS_DEADLINE초)
+        token_budget: 프롬프트 토큰 예산 (기본값: 모델별 MODEL_TOKEN_BUDGETS)
         
+    Returns:
+        분석 결과 dict (summary, keywords, articles, topics 포함, 실패 시 error 포함)
+    """
+    if not news_list:
         return {
-            'summary': f'AI 분석 중 오류가 발생했습니다: {error_msg}',
+            'summary': '수집된 뉴스가 없습니다.',
             'keywords': [],
-            'trends': '',
-            'articles': [
-                {
-                    'title': news['title'],
-                    'link': news['link'],
-                    'summary': news['summary'],
-                    'ai_analysis': news['summary'],
-                    'published': news.get('published', '')
-                }
-                for news in news_list
-            ]
+            'articles': []
         }
+    
+    model, model_name = init_gemini_model(api_key)
+    deadline = deadline or Deadline(ANALYSIS_DEADLINE)
+
+    batcher = InsightBatcher(model, model_name, deadline)
+    for chunk_prompt, chunk_ids in build_insight_chunks(news_list, model_name, token_budget):
+        batcher.submit(chunk_prompt, chunk_ids)
+    result = summarize_news(news_list, model, model_name, deadline, token_budget)
+
+    # 기사별 레코드 (요약은 한 번만 저장하고, 분석이 있는 기사만 ai_analysis 저장)
+    insights = batcher.collect()
+    result['articles'] = [
+        make_article(news, news.get('ai_analysis') or insights.get(article_id(news)))
+        for news in news_list
+    ]
+    result['schema_version'] = SCHEMA_VERSION
+    return result
 
 
 def fetch_and_analyze_news(rss_urls: List[str], api_key: str) -> Dict[str, Any]:
@@ -228,13 +438,16 @@ def fetch_and_analyze_news(rss_urls: List[str], api_key: str) -> Dict[str, Any]:
     return analyzed_data
 
 
-def get_infographic_prompt(summary_text: str, api_key: str) -> Optional[str]:
+def get_infographic_prompt(summary_text: str, api_key: str, deadline: Optional[Deadline] = None,
+                           budget: Optional[CallBudget] = None) -> Optional[str]:
     """
     Gemini Pro를 사용해 인포그래픽 생성을 위한 영어 프롬프트 생성
     
     Args:
         summary_text: 뉴스 요약 텍스트 (한글)
         api_key: Google Gemini API 키
+        deadline: 마감 시간 (기본값: GEMINI_TIMEOUT의 2배)
+        budget: 실행 단위 호출 예산 (선택적)
         
     Returns:
         str: 이미지 생성용 영어 프롬프트
@@ -244,11 +457,13 @@ def get_infographic_prompt(summary_text: str, api_key: str) -> Optional[str]:
         
         # 사용 가능한 모델 찾기
         model = None
+        model_name = 'gemini-2.0-flash'
         try:
-            model = genai.GenerativeModel('gemini-2.0-flash')
+            model = genai.GenerativeModel(model_name)
         except:
             try:
-                model = genai.GenerativeModel('gemini-1.0-pro')
+                model_name = 'gemini-1.0-pro'
+                model = genai.GenerativeModel(model_name)
             except:
                 available_models = []
                 for m in genai.list_models():
@@ -256,7 +471,8 @@ def get_infographic_prompt(summary_text: str, api_key: str) -> Optional[str]:
                         name = m.name.replace('models/', '')
                         available_models.append(name)
                 if available_models:
-                    model = genai.GenerativeModel(available_models[0])
+                    model_name = available_models[0]
+                    model = genai.GenerativeModel(model_name)
         
         if model is None:
             return None
@@ -274,7 +490,8 @@ News Summary: {summary_text}
 
 Please provide ONLY the image generation prompt in English. Do not include any explanations or additional text."""
 
-        response = model.generate_content(prompt_request)
+        response = generate_content_with_policy(model, model_name, prompt_request,
+                                                 deadline or Deadline(GEMINI_TIMEOUT * 2), budget=budget)
         image_prompt = response.text.strip()
         
         return image_prompt
@@ -283,151 +500,221 @@ Please provide ONLY the image generation prompt in English. Do not include any e
         return None
 
 
-def generate_infographic_image(prompt: str, gemini_api_key: str, imagen_api_key: str = None, summary_text: str = "", keywords: list = None) -> Optional[Image.Image]:
+# 인포그래픽 생성 전략
+IMAGE_DEADLINE = 45                   # 3단계(이미지 생성) 전체 마감 (초)
+IMAGE_FAILURE_THRESHOLD = 2           # 방법별 연속 실패 몇 번이면 건너뛸지
+IMAGE_FAILURE_COOLDOWN = 6 * 60 * 60  # 실패한 방법을 건너뛰는 시간 (초)
+INFOGRAPHIC_VERSION = 1               # 프롬프트나 렌더링 방식을 바꾸면 올림 (같은 요약도 인포그래픽을 다시 생성)
+IMAGEN_MODELS = [
+    "imagen-4.0-generate-001",  # Imagen 4 (최신, Gemini API를 통해 사용 가능)
+    "imagen-3.0-generate-001",
+    "imagen-2.0-generate-001"
+]
+
+# API 키별로 마지막으로 성공한 이미지 생성 방법 (다음 실행에서 먼저 시도)
+_last_good_image_method: Dict[str, str] = {}
+
+
+def _key_id(api_key: str) -> str:
+    """API 키를 그대로 남기지 않기 위한 짧은 식별자"""
+    import hashlib
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+
+def _imagen_via_gemini(api_key: str, model_name: str, prompt: str, deadline: Deadline) -> Image.Image:
+    """
+    Gemini API를 통한 Imagen 호출 (이미지가 없으면 예외)
+
+    genai.configure()는 프로세스 전체 설정을 바꿔서 다른 스레드의 Gemini 호출에 영향을 주므로,
+    SDK 대신 REST API에 이 키를 직접 넣어 호출합니다.
+    """
+    import base64
+
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent"
+    # Imagen은 간단한 프롬프트만 전달 (generation_config 없이)
+    payload = {"contents": [{"parts": [{"text": prompt}]}]}
+    timeout = deadline.timeout(GEMINI_TIMEOUT)
+    response = requests.post(url, headers={"Content-Type": "application/json", "Accept-Encoding": "gzip, deflate"},
+                             params={"key": api_key}, json=payload, timeout=timeout, stream=True)
+    if not response.ok:
+        response.close()
+        response.raise_for_status()
+    result = json.loads(read_bounded(response, MAX_API_BYTES, Deadline(timeout)))
+
+    # inline_data(Base64) 형식의 응답 처리
+    for candidate in result.get("candidates") or []:
+        for part in (candidate.get("content") or {}).get("parts") or []:
+            inline_data = part.get("inlineData") or part.get("inline_data")
+            if inline_data and inline_data.get("data"):
+                image_data = base64.b64decode(inline_data["data"])
+                return Image.open(io.BytesIO(image_data))
+    raise ValueError(f"{model_name} 응답에 이미지가 없습니다.")
+
+
+def _imagen_via_vertex(prompt: str, deadline: Deadline) -> Image.Image:
+    """
+    Vertex AI Imagen 호출
+    
+    참고: Vertex AI는 google-cloud-aiplatform 라이브러리와 서비스 계정 키가 필요합니다
+    (환경 변수 GOOGLE_APPLICATION_CREDENTIALS에 서비스 계정 키 경로 설정 필요)
+    """
+    import vertexai
+    from vertexai.preview.vision_models import ImageGenerationModel
+    
+    def _generate():
+        vertexai.init(project=None, location="us-central1")
+        model = ImageGenerationModel.from_pretrained("imagegeneration@006")
+        return model.generate_images(
+            prompt=prompt,
+            number_of_images=1,
+            aspect_ratio="16:9"
+        )
+    
+    # SDK 호출에 timeout 옵션이 없으므로 백그라운드에서 실행하고 호출당 timeout까지만 기다림
+    images = BackgroundTask(_generate, "vertex-imagen").result(Deadline(deadline.timeout(GEMINI_TIMEOUT)))
+    if images and len(images) > 0:
+        return images[0]._pil_image
+    raise ValueError("Vertex AI 응답에 이미지가 없습니다.")
+
+
+def _imagen_via_rest(api_key: str, prompt: str, deadline: Deadline) -> Image.Image:
+    """Google AI Studio Imagen API (REST API 직접 호출)"""
+    import base64
+    
+    url = "https://generativelanguage.googleapis.com/v1beta/models/imagen-3.0-generate-001:generateImages"
+    payload = {
+        "prompt": prompt,
+        "number_of_images": 1,
+        "aspect_ratio": "16:9"
+    }
+    timeout = deadline.timeout(GEMINI_TIMEOUT)
+    response = requests.post(url, headers={"Content-Type": "application/json", "Accept-Encoding": "gzip, deflate"},
+                             params={"key": api_key}, json=payload, timeout=timeout, stream=True)
+    if not response.ok:
+        response.close()
+        response.raise_for_status()
+    # base64 이미지가 들어 있는 응답도 크기/시간 제한 안에서만 읽음
+    result = json.loads(read_bounded(response, MAX_API_BYTES, Deadline(timeout)))
+    if "images" in result and len(result["images"]) > 0:
+        # Base64 이미지 디코딩
+        image_data = base64.b64decode(result["images"][0]["bytesBase64Encoded"])
+        return Image.open(io.BytesIO(image_data))
+    raise ValueError("Imagen REST API 응답에 이미지가 없습니다.")
+
+
+def _image_methods(prompt: str, gemini_api_key: str, imagen_api_key: Optional[str],
+                   deadline: Deadline) -> List[tuple]:
+    """
+    (방법 이름, 호출 함수) 목록
+    
+    방법 이름에 API 키 식별자가 들어가므로 성공/실패 기록은 키별로 따로 관리됩니다.
     """
-    인포그래픽 이미지 생성 (여러 방법 시도)
+    from functools import partial
+    
+    methods = []
+    gemini_id = _key_id(gemini_api_key)
+    for model_name in IMAGEN_MODELS:
+        methods.append((f"gemini:{gemini_id}:{model_name}",
+                        partial(_imagen_via_gemini, gemini_api_key, model_name, prompt, deadline)))
+    
+    # 별도 Imagen API 키가 있는 경우
+    if imagen_api_key and imagen_api_key != gemini_api_key:
+        imagen_id = _key_id(imagen_api_key)
+        methods.append((f"vertex:{imagen_id}", partial(_imagen_via_vertex, prompt, deadline)))
+        methods.append((f"rest:{imagen_id}", partial(_imagen_via_rest, imagen_api_key, prompt, deadline)))
+        for model_name in IMAGEN_MODELS:
+            methods.append((f"gemini:{imagen_id}:{model_name}",
+                            partial(_imagen_via_gemini, imagen_api_key, model_name, prompt, deadline)))
+    return methods
+
+
+def _generate_remote_image(prompt: str, gemini_api_key: str, imagen_api_key: Optional[str],
+                           deadline: Deadline) -> Optional[Image.Image]:
+    """
+    원격 이미지 생성 방법을 차례로 시도
+    
+    - 키별로 마지막에 성공한 방법을 먼저 시도
+    - 최근 연속 실패한 방법은 서킷 브레이커로 쿨다운 동안 건너뜀
+    - 마감 시간이 지나면 중단
+    """
+    methods = _image_methods(prompt, gemini_api_key, imagen_api_key, deadline)
+    known_good = set(_last_good_image_method.values())
+    methods.sort(key=lambda method: method[0] not in known_good)
+    
+    for name, method in methods:
+        if deadline.expired():
+            print("   이미지 생성 마감 시간 초과")
+            break
+        breaker = get_breaker(f"image:{name}", IMAGE_FAILURE_THRESHOLD, IMAGE_FAILURE_COOLDOWN)
+        if breaker.state == 'open':
+            continue  # 상태만 확인 (half-open의 시험 호출 자리는 call()이 차지)
+        try:
+            print(f"   이미지 생성 시도: {name}")
+            image = breaker.call(method)
+        except CircuitOpenError:
+            # 최근 연속 실패한 방법은 쿨다운 동안 건너뜀 (쿨다운 후에는 call()이 한 번 시험 호출)
+            continue
+        except ImportError:
+            # 선택적 라이브러리(google-cloud-aiplatform)가 없으면 다음 방법 시도
+            continue
+        except Exception as e:
+            error_msg = str(e)
+            # "not found"나 "not supported" 오류는 조용히 넘어감
+            if "not found" not in error_msg.lower() and "not supported" not in error_msg.lower():
+                print(f"   {name} 시도 실패: {error_msg[:150]}")
+            continue
+        print(f"   ✅ {name} 성공!")
+        _last_good_image_method[name.split(':')[1]] = name
+        return image
+    return None
+
+
+def generate_infographic_image(prompt: str, gemini_api_key: str, imagen_api_key: str = None,
+                               summary_text: str = "", keywords: list = None,
+                               deadline: Optional[Deadline] = None,
+                               hedge_fallback: bool = False,
+                               prerendered: Optional[BackgroundTask] = None) -> Optional[Image.Image]:
+    """
+    인포그래픽 이미지 생성 (전체 마감 시간 안에서 여러 방법 시도)
+    
+    원격 생성(Imagen)은 키별로 마지막에 성공한 방법부터 시도하고, 최근 실패한 방법은 건너뜁니다.
+    hedge_fallback이 True이면 Matplotlib 대체 이미지를 동시에 렌더링하고
+    먼저 완성된 이미지를 사용합니다.
+    prerendered가 주어지면 원격 생성이 실패했을 때 미리 렌더링해 둔 대체 이미지를 사용합니다.
     
     Args:
-        prompt: 이미지 생성용 영어 프롬프트
+        prompt: 이미지 생성용 영어 프롬프트 (비어 있으면 원격 생성을 시도하지 않음)
         gemini_api_key: Google Gemini API 키
         imagen_api_key: Imagen API 키 (선택적)
         summary_text: 뉴스 요약 텍스트 (대체 방법용)
         keywords: 키워드 리스트 (대체 방법용)
+        deadline: 이미지 생성 전체 마감 시간 (기본값: IMAGE_DEADLINE초)
+        hedge_fallback: 대체 이미지를 병렬로 렌더링할지 여부
+        prerendered: 미리 시작한 대체 이미지 렌더링 작업 (선택적)
         
     Returns:
         PIL Image 객체 또는 None
     """
-    # 방법 1: Gemini API를 통한 Imagen 4 시도 (우선 시도)
-    # 참고: Imagen 4는 Gemini API를 통해 사용 가능합니다
-    try:
-        genai.configure(api_key=gemini_api_key)
-        
-        # Imagen 4 모델 시도 (Gemini API를 통해)
-        imagen_models = [
-            "imagen-4.0-generate-001",  # Imagen 4 (최신, Gemini API를 통해 사용 가능)
-            "imagen-3.0-generate-001",
-            "imagen-2.0-generate-001"
-        ]
-        
-        for model_name in imagen_models:
-            try:
-                print(f"   Imagen 모델 시도 (Gemini API): {model_name}")
-                image_model = genai.GenerativeModel(model_name)
-                # Imagen은 간단한 프롬프트만 전달 (generation_config 없이)
-                result = image_model.generate_content(prompt)
-                
-                # 응답 형식 확인
-                if result:
-                    # 이미지가 직접 반환되는 경우
-                    if hasattr(result, 'images') and result.images:
-                        print(f"   ✅ {model_name} 성공!")
-                        return result.images[0]
-                    # 또는 다른 형식의 응답 처리
-                    if hasattr(result, 'candidates') and result.candidates:
-                        candidate = result.candidates[0]
-                        if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
-                            for part in candidate.content.parts:
-                                if hasattr(part, 'inline_data') and part.inline_data:
-                                    # Base64 이미지 데이터
-                                    import base64
-                                    image_data = base64.b64decode(part.inline_data.data)
-                                    print(f"   ✅ {model_name} 성공! (Base64 디코딩)")
-                                    return Image.open(io.BytesIO(image_data))
-            except Exception as e:
-                error_msg = str(e)
-                # "not found"나 "not supported" 오류는 조용히 넘어감
-                if "not found" not in error_msg.lower() and "not supported" not in error_msg.lower():
-                    print(f"   {model_name} 시도 실패: {error_msg[:150]}")
-                continue
-    except Exception as e:
-        print(f"Gemini API를 통한 Imagen 시도 실패: {e}")
-    
-    # 방법 2: Imagen API 키가 별도로 있는 경우 시도 (선택적)
-    if imagen_api_key and imagen_api_key != gemini_api_key:
-        # 참고: Imagen은 현재 Vertex AI를 통해서만 접근 가능합니다
-        # API 키만으로는 직접 접근이 어려울 수 있습니다
-        # Vertex AI를 사용하려면 google-cloud-aiplatform 라이브러리와 
-        # 서비스 계정 키가 필요합니다
-        
-        # 방법 1-1: Vertex AI Imagen (google-cloud-aiplatform 사용)
-        # 주의: 이 방법은 서비스 계정 키가 필요합니다
-        try:
-            import vertexai
-            from vertexai.preview.vision_models import ImageGenerationModel
-            
-            # Vertex AI는 프로젝트 ID와 위치가 필요합니다
-            # API 키만으로는 작동하지 않을 수 있음
-            # 환경 변수 GOOGLE_APPLICATION_CREDENTIALS에 서비스 계정 키 경로 설정 필요
-            vertexai.init(project=None, location="us-central1")
-            model = ImageGenerationModel.from_pretrained("imagegeneration@006")
-            images = model.generate_images(
-                prompt=prompt,
-                number_of_images=1,
-                aspect_ratio="16:9"
-            )
-            if images and len(images) > 0:
-                return images[0]._pil_image
-        except ImportError:
-            # google-cloud-aiplatform 라이브러리가 없으면 다음 방법 시도
-            pass
-        except Exception as e:
-            print(f"Vertex AI Imagen 시도 실패 (서비스 계정 키 필요): {e}")
-            
-            # 방법 1-2: Google AI Studio Imagen API (REST API 직접 호출)
-            try:
-                import requests
-                import base64
-                
-                # Imagen API 엔드포인트 (Google AI Studio)
-                url = "https://generativelanguage.googleapis.com/v1beta/models/imagen-3.0-generate-001:generateImages"
-                
-                headers = {
-                    "Content-Type": "application/json",
-                }
-                
-                params = {
-                    "key": imagen_api_key
-                }
-                
-                payload = {
-                    "prompt": prompt,
-                    "number_of_images": 1,
-                    "aspect_ratio": "16:9"
-                }
-                
-                response = requests.post(url, headers=headers, params=params, json=payload)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if "images" in result and len(result["images"]) > 0:
-                        # Base64 이미지 디코딩
-                        image_data = base64.b64decode(result["images"][0]["bytesBase64Encoded"])
-                        return Image.open(io.BytesIO(image_data))
-                else:
-                    print(f"Imagen API 호출 실패: {response.status_code} - {response.text}")
-            except ImportError:
-                print("requests 라이브러리가 필요합니다. pip install requests")
-            except Exception as e:
-                print(f"Imagen REST API 시도 실패: {e}")
-            
-        # 방법 2-3: Imagen API 키로 Gemini API를 통한 Imagen 시도
-        try:
-            genai.configure(api_key=imagen_api_key)
-            imagen_models = ["imagen-4.0-generate-001", "imagen-3.0-generate-001", "imagen-2.0-generate-001"]
-            for model_name in imagen_models:
-                try:
-                    image_model = genai.GenerativeModel(model_name)
-                    result = image_model.generate_content(prompt)
-                    if result and hasattr(result, 'images') and result.images:
-                        return result.images[0]
-                except:
-                    continue
-        except Exception as e:
-            print(f"별도 Imagen API 키 시도 실패: {e}")
-    
-    # 방법 3: 대체 - Matplotlib 기반 시각화 생성
-    if summary_text or keywords:
+    deadline = deadline or Deadline(IMAGE_DEADLINE)
+    can_fallback = bool(summary_text or keywords)
+    
+    tasks = {}
+    if prompt:
+        tasks['remote'] = lambda: _generate_remote_image(prompt, gemini_api_key, imagen_api_key, deadline)
+    if hedge_fallback and can_fallback:
+        tasks['fallback'] = lambda: generate_fallback_infographic(summary_text, keywords or [])
+    
+    # 먼저 성공한 결과 사용 (원격 호출이 멈춰 있어도 마감 시간에 맞춰 빠져나옴)
+    if tasks:
+        winner = race(tasks, deadline)
+        if winner is not None:
+            return winner[1]
+    
+    # 대체 - Matplotlib 기반 시각화 생성
+    if can_fallback and not hedge_fallback:
         try:
+            if prerendered is not None:
+                return prerendered.result()
             return generate_fallback_infographic(summary_text, keywords or [])
         except Exception as e:
             print(f"대체 인포그래픽 생성 실패: {e}")
@@ -452,12 +739,15 @@ def generate_fallback_infographic(summary_text: str, keywords: list) -> Image.Im
     Returns:
         PIL Image 객체
     """
-    import matplotlib.pyplot as plt
+    # pyplot 대신 Figure를 직접 사용 (전역 상태가 없어 백그라운드 스레드에서도 안전)
+    import matplotlib
+    from matplotlib.figure import Figure
     import matplotlib.patches as mpatches
     import numpy as np
     
     # 16:9 비율로 그림 생성 (고해상도, 다크 테마)
-    fig, ax = plt.subplots(figsize=(16, 9), facecolor='#0A0E27')
+    fig = Figure(figsize=(16, 9), facecolor='#0A0E27')
+    ax = fig.subplots()
     ax.set_facecolor('#0A0E27')
     ax.set_xlim(0, 16)
     ax.set_ylim(0, 9)
@@ -485,7 +775,7 @@ def generate_fallback_infographic(summary_text: str, keywords: list) -> Image.Im
         
         # 키워드별 섹터 (파이 차트 스타일)
         angles = np.linspace(0, 2*np.pi, num_keywords, endpoint=False)
-        colors = plt.cm.viridis(np.linspace(0.3, 0.9, num_keywords))
+        colors = matplotlib.colormaps['viridis'](np.linspace(0.3, 0.9, num_keywords))
         
         for i, (angle, color) in enumerate(zip(angles, colors)):
             # 원호 그리기
@@ -525,7 +815,7 @@ def generate_fallback_infographic(summary_text: str, keywords: list) -> Image.Im
             height_factor = 0.5 + 0.5 * (i % 3) / 2
             segment_height = bar_height * height_factor
             
-            color = plt.cm.plasma(i / min(len(keywords), 6))
+            color = matplotlib.colormaps['plasma'](i / min(len(keywords), 6))
             segment = mpatches.Rectangle((segment_x, bar_y - segment_height/2), 
                               segment_width * 0.9, segment_height,
                               color=color, alpha=0.7, zorder=2)
@@ -540,7 +830,7 @@ def generate_fallback_infographic(summary_text: str, keywords: list) -> Image.Im
         for i in range(num_points):
             point_x = 1 + (i + 1) * point_spacing
             point_size = 0.15 + 0.1 * (i % 3)
-            color = plt.cm.coolwarm(i / num_points)
+            color = matplotlib.colormaps['coolwarm'](i / num_points)
             
             point = mpatches.Circle((point_x, points_y), point_size, 
                          color=color, alpha=0.8, zorder=3)
@@ -600,16 +890,17 @@ def generate_fallback_infographic(summary_text: str, keywords: list) -> Image.Im
     
     # PIL Image로 변환 (고해상도)
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight', 
+    fig.savefig(buf, format='png', dpi=150, bbox_inches='tight', 
                 facecolor='#0A0E27', edgecolor='none', pad_inches=0)
     buf.seek(0)
     img = Image.open(buf)
-    plt.close()
     
     return img
 
 
-def generate_infographic(gemini_api_key: str, summary_text: str, imagen_api_key: str = None, keywords: list = None) -> Optional[Image.Image]:
+def generate_infographic(gemini_api_key: str, summary_text: str, imagen_api_key: str = None, keywords: list = None,
+                         hedge_fallback: bool = False,
+                         budget: Optional[CallBudget] = None) -> Optional[Image.Image]:
     """
     뉴스 요약을 기반으로 인포그래픽 생성 (통합 함수)
     
@@ -618,19 +909,32 @@ def generate_infographic(gemini_api_key: str, summary_text: str, imagen_api_key:
         summary_text: 뉴스 요약 텍스트
         imagen_api_key: Imagen API 키 (선택적)
         keywords: 키워드 리스트 (선택적, 대체 방법용)
+        hedge_fallback: 대체 이미지를 병렬로 렌더링하고 먼저 완성된 이미지를 사용할지 여부
+        budget: 프롬프트 생성 호출에 적용할 실행 단위 호출 예산 (선택적)
         
     Returns:
         PIL Image 객체 또는 None
     """
+    # 프롬프트 생성과 이미지 생성 모두 IMAGE_DEADLINE 안에서 끝남
+    deadline = Deadline(IMAGE_DEADLINE)
+    
+    # 대체 이미지는 키워드만 있으면 되므로, 프롬프트/원격 생성을 기다리는 동안 미리 렌더링
+    prerendered = None
+    if not hedge_fallback and (summary_text or keywords):
+        prerendered = BackgroundTask(lambda: generate_fallback_infographic(summary_text, keywords or []),
+                                     name="fallback-infographic")
+    
     # 1. 프롬프트 생성 (Imagen 사용 시)
     image_prompt = None
     if imagen_api_key:
         try:
-            image_prompt = get_infographic_prompt(summary_text, gemini_api_key)
+            image_prompt = get_infographic_prompt(summary_text, gemini_api_key, deadline, budget)
         except Exception as e:
             print(f"프롬프트 생성 실패, 대체 방법 사용: {e}")
     
     # 2. 이미지 생성 (여러 방법 시도)
-    image = generate_infographic_image(image_prompt or "", gemini_api_key, imagen_api_key, summary_text, keywords)
+    image = generate_infographic_image(image_prompt or "", gemini_api_key, imagen_api_key, summary_text, keywords,
+                                       deadline=deadline, hedge_fallback=hedge_fallback,
+                                       prerendered=prerendered)
     return image
 
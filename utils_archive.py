@@ -0,0 +1,146 @@
+"""
+오래된 날짜 레코드를 월별 압축 아카이브로 옮기는 계층형 저장소
+
+- 최근 HOT_DAYS일: data/news_data.json (일반 JSON, 매번 로드)
+- 그 이전: data/archive/YYYY-MM.json.gz (gzip 압축, 해당 월을 조회할 때만 로드)
+- data/archive/index.json: 월별로 보관된 날짜 목록 (아카이브를 열지 않고 날짜 수/존재 여부 확인)
+"""
+import datetime
+import gzip
+from typing import Any, Dict, List, Optional
+
+from utils_json import dumps, loads
+from utils_merge import merge_days, merge_nested_keys
+from utils_schema import migrate_day
+
+
+NEWS_DATA_PATH = "data/news_data.json"
+ARCHIVE_DIR = "data/archive"
+ARCHIVE_INDEX_PATH = f"{ARCHIVE_DIR}/index.json"
+HOT_DAYS = 30
+
+
+def archive_path(month: str) -> str:
+    """월별 아카이브 파일 경로 (예: "2025-11" → "data/archive/2025-11.json.gz")"""
+    return f"{ARCHIVE_DIR}/{month}.json.gz"
+
+
+def encode_archive(days: Dict[str, Any]) -> bytes:
+    """날짜별 레코드 dict를 압축된 bytes로 변환"""
+    content = dumps(days, sort_keys=True)
+    # mtime=0: 내용이 같으면 압축 결과도 같도록 (불필요한 커밋 방지)
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def decode_archive(data: bytes) -> Dict[str, Any]:
+    """압축된 아카이브 bytes를 날짜별 레코드 dict로 변환"""
+    return loads(gzip.decompress(data))
+
+
+def load_archive_index(db) -> Dict[str, List[str]]:
+    """월별 보관 날짜 목록 (예: {"2025-11": ["2025-11-01", ...]})"""
+    return db.load_json(ARCHIVE_INDEX_PATH).get('months', {})
+
+
+def load_archive_month(db, month: str) -> Dict[str, Any]:
+    """
+    월별 아카이브를 내려받아 압축 해제
+
+    Args:
+        db: GithubDataHandler
+        month: "YYYY-MM"
+
+    Returns:
+        dict: 날짜별 레코드 (아카이브가 없으면 빈 dict)
+    """
+    data = db.load_bytes(archive_path(month))
+    if not data:
+        return {}
+    days = decode_archive(data)
+    for day in days.values():
+        migrate_day(day)
+    return days
+
+
+def find_day(db, date_str: str, hot_data: Optional[Dict[str, Any]] = None,
+             archive_index: Optional[Dict[str, List[str]]] = None) -> Optional[Dict[str, Any]]:
+    """
+    날짜 레코드 조회 (최근 데이터에 없으면 해당 월 아카이브에서 찾음)
+
+    Args:
+        db: GithubDataHandler
+        date_str: "YYYY-MM-DD"
+        hot_data: 이미 로드한 news_data.json 내용 (없으면 로드)
+        archive_index: 이미 로드한 아카이브 인덱스 (없으면 로드)
+
+    Returns:
+        dict: 날짜 레코드 또는 None
+    """
+    if hot_data is None:
+        hot_data = db.load_json(NEWS_DATA_PATH)
+    if date_str in hot_data:
+        return hot_data[date_str]
+    if archive_index is None:
+        archive_index = load_archive_index(db)
+    month = date_str[:7]
+    if date_str not in archive_index.get(month, []):
+        return None
+    return load_archive_month(db, month).get(date_str)
+
+
+def count_days(hot_data: Dict[str, Any], archive_index: Dict[str, List[str]]) -> int:
+    """최근 데이터와 아카이브를 합친 전체 수집 일수"""
+    archived = {day for days in archive_index.values() for day in days}
+    return len(archived | set(hot_data))
+
+
+def compact_news_data(db, hot_days: int = HOT_DAYS,
+                      today: Optional[datetime.date] = None) -> Dict[str, Any]:
+    """
+    hot_days일보다 오래된 날짜를 월별 압축 아카이브로 옮기기
+
+    아카이브를 먼저 저장하고 그 다음에 news_data.json에서 제거하므로,
+    중간에 실패해도 데이터가 사라지지 않습니다.
+
+    Args:
+        db: GithubDataHandler
+        hot_days: news_data.json에 남길 최근 일수
+        today: 기준 날짜 (기본값: 오늘)
+
+    Returns:
+        dict: 실행 결과 (moved_days, months, hot_days_left, ok)
+    """
+    today = today or datetime.date.today()
+    cutoff = (today - datetime.timedelta(days=hot_days)).strftime("%Y-%m-%d")
+
+    hot_data = db.load_json(NEWS_DATA_PATH)
+    cold = {date_str: day for date_str, day in hot_data.items() if date_str < cutoff}
+    if not cold:
+        return {'moved_days': 0, 'months': [], 'hot_days_left': len(hot_data), 'ok': True}
+
+    by_month: Dict[str, Dict[str, Any]] = {}
+    for date_str, day in cold.items():
+        migrate_day(day)
+        by_month.setdefault(date_str[:7], {})[date_str] = day
+
+    index = load_archive_index(db)
+    for month, days in sorted(by_month.items()):
+        archived = load_archive_month(db, month)
+        archived.update(days)
+        if not db.save_bytes(archive_path(month), encode_archive(archived), f"Archive news for {month}"):
+            return {'moved_days': 0, 'months': [], 'hot_days_left': len(hot_data), 'ok': False}
+        index[month] = sorted(archived)
+
+    if not db.save_json(ARCHIVE_INDEX_PATH, {'months': index}, "Update news archive index",
+                        merge=merge_nested_keys):
+        return {'moved_days': 0, 'months': [], 'hot_days_left': len(hot_data), 'ok': False}
+
+    remaining = {date_str: day for date_str, day in hot_data.items() if date_str >= cutoff}
+    ok = db.save_json(NEWS_DATA_PATH, remaining, f"Move {len(cold)} days older than {cutoff} to archive",
+                      merge=merge_days)
+    return {
+        'moved_days': len(cold) if ok else 0,
+        'months': sorted(by_month),
+        'hot_days_left': len(remaining) if ok else len(hot_data),
+        'ok': ok,
+    }
@@ -0,0 +1,133 @@
+"""
+하루치 기사 주제 묶기 (TF-IDF + 코사인 유사도, 외부 서비스 없이 로컬에서 실행)
+
+- 토큰: 영문/숫자 단어, 한글은 조사가 붙어도 맞도록 글자 2-gram
+- 제목은 요약보다 가중치를 높게 줌
+- 순위가 높은 기사부터 가장 비슷한 주제(중심 벡터)에 붙이고,
+  유사도가 CLUSTER_THRESHOLD보다 낮으면 새 주제를 만듦
+- 각 주제의 첫 기사(순위가 가장 높은 기사)가 대표 기사
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils_prompt import rank_articles
+
+
+CLUSTER_THRESHOLD = 0.25 # 같은 주제로 묶을 최소 코사인 유사도
+TITLE_WEIGHT = 2         # 제목 토큰 가중치 (요약 토큰은 1)
+
+_WORDS = re.compile(r'[0-9a-z]{2,}|[가-힣]+')
+_HANGUL = re.compile(r'[가-힣]')
+
+
+def tokenize(text: str) -> List[str]:
+    """영문/숫자 단어와 한글 글자 2-gram으로 토큰화"""
+    tokens = []
+    for word in _WORDS.findall(text.lower()):
+        if _HANGUL.match(word):
+            if len(word) == 1:
+                continue
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def _article_tokens(news: Dict[str, Any]) -> List[str]:
+    return tokenize(news.get('title', '')) * TITLE_WEIGHT + tokenize(str(news.get('summary', '')))
+
+
+def tfidf_matrix(documents: List[List[str]]) -> np.ndarray:
+    """
+    토큰 목록들을 L2 정규화된 TF-IDF 행렬로 변환
+
+    Args:
+        documents: 문서별 토큰 목록
+
+    Returns:
+        np.ndarray: (문서 수, 어휘 수) 행렬. 토큰이 없는 문서는 0 벡터
+    """
+    vocabulary: Dict[str, int] = {}
+    for tokens in documents:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+
+    matrix = np.zeros((len(documents), max(1, len(vocabulary))), dtype=np.float32)
+    for row, tokens in enumerate(documents):
+        for token in tokens:
+            matrix[row, vocabulary[token]] += 1
+
+    # 로그 TF, 평활화한 IDF
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    matrix = np.log1p(matrix) * idf
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def cluster_articles(news_list: List[Dict[str, Any]],
+                     threshold: float = CLUSTER_THRESHOLD) -> List[List[int]]:
+    """
+    기사를 주제별로 묶기
+
+    Args:
+        news_list: 뉴스 리스트
+        threshold: 같은 주제로 묶을 최소 코사인 유사도
+
+    Returns:
+        list: 주제별 기사 인덱스 목록 (각 목록의 첫 항목이 대표 기사).
+              기사 수가 많은 주제부터, 같으면 대표 기사 순위 순
+    """
+    if not news_list:
+        return []
+
+    vectors = tfidf_matrix([_article_tokens(news) for news in news_list])
+    clusters: List[List[int]] = []
+    centroids: List[np.ndarray] = []
+
+    for _, index in rank_articles(news_list):
+        vector = vectors[index]
+        best: Optional[int] = None
+        if centroids and vector.any():
+            similarities = np.stack(centroids) @ vector
+            candidate = int(np.argmax(similarities))
+            if similarities[candidate] >= threshold:
+                best = candidate
+        if best is None:
+            clusters.append([index])
+            centroids.append(vector.copy())
+            continue
+        clusters[best].append(index)
+        centroid = vectors[clusters[best]].sum(axis=0)
+        norm = np.linalg.norm(centroid)
+        centroids[best] = centroid / norm if norm > 0 else centroid
+
+    order = sorted(range(len(clusters)), key=lambda i: (-len(clusters[i]), i))
+    return [clusters[i] for i in order]
+
+
+def build_topics(news_list: List[Dict[str, Any]], clusters: List[List[int]]) -> List[Dict[str, Any]]:
+    """
+    저장용 주제 목록 생성
+
+    Args:
+        news_list: 뉴스 리스트 (저장되는 articles와 같은 순서)
+        clusters: cluster_articles() 결과
+
+    Returns:
+        list: [{"label": 대표 기사 제목, "articles": [기사 인덱스, ...]}, ...]
+    """
+    return [
+        {'label': news_list[cluster[0]].get('title', '제목 없음'), 'articles': cluster}
+        for cluster in clusters
+    ]
+
+
+def cluster_sizes_summary(clusters: List[List[int]]) -> str:
+    """로그용 요약 (예: "기사 24개 → 주제 15개, 최대 5개")"""
+    articles = sum(len(cluster) for cluster in clusters)
+    largest = max((len(cluster) for cluster in clusters), default=0)
+    return f"기사 {articles}개 → 주제 {len(clusters)}개, 최대 {largest}개"
@@ -0,0 +1,307 @@
+"""
+주간/월간 다이제스트 (날짜별 브리핑 → 주 → 달 계층 요약)
+
+기사를 다시 읽지 않고 이미 저장된 날짜별 요약/키워드/트렌드만 모아서, 기간마다 작은 Gemini 호출
+한 번으로 요약합니다.
+
+- 주: ISO 주 (월~일), 그 주 날짜들의 브리핑(피드 그룹별)을 요약
+- 달: 목요일이 그 달에 속한 ISO 주들의 주간 다이제스트를 요약 (ISO 규칙: 주는 목요일이 속한 달에 속함)
+
+각 단계는 하위 항목(날짜 또는 주)에서 만든 입력의 해시와 함께 저장하고, 해시가 바뀐 경우에만
+다시 요약합니다. 예를 들어 오늘 브리핑이 바뀌면 이번 주와 이번 달만 다시 요약하고,
+지난주 다이제스트는 그대로 사용합니다.
+
+data/digests.json:
+{
+    "weeks": {
+        "2025-W48": {"hash": "...", "summary": "...", "keywords": [...], "trends": "...",
+                     "children": ["2025-11-24", ...], "generated": "2025-11-30T21:00:00"}
+    },
+    "months": {
+        "2025-11": {"hash": "...", "summary": "...", "keywords": [...], "trends": "...",
+                    "children": ["2025-W45", ...], "generated": "..."}
+    }
+}
+"""
+import datetime
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils_ai import generate_content_with_policy
+from utils_archive import load_archive_index, load_archive_month
+from utils_feeds import group_label
+from utils_merge import merge_nested_keys
+from utils_resilience import CallBudget, Deadline
+from utils_schema import group_briefings
+from utils_text import truncate_text
+
+
+DIGEST_PATH = "data/digests.json"
+DIGEST_VERSION = 1           # 프롬프트나 입력 형식을 바꾸면 올림 (모든 다이제스트를 다시 요약)
+DIGEST_DEADLINE = 120        # 다이제스트 갱신 전체 마감 (초)
+DAY_SUMMARY_CHARS = 400      # 날짜별 브리핑 요약을 입력에 넣을 최대 글자 수
+WEEK_SUMMARY_CHARS = 700     # 주간 다이제스트 요약을 월간 입력에 넣을 최대 글자 수
+TRENDS_CHARS = 200
+MAX_KEYWORDS = 8
+DIGEST_GENERATION_CONFIG = {'response_mime_type': 'application/json'}
+
+DIGEST_PROMPT_TEMPLATE = """다음은 {period}의 {unit}별 IT 뉴스 브리핑입니다.
+
+{entries_text}
+
+이 기간 전체를 IT 전문가 관점에서 종합해주세요.
+여러 {unit}에 걸쳐 이어진 흐름과 기간 중에 달라진 점을 중심으로 작성하세요.
+
+다음 JSON 형식으로 응답해주세요:
+{{
+    "summary": "기간 전체를 종합한 3~5줄 요약",
+    "keywords": ["키워드1", "키워드2", "키워드3"],
+    "trends": "기간 동안의 주요 흐름과 변화"
+}}
+
+반드시 유효한 JSON 형식으로만 응답해주세요."""
+
+
+def week_key(date: datetime.date) -> str:
+    """날짜가 속한 ISO 주 (예: "2025-W48")"""
+    year, week, _ = date.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _week_start(key: str) -> datetime.date:
+    year, week = key.split('-W')
+    return datetime.date.fromisocalendar(int(year), int(week), 1)
+
+
+def week_days(key: str) -> List[str]:
+    """ISO 주의 날짜 목록 (월~일)"""
+    start = _week_start(key)
+    return [(start + datetime.timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+
+
+def month_of_week(key: str) -> str:
+    """ISO 주가 속한 달 (목요일 기준, 예: "2025-11")"""
+    return (_week_start(key) + datetime.timedelta(days=3)).strftime("%Y-%m")
+
+
+def month_weeks(month: str) -> List[str]:
+    """달에 속한 ISO 주 목록 (목요일이 그 달에 있는 주)"""
+    first = datetime.date.fromisoformat(f"{month}-01")
+    thursday = first + datetime.timedelta(days=(3 - first.weekday()) % 7)
+    weeks = []
+    while thursday.strftime("%Y-%m") == month:
+        weeks.append(week_key(thursday))
+        thursday += datetime.timedelta(days=7)
+    return weeks
+
+
+def periods_for_dates(dates: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    날짜들이 바뀌었을 때 다시 확인할 (주 목록, 달 목록)
+    """
+    weeks = sorted({week_key(datetime.date.fromisoformat(date_str)) for date_str in dates})
+    months = sorted({month_of_week(week) for week in weeks})
+    return weeks, months
+
+
+def _digest_hash(children: List[Tuple[str, Any]]) -> str:
+    content = json.dumps([DIGEST_VERSION, children], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def day_entry(day: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    날짜별 레코드에서 다이제스트 입력으로 쓸 브리핑 (그룹별 요약/키워드/트렌드만, 길이 제한)
+
+    요약에 실패한 브리핑(키워드와 트렌드가 모두 없음)은 제외합니다.
+    """
+    entries = []
+    for group, record in group_briefings(day):
+        if not record.get('summary') or not (record.get('keywords') or record.get('trends')):
+            continue
+        entries.append({
+            'group': group_label(group),
+            'summary': truncate_text(record['summary'], DAY_SUMMARY_CHARS),
+            'keywords': record.get('keywords', [])[:MAX_KEYWORDS],
+            'trends': truncate_text(record.get('trends', ''), TRENDS_CHARS),
+        })
+    return entries
+
+
+def _format_entries(entries: List[Tuple[str, List[Dict[str, Any]]]]) -> str:
+    """[(날짜 또는 주, 브리핑 목록)] 을 프롬프트 텍스트로"""
+    blocks = []
+    for key, briefings in entries:
+        lines = [f"[{key}]"]
+        for briefing in briefings:
+            prefix = f"({briefing['group']}) " if len(briefings) > 1 else ""
+            lines.append(f"{prefix}요약: {briefing['summary']}")
+            if briefing['keywords']:
+                lines.append(f"키워드: {', '.join(briefing['keywords'])}")
+            if briefing['trends']:
+                lines.append(f"트렌드: {briefing['trends']}")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def _parse_digest(response_text: str) -> Dict[str, Any]:
+    """
+    다이제스트 응답 검증
+
+    Raises:
+        ValueError: JSON이 아니거나 summary가 없는 경우
+    """
+    text = response_text.strip()
+    if "```" in text:
+        text = text.split("```")[1].removeprefix("json").strip()
+    try:
+        result = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON 파싱 실패: {e}")
+    if not isinstance(result, dict) or not isinstance(result.get('summary'), str) or not result['summary'].strip():
+        raise ValueError("응답에 summary가 없습니다.")
+    keywords = result.get('keywords')
+    return {
+        'summary': result['summary'].strip(),
+        'keywords': [str(keyword) for keyword in keywords][:MAX_KEYWORDS] if isinstance(keywords, list) else [],
+        'trends': result.get('trends') if isinstance(result.get('trends'), str) else '',
+    }
+
+
+def generate_digest(model, model_name: str, period: str, unit: str,
+                    entries: List[Tuple[str, List[Dict[str, Any]]]],
+                    deadline: Optional[Deadline] = None, budget: Optional[CallBudget] = None) -> Dict[str, Any]:
+    """
+    기간 하나의 다이제스트 생성 (Gemini 호출 1회)
+
+    Args:
+        period: 프롬프트에 넣을 기간 이름 (예: "2025년 48주차")
+        unit: 입력 단위 ("날짜" 또는 "주")
+        entries: [(날짜 또는 주, 브리핑 목록)]
+
+    Returns:
+        dict: summary, keywords, trends
+
+    Raises:
+        ValueError: 응답 형식이 잘못된 경우
+        Exception: Gemini 호출 실패 (마감/예산/차단 포함)
+    """
+    prompt = DIGEST_PROMPT_TEMPLATE.format(period=period, unit=unit, entries_text=_format_entries(entries))
+    response = generate_content_with_policy(model, model_name, prompt, deadline, budget=budget,
+                                            generation_config=DIGEST_GENERATION_CONFIG)
+    return _parse_digest(response.text)
+
+
+class _DayLookup:
+    """날짜별 레코드 조회 (최근 데이터에 없으면 월별 아카이브를 한 번만 내려받아 조회)"""
+
+    def __init__(self, db, news_data: Dict[str, Any]):
+        self.db = db
+        self.news_data = news_data
+        self.archive_index = None
+        self.months: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, date_str: str) -> Optional[Dict[str, Any]]:
+        if date_str in self.news_data:
+            return self.news_data[date_str]
+        if self.archive_index is None:
+            self.archive_index = load_archive_index(self.db)
+        month = date_str[:7]
+        if date_str not in self.archive_index.get(month, []):
+            return None
+        if month not in self.months:
+            self.months[month] = load_archive_month(self.db, month)
+        return self.months[month].get(date_str)
+
+
+def update_digests(db, model, model_name: str, news_data: Dict[str, Any],
+                   weeks: Iterable[str] = (), months: Iterable[str] = (),
+                   deadline: Optional[Deadline] = None, budget: Optional[CallBudget] = None) -> Dict[str, Any]:
+    """
+    주간/월간 다이제스트 갱신 (입력이 바뀐 기간만 다시 요약하고 data/digests.json에 저장)
+
+    달을 갱신할 때는 그 달에 속한 주도 먼저 확인합니다 (아직 없거나 바뀐 주만 요약).
+
+    Args:
+        db: GithubDataHandler
+        model: genai.GenerativeModel 객체
+        model_name: 모델 이름
+        news_data: news_data.json 내용 (최근 날짜, 없는 날짜는 아카이브에서 조회)
+        weeks: 갱신할 ISO 주 목록 (예: ["2025-W48"])
+        months: 갱신할 달 목록 (예: ["2025-11"])
+        deadline: 전체 마감 시간 (기본값: DIGEST_DEADLINE초)
+        budget: 실행 단위 호출 예산 (선택적)
+
+    Returns:
+        dict: updated (다시 요약한 기간 목록), unchanged (그대로 사용한 기간 목록), errors, saved
+    """
+    deadline = deadline or Deadline(DIGEST_DEADLINE)
+    digests = db.load_json(DIGEST_PATH)
+    stored_weeks = digests.setdefault('weeks', {})
+    stored_months = digests.setdefault('months', {})
+    days = _DayLookup(db, news_data)
+    outcome = {'updated': [], 'unchanged': [], 'errors': [], 'saved': True}
+    checked = set()
+
+    def refresh(key, stored, period, unit, children):
+        """children: [(하위 항목, 브리핑 목록)] — 입력 해시가 같으면 호출하지 않음"""
+        digest_hash = _digest_hash(children)
+        if stored.get(key, {}).get('hash') == digest_hash:
+            outcome['unchanged'].append(key)
+            return
+        try:
+            result = generate_digest(model, model_name, period, unit, children, deadline, budget)
+        except Exception as e:
+            outcome['errors'].append(f"다이제스트 생성 실패 ({key}): {e}")
+            return
+        stored[key] = {**result, 'hash': digest_hash, 'children': [child for child, _ in children],
+                       'generated': datetime.datetime.now().isoformat(timespec='seconds')}
+        outcome['updated'].append(key)
+
+    def refresh_week(week):
+        if week in checked:
+            return
+        checked.add(week)
+        children = [(date_str, day_entry(day)) for date_str in week_days(week)
+                    for day in [days.get(date_str)] if day]
+        children = [(date_str, entry) for date_str, entry in children if entry]
+        if children:
+            start = _week_start(week)
+            refresh(week, stored_weeks, f"{start.year}년 {start.isocalendar()[1]}주차 ({start:%m/%d}~)", "날짜", children)
+
+    for week in weeks:
+        refresh_week(week)
+    for month in months:
+        children = []
+        for week in month_weeks(month):
+            refresh_week(week)
+            record = stored_weeks.get(week)
+            if record:
+                children.append((week, [{
+                    'group': '',
+                    'summary': truncate_text(record['summary'], WEEK_SUMMARY_CHARS),
+                    'keywords': record.get('keywords', [])[:MAX_KEYWORDS],
+                    'trends': truncate_text(record.get('trends', ''), TRENDS_CHARS),
+                }]))
+        if children:
+            year, month_number = month.split('-')
+            refresh(month, stored_months, f"{year}년 {int(month_number)}월", "주", children)
+
+    if outcome['updated']:
+        outcome['saved'] = db.save_json(DIGEST_PATH, digests, f"Update digests ({', '.join(outcome['updated'])})",
+                                        merge=merge_nested_keys)
+        if not outcome['saved']:
+            outcome['errors'].append("다이제스트 저장 실패")
+    return outcome
+
+
+def load_digest(db, period: str) -> Optional[Dict[str, Any]]:
+    """
+    저장된 다이제스트 조회
+
+    Args:
+        period: ISO 주 (예: "2025-W48") 또는 달 (예: "2025-11")
+    """
+    digests = db.load_json(DIGEST_PATH)
+    return digests.get('weeks' if '-W' in period else 'months', {}).get(period)
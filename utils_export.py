@@ -0,0 +1,277 @@
+"""
+뉴스룸 정적 사이트 내보내기 (정적 호스팅/CDN용 HTML + JSON Feed)
+
+수집이 끝난 날짜의 내용은 바뀌지 않으므로, 읽기 전용 화면은 Streamlit 세션
+(비밀번호, GitHub API 읽기) 없이 정적 파일로 제공할 수 있습니다.
+
+출력 (GitHub Pages의 /docs 폴더 게시 설정으로 바로 사용 가능):
+    docs/index.html              날짜 목록
+    docs/days/YYYY-MM-DD.html    날짜별 브리핑 (인포그래픽, 요약, 주제별 기사)
+    docs/images/YYYY-MM-DD*.png  인포그래픽 사본 (피드 그룹별 인포그래픽 포함)
+    docs/feed.json               JSON Feed 1.1 (최근 FEED_DAYS일)
+    docs/manifest.json           파일별 내용 해시 (바뀐 파일만 다시 쓰기 위함)
+
+렌더링 결과에는 생성 시각을 넣지 않으므로, 내용이 같으면 파일도 같습니다.
+"""
+import hashlib
+import html
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from utils_merge import merge_nested_keys
+from utils_feeds import group_label
+from utils_schema import article_display_text, group_articles, group_briefings, migrate_day
+
+
+SITE_DIR = "docs"
+MANIFEST_PATH = f"{SITE_DIR}/manifest.json"
+FEED_DAYS = 30
+SITE_TITLE = "AI IT 뉴스룸"
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="alternate" type="application/feed+json" title="{site_title}" href="{root}feed.json">
+<style>
+body {{ max-width: 860px; margin: 0 auto; padding: 24px 16px; font-family: -apple-system, "Malgun Gothic", "Apple SD Gothic Neo", sans-serif; line-height: 1.6; color: #222; }}
+a {{ color: #1a5fb4; }}
+img {{ max-width: 100%; border-radius: 8px; }}
+nav {{ display: flex; justify-content: space-between; margin: 16px 0; }}
+.keywords code {{ background: #eef; padding: 2px 6px; border-radius: 4px; }}
+.trends {{ background: #eef6ff; padding: 12px; border-radius: 8px; }}
+details {{ border: 1px solid #ddd; border-radius: 8px; padding: 8px 12px; margin: 8px 0; }}
+summary {{ cursor: pointer; font-weight: 600; }}
+.meta {{ color: #777; font-size: 0.9em; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def _e(value: Any) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def _paragraphs(text: str) -> str:
+    return "".join(f"<p>{_e(line)}</p>" for line in str(text).splitlines() if line.strip())
+
+
+def day_page_path(date_str: str) -> str:
+    return f"{SITE_DIR}/days/{date_str}.html"
+
+
+def image_copy_path(image_path: str) -> str:
+    """원본 인포그래픽 경로(images/YYYY/MM/파일)의 사본 경로 (docs/images/파일)"""
+    return f"{SITE_DIR}/images/{image_path.rsplit('/', 1)[-1]}"
+
+
+def _render_article(news: Dict[str, Any], number: int) -> str:
+    label, text = article_display_text(news)
+    parts = [f"<details><summary>📌 {number}. {_e(news.get('title', '제목 없음'))}</summary>",
+             f"<p><strong>{_e(label)}:</strong></p>{_paragraphs(text)}"]
+    if news.get('link'):
+        parts.append(f'<p><a href="{_e(news["link"])}" rel="noopener">🔗 원문 보기</a></p>')
+    if news.get('published'):
+        parts.append(f'<p class="meta">발행일: {_e(news["published"])}</p>')
+    if news.get('related'):
+        items = "".join(
+            f'<li>{_e(related.get("date", ""))} <a href="{_e(related.get("link", ""))}">{_e(related.get("title", "제목 없음"))}</a></li>'
+            for related in news['related']
+        )
+        parts.append(f"<p><strong>🔁 이어지는 이야기:</strong></p><ul>{items}</ul>")
+    parts.append("</details>")
+    return "".join(parts)
+
+
+def _render_briefing(record: Dict[str, Any], image_paths: Set[str], heading_level: int, image_alt: str) -> List[str]:
+    """브리핑 하나(인포그래픽, 요약, 주제별 기사)의 HTML 조각 목록"""
+    h, sub = f"h{heading_level}", f"h{heading_level + 1}"
+    body = []
+    image_path = record.get('image_path')
+    if image_path and image_copy_path(image_path) in image_paths:
+        src = image_copy_path(image_path)[len(SITE_DIR) + 1:]
+        body.append(f'<img src="../{_e(src)}" alt="{_e(image_alt)}">')
+    if record.get('summary'):
+        body.append(f"<{h}>전체 요약</{h}>{_paragraphs(record['summary'])}")
+    if record.get('keywords'):
+        keywords = ", ".join(f"<code>{_e(kw)}</code>" for kw in record['keywords'])
+        body.append(f'<p class="keywords"><strong>핵심 키워드:</strong> {keywords}</p>')
+    if record.get('trends'):
+        body.append(f'<div class="trends"><strong>주요 트렌드:</strong> {_e(record["trends"])}</div>')
+
+    body.append(f"<{h}>📰 상세 뉴스</{h}>")
+    groups = group_articles(record)
+    number = 0
+    for topic, articles in groups:
+        if topic:
+            body.append(f"<{sub}>🗂️ {_e(topic)} ({len(articles)}건)</{sub}>")
+        elif len(groups) > 1:
+            body.append(f"<{sub}>📄 그 밖의 뉴스</{sub}>")
+        for news in articles:
+            number += 1
+            body.append(_render_article(news, number))
+    if not groups:
+        body.append("<p>해당 날짜의 뉴스 기사가 없습니다.</p>")
+    return body
+
+
+def render_day(date_str: str, day: Dict[str, Any], image_paths: Set[str],
+               prev_date: Optional[str] = None, next_date: Optional[str] = None) -> str:
+    """
+    날짜별 브리핑 페이지 HTML (피드 그룹이 있으면 그룹별 브리핑을 차례로 표시)
+
+    Args:
+        date_str: 날짜 ("YYYY-MM-DD")
+        day: 날짜별 레코드
+        image_paths: 사본이 있는 인포그래픽 경로 (docs/images/...)
+        prev_date: 이전 날짜 (링크용)
+        next_date: 다음 날짜 (링크용)
+    """
+    body = [f'<p><a href="../index.html">← {_e(SITE_TITLE)}</a></p>',
+            f"<h1>📅 {_e(date_str)} 주요 브리핑</h1>"]
+    briefings = group_briefings(day)
+    if len(briefings) > 1:
+        links = " · ".join(f'<a href="#group-{i}">{_e(group_label(group))}</a>' for i, (group, _) in enumerate(briefings))
+        body.append(f"<nav>{links}</nav>")
+        for i, (group, record) in enumerate(briefings):
+            body.append(f'<h2 id="group-{i}">📂 {_e(group_label(group))}</h2>')
+            body.extend(_render_briefing(record, image_paths, 3, f"{date_str} {group_label(group)} 인포그래픽"))
+    else:
+        body.extend(_render_briefing(briefings[0][1] if briefings else day, image_paths, 2, f"{date_str} 인포그래픽"))
+
+    prev_link = f'<a href="{_e(prev_date)}.html">← {_e(prev_date)}</a>' if prev_date else "<span></span>"
+    next_link = f'<a href="{_e(next_date)}.html">{_e(next_date)} →</a>' if next_date else "<span></span>"
+    body.append(f"<nav>{prev_link}{next_link}</nav>")
+    return _PAGE_TEMPLATE.format(title=_e(f"{date_str} 브리핑 - {SITE_TITLE}"), site_title=_e(SITE_TITLE),
+                                 root="../", body="\n".join(body))
+
+
+def render_index(dates: List[str], days: Dict[str, Dict[str, Any]]) -> str:
+    """날짜 목록 페이지 HTML (최신 날짜부터, 첫 번째 브리핑 요약의 첫 줄 포함)"""
+    items = []
+    for date_str in sorted(dates, reverse=True):
+        briefings = group_briefings(days.get(date_str, {}))
+        summary = briefings[0][1].get('summary', '') if briefings else ''
+        first_line = next((line for line in str(summary).splitlines() if line.strip()), '')
+        items.append(f'<li><a href="days/{_e(date_str)}.html">{_e(date_str)}</a>'
+                     + (f' <span class="meta">{_e(first_line)}</span>' if first_line else '') + '</li>')
+    body = f"<h1>📰 {_e(SITE_TITLE)}</h1><ul>{''.join(items)}</ul>"
+    return _PAGE_TEMPLATE.format(title=_e(SITE_TITLE), site_title=_e(SITE_TITLE), root="", body=body)
+
+
+def render_feed(days: Dict[str, Dict[str, Any]], site_url: Optional[str] = None) -> str:
+    """
+    JSON Feed 1.1 (최근 FEED_DAYS일의 날짜별 브리핑)
+
+    Args:
+        days: 날짜별 레코드
+        site_url: 사이트 주소 (예: "https://user.github.io/repo/"). 없으면 상대 경로 사용
+    """
+    root = (site_url.rstrip('/') + '/') if site_url else ''
+    items = []
+    for date_str in sorted(days, reverse=True)[:FEED_DAYS]:
+        day = days[date_str]
+        briefings = group_briefings(day)
+        if len(briefings) > 1:
+            content = "\n\n".join(f"[{group_label(group)}]\n{record.get('summary', '')}" for group, record in briefings)
+        else:
+            content = briefings[0][1].get('summary', '') if briefings else ''
+        item = {
+            'id': date_str,
+            'url': f"{root}days/{date_str}.html",
+            'title': f"{date_str} 주요 브리핑",
+            'content_text': content,
+            'date_published': f"{date_str}T00:00:00+09:00",
+            'tags': list(dict.fromkeys(kw for _, record in briefings for kw in record.get('keywords', []))),
+        }
+        image_path = next((record['image_path'] for _, record in briefings if record.get('image_path')), None)
+        if image_path:
+            item['image'] = f"{root}{image_copy_path(image_path)[len(SITE_DIR) + 1:]}"
+        items.append(item)
+    feed = {'version': 'https://jsonfeed.org/version/1.1', 'title': SITE_TITLE, 'items': items}
+    if site_url:
+        feed['home_page_url'] = root
+        feed['feed_url'] = f"{root}feed.json"
+    return json.dumps(feed, ensure_ascii=False, indent=2)
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def export_site(db, news_data: Dict[str, Any], images: Optional[Dict[str, bytes]] = None,
+                site_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    news_data.json의 날짜들을 정적 사이트로 내보내기 (내용이 바뀐 파일만 커밋 하나로 저장)
+
+    아카이브로 옮겨진 날짜의 페이지는 이전에 내보낸 그대로 유지되고 목록에도 남습니다.
+
+    Args:
+        db: GithubDataHandler
+        news_data: 날짜별 레코드 (news_data.json 내용)
+        images: {원본 인포그래픽 경로: PNG bytes} 이번에 새로 만든 인포그래픽
+                (나머지는 사본이 없을 때만 원본에서 복사)
+        site_url: JSON Feed에 넣을 사이트 주소 (선택적)
+
+    Returns:
+        dict: 실행 결과 (written, unchanged, ok)
+    """
+    images = images or {}
+    manifest = db.load_json(MANIFEST_PATH)
+    hashes: Dict[str, str] = manifest.get('files', {})
+    exported_days = set(manifest.get('days', []))
+    days = {date_str: day for date_str, day in news_data.items() if isinstance(day, dict)}
+    for day in days.values():
+        migrate_day(day)
+
+    files: Dict[str, bytes] = {}
+    for day in days.values():
+        for _, record in group_briefings(day):
+            image_path = record.get('image_path')
+            if not image_path:
+                continue
+            if image_path in images:
+                files[image_copy_path(image_path)] = images[image_path]
+            elif image_copy_path(image_path) not in hashes:
+                content = db.load_bytes(image_path)
+                if content:
+                    files[image_copy_path(image_path)] = content
+    image_paths = set(files) | set(hashes)
+
+    all_dates = sorted(exported_days | set(days))
+    for i, date_str in enumerate(all_dates):
+        if date_str not in days:
+            continue
+        page = render_day(date_str, days[date_str], image_paths,
+                          prev_date=all_dates[i - 1] if i > 0 else None,
+                          next_date=all_dates[i + 1] if i + 1 < len(all_dates) else None)
+        files[day_page_path(date_str)] = page.encode('utf-8')
+    files[f"{SITE_DIR}/index.html"] = render_index(all_dates, days).encode('utf-8')
+    files[f"{SITE_DIR}/feed.json"] = render_feed(days, site_url).encode('utf-8')
+
+    changed = {}
+    unchanged = 0
+    for path, content in sorted(files.items()):
+        digest = _digest(content)
+        if hashes.get(path) == digest:
+            unchanged += 1
+            continue
+        changed[path] = content
+        hashes[path] = digest
+
+    written = sorted(changed)
+    ok = True
+    if changed:
+        # 바뀐 페이지/이미지와 매니페스트를 커밋 하나로 저장
+        changed[MANIFEST_PATH] = {'files': hashes, 'days': all_dates}
+        ok = db.commit_files(changed, f"Export site ({len(written)} files)",
+                             merges={MANIFEST_PATH: merge_nested_keys})
+        if not ok:
+            written = []
+    return {'written': written, 'unchanged': unchanged, 'ok': ok}
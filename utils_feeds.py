@@ -0,0 +1,274 @@
+"""
+RSS 피드 상태(health) 기록 및 적응형 수집 주기 계산
+
+feeds.json 구조:
+{
+    "urls": ["https://...", ...],
+    "groups": {                        # 피드 그룹 (선택적, 그룹마다 따로 브리핑 생성)
+        "해외 테크": ["https://techcrunch.com/feed/", ...]
+    },                                 # 어느 그룹에도 없는 피드는 기본 그룹
+    "health": {
+        "https://...": {
+            "last_attempt": "2025-12-06T04:00:00+00:00",
+            "last_success": "2025-12-06T04:00:00+00:00",
+            "latency": 0.82,           # 마지막 성공 요청 소요 시간 (초)
+            "error_streak": 0,         # 연속 실패 횟수
+            "last_error": "",
+            "item_rate": 12.5,         # 하루 평균 새 기사 수 (지수 이동 평균)
+            "newest_seen": "2025-12-06T03:30:00+00:00",
+            "next_poll": "2025-12-06T06:00:00+00:00"
+        }
+    }
+}
+"""
+import datetime
+import hashlib
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+
+MIN_POLL_INTERVAL = datetime.timedelta(hours=1)    # 빠른 피드의 최소 수집 간격
+MAX_POLL_INTERVAL = datetime.timedelta(hours=24)   # 느린 피드의 최대 수집 간격
+MAX_ERROR_BACKOFF = datetime.timedelta(days=3)     # 계속 실패하는 피드의 최대 대기 시간
+TARGET_ITEMS_PER_POLL = 5                          # 한 번 수집할 때 기대하는 새 기사 수
+ITEM_RATE_SMOOTHING = 0.3                          # item_rate 이동 평균 가중치
+SLOW_LATENCY = 5.0                                 # 이 이상이면 '느림'으로 표시 (초)
+
+DEFAULT_GROUP = ''                                 # 그룹이 지정되지 않은 피드의 그룹 (날짜별 레코드 최상위)
+DEFAULT_GROUP_LABEL = '기본'
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _to_iso(value: Optional[datetime.datetime]) -> str:
+    return value.isoformat(timespec='seconds') if value else ''
+
+
+def _from_iso(value: Optional[str]) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def get_health(feeds: Dict[str, Any], url: str) -> Dict[str, Any]:
+    """
+    feeds.json dict에서 특정 피드의 health 항목 반환 (없으면 생성)
+
+    Args:
+        feeds: feeds.json 내용
+        url: 피드 URL
+    """
+    return feeds.setdefault('health', {}).setdefault(url, {})
+
+
+def prune_health(feeds: Dict[str, Any]) -> Dict[str, Any]:
+    """등록되지 않은 피드의 health 항목과 그룹 지정 제거 (빈 그룹도 제거)"""
+    urls = set(feeds.get('urls', []))
+    feeds['health'] = {url: h for url, h in feeds.get('health', {}).items() if url in urls}
+    if 'groups' in feeds:
+        groups = {name: [url for url in group_urls if url in urls] for name, group_urls in feeds['groups'].items()}
+        feeds['groups'] = {name: group_urls for name, group_urls in groups.items() if group_urls}
+    return feeds
+
+
+def feed_groups(feeds: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    그룹별 피드 URL 목록 (urls 순서 유지)
+
+    Args:
+        feeds: feeds.json 내용
+
+    Returns:
+        dict: {그룹 이름: URL 목록} — 기본 그룹(DEFAULT_GROUP)이 먼저, 이후 이름 순.
+              피드가 없는 그룹은 포함하지 않음
+    """
+    membership: Dict[str, str] = {}
+    for name in sorted(feeds.get('groups', {})):
+        for url in feeds['groups'][name]:
+            membership.setdefault(url, name)
+    groups: Dict[str, List[str]] = {}
+    for url in feeds.get('urls', []):
+        groups.setdefault(membership.get(url, DEFAULT_GROUP), []).append(url)
+    return dict(sorted(groups.items(), key=lambda item: (item[0] != DEFAULT_GROUP, item[0])))
+
+
+def set_feed_group(feeds: Dict[str, Any], url: str, group: str) -> Dict[str, Any]:
+    """
+    피드를 그룹에 지정 (DEFAULT_GROUP이면 그룹 지정 해제, 제자리에서 수정)
+
+    Args:
+        feeds: feeds.json 내용
+        url: 피드 URL
+        group: 그룹 이름
+    """
+    groups = {name: [u for u in urls if u != url] for name, urls in feeds.get('groups', {}).items()}
+    group = group.strip()
+    if group != DEFAULT_GROUP:
+        groups.setdefault(group, []).append(url)
+    feeds['groups'] = {name: urls for name, urls in groups.items() if urls}
+    return feeds
+
+
+def group_label(group: str) -> str:
+    """화면 표시용 그룹 이름"""
+    return group or DEFAULT_GROUP_LABEL
+
+
+def group_slug(group: str) -> str:
+    """
+    파일 이름용 그룹 식별자 (영문/숫자는 그대로, 그 외 이름은 해시)
+
+    예: "Global Tech" → "global-tech", "국내 IT" → "g-1a2b3c4d"
+    """
+    slug = re.sub(r'[^a-z0-9]+', '-', group.lower()).strip('-')
+    if slug and group.isascii():
+        return slug
+    return 'g-' + hashlib.sha1(group.encode('utf-8')).hexdigest()[:8]
+
+
+def is_due(health: Dict[str, Any], now: Optional[datetime.datetime] = None) -> bool:
+    """피드를 지금 수집해야 하는지 확인 (기록이 없으면 항상 수집)"""
+    next_poll = _from_iso(health.get('next_poll'))
+    return next_poll is None or next_poll <= (now or _now())
+
+
+def select_due_feeds(feeds: Dict[str, Any], now: Optional[datetime.datetime] = None) -> List[str]:
+    """
+    수집 주기가 돌아온 피드 URL 목록 반환
+
+    Args:
+        feeds: feeds.json 내용
+        now: 기준 시각 (기본값: 현재 UTC 시각)
+    """
+    health = feeds.get('health', {})
+    return [url for url in feeds.get('urls', []) if is_due(health.get(url, {}), now)]
+
+
+def _poll_interval(item_rate: float, found_new: bool, previous: Optional[datetime.timedelta]) -> datetime.timedelta:
+    """하루 기사 수에 맞춰 다음 수집까지의 간격 계산"""
+    if item_rate > 0:
+        interval = datetime.timedelta(days=TARGET_ITEMS_PER_POLL / item_rate)
+    else:
+        interval = MAX_POLL_INTERVAL
+    if not found_new and previous:
+        # 새 기사가 없었으면 간격을 늘려서 조용한 피드를 덜 자주 확인
+        interval = max(interval, previous * 2)
+    return min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, interval))
+
+
+def record_success(health: Dict[str, Any], latency: float,
+                   published: Iterable[datetime.datetime],
+                   now: Optional[datetime.datetime] = None) -> Dict[str, Any]:
+    """
+    수집 성공 결과를 health 항목에 기록하고 다음 수집 시각 계산
+
+    Args:
+        health: 피드의 health 항목 (제자리에서 수정)
+        latency: 요청 소요 시간 (초)
+        published: 피드 항목들의 발행 시각 (timezone 포함)
+        now: 기준 시각 (기본값: 현재 UTC 시각)
+
+    Returns:
+        dict: 수정된 health 항목
+    """
+    now = now or _now()
+    newest_seen = _from_iso(health.get('newest_seen'))
+    last_success = _from_iso(health.get('last_success'))
+    published = [p for p in published if p is not None]
+
+    new_items = [p for p in published if newest_seen is None or p > newest_seen]
+    if published:
+        newest_seen = max([newest_seen] + published if newest_seen else published)
+
+    # 하루 평균 새 기사 수 (첫 수집은 피드에 보이는 기사들의 발행 간격으로 추정)
+    if last_success is not None:
+        elapsed_days = max((now - last_success).total_seconds() / 86400, 1 / 24)
+        observed_rate = len(new_items) / elapsed_days
+    elif len(published) > 1:
+        span_days = max((max(published) - min(published)).total_seconds() / 86400, 1 / 24)
+        observed_rate = (len(published) - 1) / span_days
+    else:
+        observed_rate = float(len(published))
+    previous_rate = health.get('item_rate')
+    if previous_rate is None:
+        item_rate = observed_rate
+    else:
+        item_rate = (1 - ITEM_RATE_SMOOTHING) * previous_rate + ITEM_RATE_SMOOTHING * observed_rate
+
+    previous_poll = _from_iso(health.get('next_poll'))
+    previous_interval = previous_poll - last_success if previous_poll and last_success else None
+    interval = _poll_interval(item_rate, bool(new_items), previous_interval)
+
+    health.update({
+        'last_attempt': _to_iso(now),
+        'last_success': _to_iso(now),
+        'latency': round(latency, 3),
+        'error_streak': 0,
+        'last_error': '',
+        'item_rate': round(item_rate, 2),
+        'newest_seen': _to_iso(newest_seen),
+        'next_poll': _to_iso(now + interval),
+    })
+    return health
+
+
+def record_failure(health: Dict[str, Any], error: str,
+                   now: Optional[datetime.datetime] = None) -> Dict[str, Any]:
+    """
+    수집 실패를 health 항목에 기록 (연속 실패할수록 다음 시도를 지수적으로 늦춤)
+
+    Args:
+        health: 피드의 health 항목 (제자리에서 수정)
+        error: 오류 메시지
+        now: 기준 시각 (기본값: 현재 UTC 시각)
+    """
+    now = now or _now()
+    streak = health.get('error_streak', 0) + 1
+    backoff = min(MAX_ERROR_BACKOFF, MIN_POLL_INTERVAL * (2 ** (streak - 1)))
+    health.update({
+        'last_attempt': _to_iso(now),
+        'error_streak': streak,
+        'last_error': str(error)[:200],
+        'next_poll': _to_iso(now + backoff),
+    })
+    return health
+
+
+def health_status(health: Dict[str, Any]) -> str:
+    """대시보드 표시용 상태 문자열"""
+    if not health.get('last_attempt'):
+        return '⚪ 미수집'
+    streak = health.get('error_streak', 0)
+    if streak >= 3:
+        return '🔴 중단'
+    if streak > 0:
+        return '🟠 오류'
+    if (health.get('latency') or 0) >= SLOW_LATENCY:
+        return '🟡 느림'
+    return '🟢 정상'
+
+
+def health_rows(feeds: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """RSS 관리 화면에 표시할 피드별 상태 행 목록"""
+    rows = []
+    health = feeds.get('health', {})
+    membership = {url: group for group, urls in feed_groups(feeds).items() for url in urls}
+    for url in feeds.get('urls', []):
+        h = health.get(url, {})
+        rows.append({
+            '피드': url,
+            '그룹': group_label(membership.get(url, DEFAULT_GROUP)),
+            '상태': health_status(h),
+            '마지막 성공': h.get('last_success', ''),
+            '응답 시간(초)': h.get('latency'),
+            '연속 오류': h.get('error_streak', 0),
+            '하루 기사 수': h.get('item_rate'),
+            '최신 기사': h.get('newest_seen', ''),
+            '다음 수집': h.get('next_poll', ''),
+        })
+    return rows
@@ -0,0 +1,171 @@
+"""
+크기와 시간이 제한된 HTTP 다운로드 (RSS 피드, 이미지 API 응답)
+
+대시보드에서 누구나 피드 URL을 추가할 수 있으므로, 잘못된 URL(거대한 사이트맵,
+바이너리 파일, 응답을 조금씩 흘려보내는 서버)이 Streamlit 작업자의 메모리를 채우거나
+수집을 멈추게 하지 않도록 다음을 적용합니다.
+
+- 응답 본문을 조각 단위로 읽고, 최대 바이트 수를 넘으면 즉시 중단 (Content-Length가 크면 읽지 않음)
+- Content-Type 확인 (피드가 아닌 이미지/동영상/압축 파일 등은 본문을 읽지 않음)
+- gzip/deflate 압축은 직접 조각 단위로 풀어서, 작은 압축 본문이 거대하게 풀리는 경우에도
+  풀린 크기 기준으로 제한 (압축 폭탄 방지)
+- 연결/읽기 timeout과 별도로 다운로드 전체 시간 제한 (느리게 흘려보내는 응답 방지)
+"""
+import zlib
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from utils_resilience import Deadline
+
+
+MAX_FEED_BYTES = 5 * 1024 * 1024     # 피드 문서 최대 크기 (풀린 크기 기준)
+MAX_API_BYTES = 20 * 1024 * 1024     # 이미지 API 응답(JSON, base64 이미지 포함) 최대 크기
+CHUNK_SIZE = 64 * 1024
+
+# 피드로 받아들이는 Content-Type (없거나 text/*도 허용: 많은 피드가 text/html, text/plain으로 응답함)
+FEED_CONTENT_TYPES = ('xml', 'rss', 'atom', 'rdf', 'text/', 'application/octet-stream')
+SUPPORTED_ENCODINGS = ('gzip', 'deflate', 'identity', '')
+
+
+class DownloadError(Exception):
+    """다운로드를 거부하거나 중단한 경우 (일시적 오류가 아니므로 재시도하지 않음)"""
+
+
+class ResponseTooLarge(DownloadError):
+    """응답 본문이 최대 크기를 넘는 경우"""
+
+
+class UnexpectedContentType(DownloadError):
+    """피드가 아닌 Content-Type인 경우"""
+
+
+class DownloadTimeout(DownloadError):
+    """본문을 전체 시간 제한 안에 다 읽지 못한 경우 (조금씩 흘려보내는 응답)"""
+
+
+def check_feed_url(url: str) -> Optional[str]:
+    """
+    피드 URL 형식 확인
+
+    Returns:
+        str: 문제가 있으면 오류 메시지, 없으면 None
+    """
+    parsed = urlparse(url.strip())
+    if parsed.scheme not in ('http', 'https'):
+        return "http:// 또는 https:// 로 시작하는 주소만 사용할 수 있습니다."
+    if not parsed.netloc:
+        return "주소에 호스트 이름이 없습니다."
+    return None
+
+
+def _decoder(encoding: str):
+    """Content-Encoding별 zlib 해제 객체 (압축이 없으면 None)"""
+    if encoding == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        return zlib.decompressobj()
+    return None
+
+
+def _raw_chunks(response: requests.Response) -> Iterable[bytes]:
+    """압축을 풀지 않은 본문 조각 (도착한 만큼 바로 반환해서 조각마다 시간 제한을 확인할 수 있음)"""
+    while True:
+        chunk = response.raw.read1(CHUNK_SIZE, decode_content=False)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _decoded_chunks(chunks: Iterable[bytes], encoding: str, limit: int) -> Iterable[bytes]:
+    """
+    압축된 조각을 풀면서 내보내기 (한 번에 최대 limit + 1 바이트만 풀어서 메모리 제한)
+    """
+    decoder = _decoder(encoding)
+    if decoder is None:
+        yield from chunks
+        return
+    for chunk in chunks:
+        data = chunk
+        while data:
+            yield decoder.decompress(data, limit + 1)
+            data = decoder.unconsumed_tail
+    yield decoder.flush()
+
+
+def read_bounded(response: requests.Response, max_bytes: int, deadline: Deadline) -> bytes:
+    """
+    스트리밍 응답의 본문을 최대 크기와 마감 시간 안에서 읽기
+
+    Args:
+        response: stream=True로 받은 응답
+        max_bytes: 최대 바이트 수 (압축을 푼 크기 기준)
+        deadline: 다운로드 전체 마감 시간
+
+    Returns:
+        bytes: 응답 본문
+
+    Raises:
+        ResponseTooLarge: 최대 크기를 넘는 경우
+        DownloadTimeout: 마감 시간 안에 다 읽지 못한 경우
+        DownloadError: 지원하지 않는 Content-Encoding이거나 압축 해제에 실패한 경우
+    """
+    try:
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise ResponseTooLarge(f"응답이 너무 큽니다 ({int(declared):,}바이트 > {max_bytes:,}바이트)")
+
+        encoding = response.headers.get('Content-Encoding', '').strip().lower()
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise DownloadError(f"지원하지 않는 Content-Encoding: {encoding}")
+
+        # urllib3의 자동 해제를 끄고 직접 풀어서, 풀린 크기를 조각마다 확인
+        raw_chunks = _raw_chunks(response)
+        body = bytearray()
+        for chunk in _decoded_chunks(raw_chunks, encoding, max_bytes):
+            body += chunk
+            if len(body) > max_bytes:
+                raise ResponseTooLarge(f"응답이 최대 크기({max_bytes:,}바이트)를 넘었습니다.")
+            if deadline.expired():
+                raise DownloadTimeout("응답을 시간 제한 안에 다 읽지 못했습니다.")
+        return bytes(body)
+    except zlib.error as e:
+        raise DownloadError(f"압축 해제 실패: {e}")
+    finally:
+        response.close()
+
+
+def fetch_feed_bytes(url: str, timeout: float, max_bytes: int = MAX_FEED_BYTES,
+                     headers: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    피드 문서를 크기/Content-Type/시간 제한 안에서 내려받기
+
+    Args:
+        url: 피드 URL
+        timeout: 연결부터 본문을 다 읽을 때까지의 전체 시간 제한 (초)
+        max_bytes: 최대 바이트 수 (압축을 푼 크기 기준)
+        headers: 추가 요청 헤더
+
+    Returns:
+        bytes: 피드 문서
+
+    Raises:
+        DownloadError: 크기/형식/시간 제한에 걸린 경우
+        requests.RequestException: 네트워크/HTTP 오류
+    """
+    error = check_feed_url(url)
+    if error:
+        raise DownloadError(error)
+    deadline = Deadline(timeout)
+    request_headers = {**(headers or {}), 'Accept-Encoding': 'gzip, deflate'}
+    response = requests.get(url, headers=request_headers, timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '').lower()
+        if content_type and not any(allowed in content_type for allowed in FEED_CONTENT_TYPES):
+            raise UnexpectedContentType(f"피드가 아닌 응답입니다 (Content-Type: {content_type})")
+    except Exception:
+        response.close()
+        raise
+    return read_bounded(response, max_bytes, deadline)
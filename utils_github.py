@@ -1,24 +1,173 @@
+import base64
+import hashlib
 import json
-from github import Github
+import logging
+import sys
+import threading
+import time
+from urllib.parse import quote
+
+import requests
+from github import Auth, Github, InputGitTreeElement
 from github.GithubException import GithubException, UnknownObjectException
-import streamlit as st
+from utils_json import dumps_for_path, loads
+from utils_resilience import backoff_delay
+
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = 10                 # 세션들이 함께 쓰는 keep-alive 연결 수
+REQUEST_TIMEOUT = 15           # GitHub 요청당 timeout (초)
+HEALTH_CHECK_INTERVAL = 300    # 연결 확인 간격 (초)
+SAVE_ATTEMPTS = 4              # 저장 충돌 시 최대 시도 횟수
+API_URL = "https://api.github.com"
+BINARY_CHUNK_SIZE = 256 * 1024  # 바이너리 파일을 내려받을 때 한 번에 읽을 크기
+_CONFLICT_STATUSES = (409, 422)  # SHA 불일치(update) / 이미 존재(create)
+
+
+def _report(level, message):
+    """
+    오류/경고 표시
+    
+    Streamlit 앱 안에서는 화면에 표시하고, CLI 등 Streamlit 밖에서는 로그로 남깁니다.
+    (이 모듈은 Streamlit을 직접 import하지 않으므로 헤드리스 실행에서도 사용할 수 있습니다)
+    
+    Args:
+        level: "error" 또는 "warning"
+        message: 표시할 메시지
+    """
+    st = sys.modules.get('streamlit')
+    if st is not None:
+        try:
+            from streamlit import runtime
+            if runtime.exists():
+                getattr(st, level)(message)
+                return
+        except ImportError:
+            pass
+    logger.log(logging.ERROR if level == 'error' else logging.WARNING, message)
+
+
+def image_to_bytes(image_obj):
+    """
+    PIL Image 또는 bytes를 PNG bytes로 변환
+    
+    Returns:
+        bytes: PNG 데이터 (지원하지 않는 형식이면 None)
+    """
+    import io
+    from PIL import Image
+    
+    if isinstance(image_obj, Image.Image):
+        img_byte_arr = io.BytesIO()
+        image_obj.save(img_byte_arr, format='PNG')
+        return img_byte_arr.getvalue()
+    if isinstance(image_obj, bytes):
+        return image_obj
+    return None
 
 
 class GithubDataHandler:
-    """GitHub 리포지토리의 JSON 파일을 읽고 쓰는 핸들러"""
+    """GitHub 리포지토리의 JSON 파일을 읽고 쓰는 핸들러 (여러 스레드에서 함께 사용 가능)"""
     
     def __init__(self, token, repo_name):
         """
+        리포지토리 정보는 처음 파일을 읽거나 쓸 때까지 요청하지 않습니다 (get_repo 왕복 없음).
+        
         Args:
             token: GitHub Personal Access Token
             repo_name: 리포지토리 이름 (예: "username/repo-name")
         """
+        self._token = token
+        self.repo_name = repo_name
+        self._connect_lock = threading.Lock()
+        self._connect()
+        # 새 클라이언트는 확인 요청 없이 사용하고, 요청이 실패하면 다음 health_check에서 확인
+        self._last_healthy = time.monotonic()
+        # 파일별로 마지막에 읽은/쓴 (sha, 내용) — 세션(스레드)마다 따로 기억
+        self._local = threading.local()
+
+    def _connect(self):
+        """
+        keep-alive 연결 풀을 쓰는 GitHub 클라이언트와 지연 로딩 리포지토리 객체 생성
+
+        바이너리 파일은 base64 JSON 대신 원본 그대로 스트리밍으로 받도록 별도의 HTTP 세션도 만듭니다.
+        """
         try:
-            self.g = Github(token)
-            self.repo = self.g.get_repo(repo_name)
+            try:
+                g = Github(auth=Auth.Token(self._token), pool_size=POOL_SIZE, timeout=REQUEST_TIMEOUT, lazy=True)
+                repo = g.get_repo(self.repo_name)
+            except TypeError:
+                # lazy 인자가 없는 이전 PyGithub
+                g = Github(auth=Auth.Token(self._token), pool_size=POOL_SIZE, timeout=REQUEST_TIMEOUT)
+                repo = g.get_repo(self.repo_name, lazy=True)
         except GithubException as e:
-            st.error(f"GitHub 연결 오류: {e}")
+            _report("error", f"GitHub 연결 오류: {e}")
             raise
+        session = requests.Session()
+        session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE))
+        session.headers.update({'Authorization': f"Bearer {self._token}",
+                                'Accept': 'application/vnd.github.raw',
+                                'X-GitHub-Api-Version': '2022-11-28'})
+        self.g, self.repo, self._http = g, repo, session
+
+    def health_check(self, force=False):
+        """
+        연결 상태 확인, 실패하면 클라이언트를 새로 만들어 한 번 더 확인
+        
+        마지막 성공 후 HEALTH_CHECK_INTERVAL초가 지나지 않았으면 요청 없이 통과합니다.
+        (rate limit 조회는 API 사용량에 포함되지 않음)
+        
+        Args:
+            force: 간격과 관계없이 확인
+            
+        Returns:
+            bool: 연결이 정상이면 True
+        """
+        with self._connect_lock:
+            if not force and self._last_healthy is not None \
+                    and time.monotonic() - self._last_healthy < HEALTH_CHECK_INTERVAL:
+                return True
+            for attempt in range(2):
+                try:
+                    self.g.get_rate_limit()
+                    self._last_healthy = time.monotonic()
+                    return True
+                except Exception as e:
+                    logger.warning(f"GitHub 연결 확인 실패 ({attempt + 1}회): {e}")
+                    if attempt == 0:
+                        try:
+                            self._connect()
+                        except GithubException:
+                            break
+            self._last_healthy = None
+            return False
+
+    def _bases(self):
+        if not hasattr(self._local, 'bases'):
+            self._local.bases = {}
+        return self._local.bases
+
+    def _fetch_content(self, file_path, ref=None):
+        """
+        현재 파일(ref가 주어지면 그 커밋의 파일)의 (sha, 내용 bytes). 파일이 없으면 (None, None)
+        
+        1MB가 넘어 Contents API 응답에 내용이 없으면 같은 sha의 blob을 원본 그대로 받습니다.
+        """
+        try:
+            contents = self.repo.get_contents(file_path, ref=ref) if ref else self.repo.get_contents(file_path)
+        except UnknownObjectException:
+            return None, None
+        if contents.encoding != 'base64':
+            return contents.sha, self._blob_bytes(contents.sha)
+        return contents.sha, contents.decoded_content
+
+    def _blob_bytes(self, sha):
+        """Git blob을 raw 미디어 타입으로 받기 (base64 없이, 최대 100MB)"""
+        url = f"{API_URL}/repos/{self.repo_name}/git/blobs/{sha}"
+        with self._http.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            return b"".join(response.iter_content(chunk_size=BINARY_CHUNK_SIZE))
 
     def load_json(self, file_path):
         """
@@ -31,112 +180,278 @@ class GithubDataHandler:
             dict: JSON 파일 내용 (파일이 없으면 빈 dict 반환)
         """
         try:
-            contents = self.repo.get_contents(file_path)
-            return json.loads(contents.decoded_content.decode('utf-8'))
-        except UnknownObjectException:
-            # 파일이 없으면 빈 딕셔너리 반환
-            return {}
+            sha, content = self._fetch_content(file_path)
+            # save_json에서 충돌을 병합할 때 기준(base)으로 사용
+            self._bases()[file_path] = (sha, content)
+            if content is None:
+                # 파일이 없으면 빈 딕셔너리 반환
+                return {}
+            return loads(content)
         except json.JSONDecodeError as e:
-            st.warning(f"JSON 파싱 오류 ({file_path}): {e}")
+            _report("warning", f"JSON 파싱 오류 ({file_path}): {e}")
+            # 깨진 파일은 빈 dict를 읽은 것으로 취급
+            self._bases()[file_path] = (sha, None)
             return {}
-        except GithubException as e:
-            st.error(f"GitHub 읽기 오류 ({file_path}): {e}")
+        except (GithubException, requests.RequestException) as e:
+            _report("error", f"GitHub 읽기 오류 ({file_path}): {e}")
+            self._last_healthy = None  # 다음 health_check에서 연결 확인
             return {}
 
-    def save_json(self, file_path, data, message="Update data"):
+    def save_json(self, file_path, data, message="Update data", merge=None, attempts=SAVE_ATTEMPTS):
         """
-        dict 데이터를 JSON으로 변환해서 GitHub에 저장
+        dict 데이터를 JSON으로 변환해서 GitHub에 저장 (SHA 조건부 쓰기)
+        
+        형식은 utils_json.dumps_for_path를 따릅니다 (feeds.json처럼 사람이 고치는 파일만 들여쓰기).
+        
+        load_json으로 읽은 뒤 다른 세션이 같은 파일을 먼저 저장했으면
+        merge(base, data, remote)로 합친 결과를 저장합니다. 쓰는 순간에 또 바뀌면
+        (409/422) 최신 내용을 다시 읽어 최대 attempts번까지 재시도합니다.
+        merge가 없거나 이 세션에서 파일을 읽은 적이 없으면 data로 덮어씁니다.
         
         Args:
             file_path: 리포지토리 내 파일 경로
-            data: 저장할 dict 데이터
+            data: 저장할 dict 데이터 (병합된 경우 병합 결과로 갱신됨)
             message: 커밋 메시지
+            merge: 3-way 병합 함수 (utils_merge 참고)
+            attempts: 충돌 시 최대 시도 횟수
             
         Returns:
             bool: 성공 여부
         """
         try:
-            content = json.dumps(data, indent=4, ensure_ascii=False)
-            
-            try:
-                # 파일이 존재하면 업데이트
-                file = self.repo.get_contents(file_path)
-                self.repo.update_file(file.path, message, content, file.sha)
-                return True
-            except UnknownObjectException:
-                # 파일이 없으면 생성
-                self.repo.create_file(file_path, message, content)
+            loaded = file_path in self._bases()
+            base_sha, base_content = self._bases().get(file_path, (None, None))
+            for attempt in range(attempts):
+                remote_sha, remote_content = self._fetch_content(file_path)
+                payload = data
+                if merge is not None and loaded and remote_content is not None and remote_sha != base_sha:
+                    # 읽을 때 파일이 없었으면 빈 dict가 기준
+                    base = loads(base_content) if base_content is not None else {}
+                    payload = merge(base, data, loads(remote_content))
+                content = dumps_for_path(file_path, payload)
+                
+                try:
+                    if remote_sha is None:
+                        # 파일이 없으면 생성
+                        result = self.repo.create_file(file_path, message, content)
+                    else:
+                        # 읽은 시점의 sha가 그대로일 때만 업데이트
+                        result = self.repo.update_file(file_path, message, content, remote_sha)
+                except GithubException as e:
+                    if e.status in _CONFLICT_STATUSES and attempt < attempts - 1:
+                        time.sleep(backoff_delay(attempt, base_delay=0.5, max_delay=4.0))
+                        continue
+                    raise
+                
+                self._bases()[file_path] = (result['content'].sha, content)
+                if payload is not data and isinstance(data, dict):
+                    data.clear()
+                    data.update(payload)
                 return True
         except GithubException as e:
-            st.error(f"GitHub 저장 오류 ({file_path}): {e}")
+            _report("error", f"GitHub 저장 오류 ({file_path}): {e}")
+            self._last_healthy = None  # 다음 health_check에서 연결 확인
             return False
         except Exception as e:
-            st.error(f"예상치 못한 오류 ({file_path}): {e}")
+            _report("error", f"예상치 못한 오류 ({file_path}): {e}")
             return False
 
-    def save_image(self, file_path, image_obj, message="Update image"):
+    def commit_files(self, files, message="Update files", merges=None, attempts=SAVE_ATTEMPTS):
         """
-        이미지 객체를 GitHub에 저장
-        중첩된 폴더 구조도 자동으로 생성됩니다.
+        여러 파일을 커밋 하나로 저장 (Git 데이터 API: blob → tree → commit → 브랜치 이동)
+        
+        파일마다 커밋을 만드는 save_json/save_bytes와 달리, 백필처럼 많은 파일을 한 번에
+        바꿀 때 커밋 수와 API 호출 수를 줄입니다. 브랜치는 fast-forward로만 옮기므로,
+        그 사이 다른 커밋이 생기면 최신 커밋 위에서 다시 만듭니다 (최대 attempts번).
         
         Args:
-            file_path: 리포지토리 내 파일 경로 (예: "images/2025/12/2025-12-06.png")
-            image_obj: PIL Image 객체 또는 bytes
+            files: {파일 경로: bytes 또는 dict} — dict는 save_json과 같은 형식의 JSON으로 저장
             message: 커밋 메시지
+            merges: {파일 경로: 3-way 병합 함수} — load_json 이후 다른 세션이 바꾼 JSON 파일은
+                    save_json처럼 병합 (dict 데이터는 병합 결과로 갱신됨)
+            attempts: 충돌 시 최대 시도 횟수
             
         Returns:
             bool: 성공 여부
         """
+        merges = merges or {}
         try:
-            import io
-            from PIL import Image
-            
-            # PIL Image를 Bytes로 변환
-            if isinstance(image_obj, Image.Image):
-                img_byte_arr = io.BytesIO()
-                image_obj.save(img_byte_arr, format='PNG')
-                img_bytes = img_byte_arr.getvalue()
-            elif isinstance(image_obj, bytes):
-                img_bytes = image_obj
-            else:
-                st.error(f"지원하지 않는 이미지 형식: {type(image_obj)}")
-                return False
-            
-            try:
-                # 파일이 존재하면 업데이트
-                file = self.repo.get_contents(file_path)
-                self.repo.update_file(file.path, message, img_bytes, file.sha)
-                return True
-            except UnknownObjectException:
-                # 파일이 없으면 생성 (GitHub API가 중첩된 폴더 구조를 자동으로 생성)
-                self.repo.create_file(file_path, message, img_bytes)
+            # 바이너리 파일은 한 번만 올리고 재시도 때 다시 사용
+            blobs = {
+                path: self.repo.create_git_blob(base64.b64encode(content).decode('ascii'), 'base64').sha
+                for path, content in files.items() if isinstance(content, bytes)
+            }
+            for attempt in range(attempts):
+                ref = self.repo.get_git_ref(f"heads/{self.repo.default_branch}")
+                head = self.repo.get_git_commit(ref.object.sha)
+                written = {}
+                for path, data in files.items():
+                    if isinstance(data, bytes):
+                        continue
+                    payload = data
+                    merge = merges.get(path)
+                    if merge is not None and path in self._bases():
+                        base_sha, base_content = self._bases()[path]
+                        remote_sha, remote_content = self._fetch_content(path, ref=head.sha)
+                        if remote_content is not None and remote_sha != base_sha:
+                            base = loads(base_content) if base_content is not None else {}
+                            payload = merge(base, data, loads(remote_content))
+                    content = dumps_for_path(path, payload)
+                    blob = self.repo.create_git_blob(base64.b64encode(content).decode('ascii'), 'base64')
+                    written[path] = (payload, content, blob.sha)
+                    blobs[path] = written[path][2]
+                
+                elements = [InputGitTreeElement(path, '100644', 'blob', sha=sha) for path, sha in sorted(blobs.items())]
+                tree = self.repo.create_git_tree(elements, head.tree)
+                commit = self.repo.create_git_commit(message, tree, [head])
+                try:
+                    ref.edit(commit.sha, force=False)
+                except GithubException as e:
+                    if e.status in _CONFLICT_STATUSES and attempt < attempts - 1:
+                        time.sleep(backoff_delay(attempt, base_delay=0.5, max_delay=4.0))
+                        continue
+                    raise
+                
+                for path, (payload, content, sha) in written.items():
+                    self._bases()[path] = (sha, content)
+                    data = files[path]
+                    if payload is not data and isinstance(data, dict):
+                        data.clear()
+                        data.update(payload)
                 return True
         except GithubException as e:
-            st.error(f"GitHub 이미지 저장 오류 ({file_path}): {e}")
+            _report("error", f"GitHub 저장 오류 ({self._describe(files)}): {e}")
+            self._last_healthy = None  # 다음 health_check에서 연결 확인
             return False
         except Exception as e:
-            st.error(f"이미지 저장 중 예상치 못한 오류 ({file_path}): {e}")
+            _report("error", f"저장 중 예상치 못한 오류 ({self._describe(files)}): {e}")
             return False
 
-    def load_image(self, file_path):
+    @staticmethod
+    def _describe(files):
+        """오류 메시지에 쓸 저장 대상 (파일 하나면 경로)"""
+        return next(iter(files)) if len(files) == 1 else f"{len(files)}개 파일"
+
+    def save_bytes(self, file_path, content, message="Update file"):
         """
-        GitHub에서 이미지 파일을 읽어서 반환
+        바이너리 데이터를 GitHub에 저장 (Git 데이터 API: blob → tree → commit)
+        
+        Contents API(create_file/update_file)와 달리 기존 파일을 먼저 내려받지 않고
+        1MB가 넘는 파일도 그대로 저장합니다. 중첩된 폴더 구조도 자동으로 생성됩니다.
         
         Args:
-            file_path: 리포지토리 내 파일 경로 (예: "images/2025-12-06.png")
+            file_path: 리포지토리 내 파일 경로 (예: "data/archive/2025-11.json.gz")
+            content: 저장할 bytes
+            message: 커밋 메시지
             
         Returns:
-            bytes: 이미지 바이너리 데이터 또는 None
+            bool: 성공 여부
+        """
+        return self.commit_files({file_path: content}, message)
+
+    def iter_bytes(self, file_path, chunk_size=BINARY_CHUNK_SIZE):
+        """
+        GitHub에서 파일을 원본 그대로 스트리밍으로 읽기 (raw 미디어 타입, 최대 100MB)
+        
+        Contents API의 JSON 응답은 1MB가 넘는 파일 내용을 포함하지 않고 base64로 부풀리므로,
+        raw 미디어 타입으로 요청해서 바이너리를 그대로 chunk_size씩 받습니다.
+        
+        Args:
+            file_path: 리포지토리 내 파일 경로
+            chunk_size: 한 번에 읽을 크기 (bytes)
+            
+        Yields:
+            bytes: 파일 내용 조각
+            
+        Raises:
+            FileNotFoundError: 파일이 없는 경우
+            requests.RequestException: 요청 실패
+        """
+        url = f"{API_URL}/repos/{self.repo_name}/contents/{quote(file_path)}"
+        with self._http.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code == 404:
+                raise FileNotFoundError(file_path)
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size=chunk_size)
+
+    def load_bytes(self, file_path):
+        """
+        GitHub에서 파일을 읽어서 bytes로 반환 (iter_bytes로 스트리밍)
+        
+        Args:
+            file_path: 리포지토리 내 파일 경로
+            
+        Returns:
+            bytes: 파일 내용 또는 None (파일이 없거나 오류)
         """
         try:
-            contents = self.repo.get_contents(file_path)
-            return contents.decoded_content
-        except UnknownObjectException:
+            return b"".join(self.iter_bytes(file_path))
+        except FileNotFoundError:
             return None
-        except GithubException as e:
-            st.warning(f"GitHub 이미지 읽기 오류 ({file_path}): {e}")
+        except requests.RequestException as e:
+            _report("warning", f"GitHub 읽기 오류 ({file_path}): {e}")
+            self._last_healthy = None  # 다음 health_check에서 연결 확인
             return None
         except Exception as e:
-            st.warning(f"이미지 로드 중 예상치 못한 오류 ({file_path}): {e}")
+            _report("warning", f"파일 로드 중 예상치 못한 오류 ({file_path}): {e}")
             return None
 
+    def save_image(self, file_path, image_obj, message="Update image"):
+        """
+        이미지 객체를 GitHub에 저장
+        중첩된 폴더 구조도 자동으로 생성됩니다.
+        
+        Args:
+            file_path: 리포지토리 내 파일 경로 (예: "images/2025/12/2025-12-06.png")
+            image_obj: PIL Image 객체 또는 bytes
+            message: 커밋 메시지
+            
+        Returns:
+            bool: 성공 여부
+        """
+        img_bytes = image_to_bytes(image_obj)
+        if img_bytes is None:
+            _report("error", f"지원하지 않는 이미지 형식: {type(image_obj)}")
+            return False
+        
+        return self.save_bytes(file_path, img_bytes, message)
+
+    def load_image(self, file_path):
+        """
+        GitHub에서 이미지 파일을 읽어서 반환
+        
+        Args:
+            file_path: 리포지토리 내 파일 경로 (예: "images/2025-12-06.png")
+            
+        Returns:
+            bytes: 이미지 바이너리 데이터 또는 None
+        """
+        return self.load_bytes(file_path)
+
+
+_shared_handlers = {}
+_shared_handlers_lock = threading.Lock()
+
+
+def get_shared_handler(token, repo_name):
+    """
+    프로세스 전체에서 공유하는 GithubDataHandler 반환 (없으면 생성)
+    
+    Streamlit의 재실행/세션마다 클라이언트를 새로 만들지 않고 같은 연결 풀을 재사용합니다.
+    반환하기 전에 health_check로 끊어진 연결은 다시 연결합니다.
+    
+    Args:
+        token: GitHub Personal Access Token
+        repo_name: 리포지토리 이름
+        
+    Returns:
+        GithubDataHandler
+    """
+    key = (hashlib.sha256(token.encode('utf-8')).hexdigest(), repo_name)
+    with _shared_handlers_lock:
+        handler = _shared_handlers.get(key)
+        if handler is None:
+            handler = GithubDataHandler(token, repo_name)
+            _shared_handlers[key] = handler
+    handler.health_check()
+    return handler
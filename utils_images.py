@@ -0,0 +1,85 @@
+"""
+인포그래픽 재사용 인덱스 (입력 해시 → 저장된 이미지, 이미지 내용 해시 → 저장 경로)
+
+- 입력 키: 요약, 키워드, 원격 생성(Imagen) 사용 여부, 렌더러 버전(INFOGRAPHIC_VERSION)의 해시
+  같은 입력으로 이미 만든 인포그래픽이 있으면 프롬프트 생성/이미지 생성/저장을 모두 건너뜀
+- 내용 해시: 새로 만든 이미지와 똑같은 PNG가 이미 저장되어 있으면 그 파일을 가리키고 다시 저장하지 않음
+
+새 인포그래픽 파일 이름에는 내용 해시 앞부분이 붙으므로(image_path_for) 저장된 파일이 다른 내용으로
+덮어써지지 않고, 인덱스 항목은 한 번 기록되면 계속 유효합니다.
+
+인덱스 파일 형식 (data/image_index.json):
+{
+    "version": 1,
+    "inputs": {"입력 키": {"path": "images/2025/12/2025-12-06-1a2b3c4d.png", "sha1": "..."}},
+    "blobs": {"sha1": "images/2025/12/2025-12-06-1a2b3c4d.png"}
+}
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List, Optional
+
+from utils_ai import INFOGRAPHIC_VERSION
+
+
+IMAGE_INDEX_PATH = "data/image_index.json"
+IMAGE_INDEX_VERSION = 1
+
+
+def infographic_key(summary_text: str, keywords: Optional[List[str]], remote: bool) -> str:
+    """
+    인포그래픽 입력 키
+
+    Args:
+        summary_text: 뉴스 요약
+        keywords: 키워드 목록
+        remote: 원격 이미지 생성(Imagen 키) 사용 여부 (대체 렌더링만 쓰는 경우와 결과가 다름)
+    """
+    payload = json.dumps([INFOGRAPHIC_VERSION, summary_text or '', list(keywords or []), bool(remote)],
+                         ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def content_hash(image_bytes: bytes) -> str:
+    """PNG 내용 해시 (인덱스의 blobs 키, 파일 이름 접미사)"""
+    return hashlib.sha1(image_bytes).hexdigest()
+
+
+class ImageIndex:
+    """입력 키/내용 해시별 저장된 인포그래픽 경로 (여러 스레드에서 함께 사용 가능)"""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            data: image_index.json 내용 (형식이 다르거나 없으면 빈 인덱스)
+        """
+        data = data or {}
+        compatible = data.get('version') == IMAGE_INDEX_VERSION
+        self.inputs: Dict[str, Dict[str, str]] = dict(data.get('inputs', {})) if compatible else {}
+        self.blobs: Dict[str, str] = dict(data.get('blobs', {})) if compatible else {}
+        self.changed = False
+        self._lock = threading.Lock()
+
+    def find(self, key: str) -> Optional[str]:
+        """같은 입력으로 만든 인포그래픽 경로 (없으면 None)"""
+        with self._lock:
+            entry = self.inputs.get(key)
+        return entry['path'] if entry else None
+
+    def find_bytes(self, image_bytes: bytes) -> Optional[str]:
+        """내용이 똑같은 저장된 인포그래픽 경로 (없으면 None)"""
+        with self._lock:
+            return self.blobs.get(content_hash(image_bytes))
+
+    def add(self, key: str, image_bytes: bytes, path: str) -> None:
+        """저장을 마친(또는 재사용한) 인포그래픽 등록"""
+        sha1 = content_hash(image_bytes)
+        with self._lock:
+            self.blobs.setdefault(sha1, path)
+            self.inputs[key] = {'path': self.blobs[sha1], 'sha1': sha1}
+            self.changed = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'version': IMAGE_INDEX_VERSION, 'inputs': dict(self.inputs), 'blobs': dict(self.blobs)}
@@ -0,0 +1,168 @@
+"""
+기사별 AI 분석 (배치 구조화 출력)
+
+기사마다 API를 호출하는 대신, 여러 기사를 한 번에 보내고
+기사 ID를 키로 하는 JSON 배열로 기사별 분석을 받습니다.
+
+응답 형식:
+[
+    {"id": "3f2a9c1b7d", "insight": "..."},
+    ...
+]
+
+응답 검증:
+- 요청한 ID만 받아들이고 (모르는 ID/중복 ID는 버림)
+- insight가 비어 있거나 문자열이 아니면 버림
+- 빠진 기사는 분석 없이 저장되어 화면에서 요약으로 표시됨
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils_prompt import format_article, get_token_budget, rank_articles
+from utils_text import estimate_tokens, truncate_text
+
+
+ARTICLES_PER_CHUNK = 12      # 호출 한 번에 보낼 최대 기사 수 (응답 길이 제한)
+MAX_CHUNKS = 4               # 동시에 보낼 최대 호출 수 (초과한 하위 순위 기사는 분석하지 않음)
+INSIGHT_MAX_CHARS = 300      # 기사별 분석 최대 글자 수
+INSIGHT_SUMMARY_CHARS = 400  # 프롬프트에 넣을 기사 요약 최대 글자 수
+
+INSIGHT_PROMPT_TEMPLATE = """다음 IT 뉴스 기사 각각을 IT 전문가 관점에서 분석해주세요.
+
+{articles_text}
+
+각 기사마다 핵심 내용과 업계에 주는 의미를 2~3문장(최대 200자)으로 작성하세요.
+요약을 그대로 옮기지 말고, 왜 중요한지를 설명해주세요.
+
+다음 JSON 배열 형식으로 응답해주세요 (id는 위 기사의 ID를 그대로 사용):
+[
+    {{"id": "기사 ID", "insight": "기사별 분석"}}
+]
+
+반드시 유효한 JSON 배열로만 응답해주세요."""
+
+
+def article_id(news: Dict[str, Any]) -> str:
+    """기사 ID (링크 기준, 링크가 없으면 제목 기준)"""
+    key = news.get('link') or news.get('title', '')
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]
+
+
+def _format_insight_article(news: Dict[str, Any]) -> str:
+    return f"[ID: {article_id(news)}]\n{format_article(news, INSIGHT_SUMMARY_CHARS)}"
+
+
+def build_insight_chunks(news_list: List[Dict[str, Any]], model_name: str,
+                         token_budget: Optional[int] = None) -> List[Tuple[str, List[str]]]:
+    """
+    기사별 분석 요청을 토큰 예산 안에서 여러 호출로 나누기
+
+    이미 ai_analysis가 있는 기사(같은 날 이전 수집분)는 다시 분석하지 않습니다.
+    순위가 높은 기사부터 채우므로, MAX_CHUNKS를 넘는 하위 순위 기사는 제외됩니다.
+
+    Args:
+        news_list: 뉴스 리스트
+        model_name: 사용할 Gemini 모델 이름 (토큰 예산 결정)
+        token_budget: 호출당 프롬프트 토큰 예산 (기본값: MODEL_TOKEN_BUDGETS)
+
+    Returns:
+        list: (프롬프트, 포함된 기사 ID 목록) 목록
+    """
+    budget = max(0, get_token_budget(model_name, token_budget) - estimate_tokens(INSIGHT_PROMPT_TEMPLATE))
+    chunks: List[Tuple[List[str], List[str]]] = []
+    parts: List[str] = []
+    ids: List[str] = []
+    used = 0
+    seen = set()
+
+    for _, index in rank_articles(news_list):
+        news = news_list[index]
+        news_id = article_id(news)
+        if news.get('ai_analysis') or news_id in seen:
+            continue
+        seen.add(news_id)
+        text = _format_insight_article(news)
+        cost = estimate_tokens(text) + 1
+        if ids and (len(ids) >= ARTICLES_PER_CHUNK or used + cost > budget):
+            chunks.append((parts, ids))
+            parts, ids, used = [], [], 0
+            if len(chunks) >= MAX_CHUNKS:
+                break
+        if cost > budget:
+            continue
+        parts.append(text)
+        ids.append(news_id)
+        used += cost
+    else:
+        if ids:
+            chunks.append((parts, ids))
+
+    return [
+        (INSIGHT_PROMPT_TEMPLATE.format(articles_text="\n\n".join(chunk_parts)), chunk_ids)
+        for chunk_parts, chunk_ids in chunks
+    ]
+
+
+def build_insight_prompt(news_batch: List[Dict[str, Any]]) -> Tuple[str, List[str]]:
+    """
+    도착한 순서대로 모은 기사 묶음 하나의 기사별 분석 프롬프트 (스트리밍 파이프라인용)
+
+    Args:
+        news_batch: 기사 목록 (ARTICLES_PER_CHUNK개 이하)
+
+    Returns:
+        tuple: (프롬프트, 포함된 기사 ID 목록)
+    """
+    texts = [_format_insight_article(news) for news in news_batch]
+    ids = [article_id(news) for news in news_batch]
+    return INSIGHT_PROMPT_TEMPLATE.format(articles_text="\n\n".join(texts)), ids
+
+
+def _extract_json(response_text: str) -> str:
+    """마크다운 코드 블록 제거"""
+    text = response_text.strip()
+    if "```json" in text:
+        return text.split("```json")[1].split("```")[0].strip()
+    if "```" in text:
+        return text.split("```")[1].split("```")[0].strip()
+    return text
+
+
+def parse_insights(response_text: str, expected_ids: List[str]) -> Dict[str, str]:
+    """
+    기사별 분석 응답을 검증하고 {기사 ID: 분석} 으로 변환
+
+    Args:
+        response_text: 모델 응답 텍스트
+        expected_ids: 요청에 포함한 기사 ID 목록
+
+    Returns:
+        dict: 검증을 통과한 기사별 분석 (빠진 기사는 포함되지 않음)
+
+    Raises:
+        ValueError: 응답이 JSON 배열이 아닌 경우
+    """
+    try:
+        items = json.loads(_extract_json(response_text))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON 파싱 실패: {e}")
+    # {"articles": [...]} 처럼 한 번 감싼 응답도 허용
+    if isinstance(items, dict) and len(items) == 1:
+        items = next(iter(items.values()))
+    if not isinstance(items, list):
+        raise ValueError("응답이 JSON 배열이 아닙니다.")
+
+    expected = set(expected_ids)
+    insights: Dict[str, str] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        news_id = str(item.get('id', '')).strip()
+        insight = item.get('insight')
+        if news_id not in expected or news_id in insights:
+            continue
+        if not isinstance(insight, str) or not insight.strip():
+            continue
+        insights[news_id] = truncate_text(' '.join(insight.split()), INSIGHT_MAX_CHARS)
+    return insights
@@ -0,0 +1,62 @@
+"""
+저장소 JSON 직렬화 (orjson이 설치되어 있으면 사용, 없으면 표준 json)
+
+- 기계만 읽고 쓰는 파일 (news_data.json, 인덱스, 통계 등): 공백 없는 compact 형식
+- 사람이 직접 고치는 파일 (PRETTY_PATHS, 예: feeds.json): 들여쓰기 4칸
+  들여쓰기 형식은 항상 표준 json으로 만들어서 orjson 설치 여부와 관계없이 같은 내용이 됩니다.
+
+저장소 파일은 bytes로 주고받으므로 문자열로 바꾸지 않고 UTF-8 bytes를 그대로 만들고 읽습니다
+(큰 파일에서는 str ↔ bytes 변환이 인코딩 자체만큼 걸림).
+읽기는 형식과 관계없이 같으므로, 기존 들여쓰기 파일은 다음 저장 때 compact 형식으로 바뀝니다.
+파싱 오류는 두 방식 모두 json.JSONDecodeError로 처리할 수 있습니다 (orjson.JSONDecodeError는 하위 클래스).
+
+성능 비교: python bench_serialization.py
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+PRETTY_PATHS = frozenset({"data/feeds.json"})  # 사람이 직접 고치는 파일
+
+
+def dumps(data: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    UTF-8 JSON bytes로 변환 (한글 등은 이스케이프하지 않음)
+
+    Args:
+        data: 변환할 데이터
+        pretty: 들여쓰기 4칸 형식 (False면 공백 없는 compact 형식)
+        sort_keys: 키 정렬 (내용이 같으면 결과도 같도록)
+    """
+    if pretty:
+        return json.dumps(data, indent=4, ensure_ascii=False, sort_keys=sort_keys).encode('utf-8')
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            pass  # orjson이 지원하지 않는 값 (64비트를 넘는 정수 등)은 표준 json으로
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys).encode('utf-8')
+
+
+def loads(content: Union[str, bytes]) -> Any:
+    """
+    UTF-8 JSON bytes(또는 문자열)를 파싱
+
+    Raises:
+        json.JSONDecodeError: 형식이 잘못된 경우
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps_for_path(file_path: str, data: Any) -> bytes:
+    """저장소 파일 경로에 맞는 형식으로 변환 (PRETTY_PATHS만 들여쓰기)"""
+    return dumps(data, pretty=file_path in PRETTY_PATHS)
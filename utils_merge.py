@@ -0,0 +1,103 @@
+"""
+동시 저장 충돌 시 사용하는 3-way 병합 함수 (GithubDataHandler.save_json의 merge 인자)
+
+모든 병합 함수는 merge(base, local, remote) 형식입니다.
+- base: 이 세션이 load_json으로 읽었던 내용
+- local: 이 세션이 저장하려는 내용
+- remote: 그 사이 다른 세션이 먼저 저장한 현재 내용
+
+이 세션이 바꾼 부분(local != base)만 remote 위에 다시 적용합니다.
+"""
+from typing import Any, Callable, Dict, List
+
+MergeFunc = Callable[[Any, Any, Any], Any]
+
+_MISSING = object()
+
+
+def merge_value(base: Any, local: Any, remote: Any) -> Any:
+    """값 단위 병합: 이 세션이 바꿨으면 local, 아니면 remote"""
+    return remote if local == base else local
+
+
+def merge_keys(base: Dict[str, Any], local: Dict[str, Any], remote: Dict[str, Any], depth: int = 1) -> Dict[str, Any]:
+    """
+    키 단위 병합 (키 합집합, 이 세션이 바꾼 키는 local 값으로 교체, 이 세션이 지운 키는 삭제)
+
+    Args:
+        depth: 키 단위로 내려갈 깊이 (1이면 최상위 키의 값을 통째로 교체, 예: 날짜별 레코드)
+    """
+    if not isinstance(local, dict) or not isinstance(remote, dict):
+        return merge_value(base, local, remote)
+    base = base if isinstance(base, dict) else {}
+    merged = dict(remote)
+    for key in set(base) | set(local):
+        base_value = base.get(key, _MISSING)
+        local_value = local.get(key, _MISSING)
+        if local_value is _MISSING:
+            # 이 세션이 지운 키 (다른 세션이 그 사이 바꿨어도 삭제 의도를 따름)
+            merged.pop(key, None)
+        elif local_value == base_value:
+            continue
+        elif depth > 1 and key in remote and isinstance(local_value, dict):
+            merged[key] = merge_keys(base_value if base_value is not _MISSING else {},
+                                     local_value, remote[key], depth - 1)
+        else:
+            merged[key] = local_value
+    return merged
+
+
+def merge_counters(base: Dict[str, Any], local: Dict[str, Any], remote: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    카운터 병합 (숫자 값은 이 세션의 증감분을 remote에 더함, 나머지는 merge_value)
+
+    예: 두 세션이 동시에 visits를 10 → 11로 올리면 결과는 12
+    """
+    base = base if isinstance(base, dict) else {}
+    merged = dict(remote)
+    for key, local_value in local.items():
+        base_value = base.get(key)
+        remote_value = remote.get(key)
+        if _is_number(local_value) and _is_number(remote_value):
+            merged[key] = remote_value + local_value - (base_value if _is_number(base_value) else 0)
+        elif key not in remote:
+            merged[key] = local_value
+        else:
+            merged[key] = merge_value(base_value, local_value, remote_value)
+    return merged
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def merge_list(base: List[Any], local: List[Any], remote: List[Any]) -> List[Any]:
+    """목록 병합 (remote 순서 유지, 이 세션이 지운 항목은 제거, 추가한 항목은 뒤에 붙임)"""
+    base = base if isinstance(base, list) else []
+    removed = [item for item in base if item not in local]
+    merged = [item for item in remote if item not in removed]
+    merged.extend(item for item in local if item not in base and item not in merged)
+    return merged
+
+
+def merge_feeds(base: Dict[str, Any], local: Dict[str, Any], remote: Dict[str, Any]) -> Dict[str, Any]:
+    """feeds.json 병합 (urls는 목록 병합, health/groups는 피드/그룹별 교체, 삭제된 피드의 상태와 그룹 지정은 제거)"""
+    base = base if isinstance(base, dict) else {}
+    merged = merge_keys(base, local, remote, depth=2)
+    merged['urls'] = merge_list(base.get('urls', []), local.get('urls', []), remote.get('urls', []))
+    if isinstance(merged.get('health'), dict):
+        merged['health'] = {url: state for url, state in merged['health'].items() if url in merged['urls']}
+    if isinstance(merged.get('groups'), dict):
+        groups = {name: [url for url in urls if url in merged['urls']] for name, urls in merged['groups'].items()}
+        merged['groups'] = {name: urls for name, urls in groups.items() if urls}
+    return merged
+
+
+def merge_days(base: Dict[str, Any], local: Dict[str, Any], remote: Dict[str, Any]) -> Dict[str, Any]:
+    """news_data.json 병합 (날짜 단위 교체)"""
+    return merge_keys(base, local, remote, depth=1)
+
+
+def merge_nested_keys(base: Dict[str, Any], local: Dict[str, Any], remote: Dict[str, Any]) -> Dict[str, Any]:
+    """한 단계 아래 키 단위 병합 (예: story_index.json의 articles, archive/index.json의 months)"""
+    return merge_keys(base, local, remote, depth=2)
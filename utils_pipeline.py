@@ -0,0 +1,480 @@
+"""
+뉴스 수집 파이프라인 (수집 → 분석 → 인포그래픽 → 저장)
+
+Streamlit 대시보드와 헤드리스 CLI(collect.py)가 같은 파이프라인을 사용합니다.
+이 모듈은 Streamlit을 import하지 않습니다.
+
+단계는 겹쳐서 실행됩니다:
+- 피드는 동시에 내려받고, 도착하는 대로 중복 제거/관련 보도 연결 후 기사별 분석 묶음을 바로 보냄
+- 수집이 끝나면 전체 요약을 호출하고 (기사별 분석은 계속 진행 중)
+- 요약이 나오면 인포그래픽(대체 이미지 미리 렌더링 포함)을 남은 기사별 분석과 동시에 생성
+따라서 전체 시간은 단계 시간의 합보다 가장 긴 단계에 가깝습니다.
+
+피드 그룹(feeds.json의 groups)마다 브리핑(요약, 키워드, 인포그래픽)을 따로 만들며,
+그룹별 브리핑은 동시에 진행하되 Gemini 호출은 실행 전체가 하나의 CallBudget을 함께 씁니다.
+"""
+import datetime
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils_ai import (
+    ANALYSIS_DEADLINE, GEMINI_CALLS_PER_RUN, GEMINI_CONCURRENCY, InsightBatcher, failed_summary,
+    generate_infographic, init_gemini_model, iter_rss_news, summarize_news
+)
+from utils_digest import periods_for_dates, update_digests
+from utils_export import export_site
+from utils_feeds import DEFAULT_GROUP, feed_groups, group_label, group_slug, select_due_feeds
+from utils_github import image_to_bytes
+from utils_images import IMAGE_INDEX_PATH, ImageIndex, content_hash, infographic_key
+from utils_insights import ARTICLES_PER_CHUNK, article_id, build_insight_prompt
+from utils_merge import merge_days, merge_feeds, merge_nested_keys
+from utils_resilience import BackgroundTask, CallBudget, Deadline, stream
+from utils_schema import SCHEMA_VERSION, group_briefings, make_article, migrate_news_data
+from utils_story import STORY_INDEX_PATH, StoryIndex, link_related_stories
+
+
+FEEDS_PATH = "data/feeds.json"
+NEWS_DATA_PATH = "data/news_data.json"
+
+# 실행 결과 상태 (CLI 종료 코드와 대응)
+STATUS_OK = 'ok'
+STATUS_PARTIAL = 'partial'          # 저장은 되었지만 분석/인포그래픽 일부 실패
+STATUS_NO_FEEDS = 'no_feeds'
+STATUS_NO_NEWS = 'no_news'
+STATUS_SAVE_FAILED = 'save_failed'
+
+ProgressCallback = Callable[[str, int, str, str], None]
+
+
+def _noop_progress(step: str, percent: int, message: str, level: str = 'info'):
+    pass
+
+
+def image_path_for(date: datetime.date, group: str = DEFAULT_GROUP, image_bytes: Optional[bytes] = None) -> str:
+    """
+    년도/월별 폴더 구조의 인포그래픽 경로
+
+    image_bytes를 주면 파일 이름에 내용 해시 앞부분을 붙여서, 같은 날 다시 만든 인포그래픽이
+    이전 파일을 덮어쓰지 않게 합니다.
+
+    예: images/2025/12/2025-12-06.png (기본 그룹), images/2025/12/2025-12-06-global-tech.png (피드 그룹),
+        images/2025/12/2025-12-06-1a2b3c4d.png (내용 해시)
+    """
+    suffix = f"-{group_slug(group)}" if group != DEFAULT_GROUP else ""
+    if image_bytes is not None:
+        suffix += f"-{content_hash(image_bytes)[:8]}"
+    return f"images/{date.strftime('%Y')}/{date.strftime('%m')}/{date.strftime('%Y-%m-%d')}{suffix}.png"
+
+
+def _place_image(image_index: ImageIndex, key: str, image, date: datetime.date,
+                 group: str) -> Tuple[str, bytes, bool]:
+    """
+    새로 만든 인포그래픽의 저장 경로 (내용이 똑같은 파일이 이미 있으면 그 경로)
+
+    Returns:
+        tuple: (경로, PNG bytes, 새로 저장해야 하는지 여부)
+    """
+    image_bytes = image_to_bytes(image)
+    existing = image_index.find_bytes(image_bytes)
+    if existing:
+        return existing, image_bytes, False
+    return image_path_for(date, group, image_bytes), image_bytes, True
+
+
+def _carry_over_articles(news_list: List[Dict[str, Any]], day: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """이번에 건너뛴 피드의 기사는 같은 날 이미 수집된 기사로 유지 (이미 받은 기사별 분석 포함)"""
+    fetched_links = {news['link'] for news in news_list}
+    return news_list + [
+        {key: news.get(key, '') for key in ('title', 'link', 'summary', 'published', 'source', 'ai_analysis', 'related')}
+        for news in day.get('articles', []) if news.get('link') not in fetched_links
+    ]
+
+
+def _group_record(day: Dict[str, Any], group: str) -> Dict[str, Any]:
+    """날짜별 레코드에서 그룹의 브리핑 레코드 (기본 그룹은 최상위)"""
+    return day if group == DEFAULT_GROUP else day.get('groups', {}).get(group, {})
+
+
+def _store_group_record(day: Dict[str, Any], group: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """그룹의 브리핑 레코드를 날짜별 레코드에 반영한 새 레코드"""
+    if group == DEFAULT_GROUP:
+        updated = dict(record)
+        if day.get('groups'):
+            updated['groups'] = day['groups']
+    else:
+        updated = dict(day)
+        updated['groups'] = {**day.get('groups', {}), group: record}
+    updated['schema_version'] = SCHEMA_VERSION
+    return updated
+
+
+def _brief_group(news_list: List[Dict[str, Any]], batcher: Optional[InsightBatcher], model, model_name: str,
+                 deadline: Deadline, budget: CallBudget, gemini_key: str, imagen_key: Optional[str],
+                 with_infographic: bool, hedge_infographic: bool, init_error: Optional[str],
+                 image_index: ImageIndex) -> Dict[str, Any]:
+    """
+    그룹 하나의 브리핑 (전체 요약 → 인포그래픽을 남은 기사별 분석과 동시에 생성)
+
+    같은 요약/키워드로 만든 인포그래픽이 이미 저장되어 있으면 인포그래픽 생성을 건너뛰고 그 파일을 사용합니다.
+
+    Returns:
+        dict: result (브리핑 레코드, 실패 시 error 포함), image (PIL Image 또는 None),
+              image_key (인포그래픽 입력 키), reused_image (재사용한 인포그래픽 경로 또는 None),
+              image_error, timings
+    """
+    started = time.monotonic()
+    if model:
+        result = summarize_news(news_list, model, model_name, deadline, budget=budget)
+    else:
+        result = failed_summary(init_error)
+
+    # 인포그래픽은 요약과 키워드만 필요하므로 남은 기사별 분석과 동시에 실행
+    infographic_task = None
+    image_key = reused_image = None
+    if with_infographic and result.get('summary'):
+        image_key = infographic_key(result['summary'], result.get('keywords', []), bool(imagen_key))
+        reused_image = image_index.find(image_key)
+    if reused_image is None and image_key is not None:
+        infographic_started = time.monotonic()
+        infographic_task = BackgroundTask(
+            # 키워드도 함께 전달 (대체 방법에서 사용)
+            lambda: generate_infographic(gemini_key, result.get('summary', ''), imagen_key,
+                                         result.get('keywords', []), hedge_fallback=hedge_infographic,
+                                         budget=budget),
+            name="infographic"
+        )
+
+    insights = batcher.collect() if batcher else {}
+    result['articles'] = [
+        make_article(news, news.get('ai_analysis') or insights.get(article_id(news)))
+        for news in news_list
+    ]
+    timings = {'analyze': round(time.monotonic() - started, 2)}
+
+    image = image_error = None
+    if infographic_task:
+        try:
+            image = infographic_task.result()
+        except Exception as e:
+            image_error = str(e)
+        timings['infographic'] = round(time.monotonic() - infographic_started, 2)
+    return {'result': result, 'image': image, 'image_key': image_key, 'reused_image': reused_image,
+            'image_error': image_error, 'timings': timings}
+
+
+def rebrief_day(day: Dict[str, Any], date: datetime.date, model, model_name: str, budget: CallBudget,
+                gemini_key: str, imagen_key: Optional[str] = None, with_infographic: bool = True,
+                reanalyze_articles: bool = False, image_index: Optional[ImageIndex] = None) -> Dict[str, Any]:
+    """
+    저장된 기사로 날짜 하나의 브리핑(그룹별 요약, 인포그래픽)을 다시 생성 (백필용, 수집/저장 없음)
+
+    요약에 실패한 그룹은 기존 브리핑을 그대로 둡니다.
+
+    Args:
+        day: 날짜별 레코드 (수정하지 않음)
+        date: 날짜
+        model: genai.GenerativeModel 객체
+        model_name: 모델 이름
+        budget: 호출 예산 (동시 호출 수/속도 제한)
+        gemini_key: Google Gemini API 키
+        imagen_key: Imagen API 키 (선택적)
+        with_infographic: 인포그래픽 다시 생성 여부 (False면 기존 인포그래픽 유지)
+        reanalyze_articles: 기사별 분석도 다시 생성할지 여부
+        image_index: 인포그래픽 재사용 인덱스 (새로 저장할 인포그래픽이 등록되므로 images와 함께 저장)
+
+    Returns:
+        dict: day (새 날짜별 레코드), images ({새로 저장할 인포그래픽 경로: PNG bytes}), errors (오류 메시지 목록)
+    """
+    image_index = image_index if image_index is not None else ImageIndex()
+    new_day, images, errors = day, {}, []
+    deadline = Deadline(None)  # 속도 제한 대기가 길어질 수 있으므로 호출별 timeout만 적용
+    for group, record in group_briefings(day):
+        label = group_label(group)
+        news_list = _carry_over_articles([], record)
+        if reanalyze_articles:
+            for news in news_list:
+                news['ai_analysis'] = ''
+        batcher = InsightBatcher(model, model_name, deadline, budget=budget)
+        pending = [news for news in news_list if not news.get('ai_analysis')]
+        for i in range(0, len(pending), ARTICLES_PER_CHUNK):
+            batcher.submit(*build_insight_prompt(pending[i:i + ARTICLES_PER_CHUNK]))
+
+        outcome = _brief_group(news_list, batcher, model, model_name, deadline, budget,
+                               gemini_key, imagen_key, with_infographic, False, None, image_index)
+        result = outcome['result']
+        error = result.pop('error', None)
+        if error:
+            errors.append(f"AI 분석 실패 ({label}): {error}")
+            continue
+        if outcome['reused_image']:
+            result['image_path'] = outcome['reused_image']
+        elif outcome['image']:
+            image_path, image_bytes, is_new = _place_image(image_index, outcome['image_key'], outcome['image'],
+                                                           date, group)
+            if is_new:
+                images[image_path] = image_bytes
+            image_index.add(outcome['image_key'], image_bytes, image_path)
+            result['image_path'] = image_path
+        else:
+            if outcome['image_error']:
+                errors.append(f"인포그래픽 생성 오류 ({label}): {outcome['image_error']}")
+            if record.get('image_path'):
+                result['image_path'] = record['image_path']
+        new_day = _store_group_record(new_day, group, result)
+    return {'day': new_day, 'images': images, 'errors': errors}
+
+
+def run_collection(db, gemini_key: str, imagen_key: Optional[str] = None,
+                   force_all: bool = False, with_infographic: bool = True,
+                   hedge_infographic: bool = False,
+                   export: bool = True,
+                   site_url: Optional[str] = None,
+                   date: Optional[datetime.date] = None,
+                   on_progress: Optional[ProgressCallback] = None,
+                   digests: bool = True) -> Dict[str, Any]:
+    """
+    뉴스 수집 파이프라인 실행
+
+    이번에 수집한 기사가 없는 그룹은 같은 날 이미 만든 브리핑을 그대로 유지합니다.
+
+    Args:
+        db: GithubDataHandler
+        gemini_key: Google Gemini API 키
+        imagen_key: Imagen API 키 (선택적)
+        force_all: 수집 주기와 관계없이 모든 피드 수집
+        with_infographic: 인포그래픽 생성 여부
+        hedge_infographic: 대체 인포그래픽을 병렬로 렌더링하고 먼저 완성된 이미지 사용
+        export: 저장 후 정적 사이트(docs/) 내보내기 여부
+        site_url: 정적 사이트 주소 (JSON Feed의 절대 URL용, 선택적)
+        date: 저장할 날짜 (기본값: 오늘)
+        on_progress: 진행 상황 콜백 (단계, 진행률(0~100), 메시지, 수준['info'|'success'|'warning'|'error'])
+        digests: 저장 후 이번 주/이번 달 다이제스트 갱신 여부 (바뀐 단계만 다시 요약)
+
+    Returns:
+        dict: 실행 요약 (status, date, feeds_polled, articles_fetched, articles_total,
+              stories_linked, analysis_error, image_path, images_reused, groups, saved, digests, pages_exported,
+              errors, timings, elapsed)
+    """
+    progress = on_progress or _noop_progress
+    date = date or datetime.date.today()
+    date_str = date.strftime("%Y-%m-%d")
+    started = time.monotonic()
+    summary: Dict[str, Any] = {
+        'status': STATUS_OK,
+        'date': date_str,
+        'feeds_polled': 0,
+        'articles_fetched': 0,
+        'articles_total': 0,
+        'stories_linked': 0,
+        'analysis_error': None,
+        'image_path': None,
+        'images_reused': 0,
+        'groups': {},
+        'saved': False,
+        'digests': [],
+        'pages_exported': 0,
+        'errors': [],
+        'timings': {},
+    }
+
+    def finish(status: str) -> Dict[str, Any]:
+        summary['status'] = status
+        summary['elapsed'] = round(time.monotonic() - started, 2)
+        return summary
+
+    # 1. RSS 수집 (피드가 도착하는 대로 중복 제거 → 관련 보도 연결 → 기사별 분석 묶음 전송)
+    stage_started = time.monotonic()
+    feeds = db.load_json(FEEDS_PATH)
+    urls = feeds.get('urls', [])
+    if not urls:
+        return finish(STATUS_NO_FEEDS)
+    target_feeds = urls if force_all else select_due_feeds(feeds)
+    feed_group = {url: group for group, group_urls in feed_groups(feeds).items() for url in group_urls}
+    target_groups = list(dict.fromkeys(feed_group[url] for url in target_feeds))
+    summary['feeds_polled'] = len(target_feeds)
+    progress("1단계: 📡 RSS 피드에서 뉴스 수집 중...", 10,
+             f"RSS 피드 {len(target_feeds)}개를 확인하고 있습니다...", 'info')
+
+    news_data = db.load_json(NEWS_DATA_PATH)
+    migrate_news_data(news_data)
+    today = news_data.get(date_str, {})
+    stored = {news.get('link'): news for _, record in group_briefings(today) for news in record.get('articles', [])}
+    story_index = StoryIndex(db.load_json(STORY_INDEX_PATH))
+    story_index.prune(date_str)
+    image_index = ImageIndex(db.load_json(IMAGE_INDEX_PATH)) if with_infographic else ImageIndex()
+
+    # 모든 그룹이 Gemini 호출 예산을 함께 쓰고, 기사별 분석은 그룹별 요약과 인포그래픽 프롬프트 몫을 남겨둠
+    analysis_deadline = Deadline(ANALYSIS_DEADLINE)
+    budget = CallBudget(GEMINI_CALLS_PER_RUN, GEMINI_CONCURRENCY)
+    reserve = 2 * len(target_groups)
+    model = model_name = init_error = None
+    try:
+        model, model_name = init_gemini_model(gemini_key)
+    except Exception as e:
+        init_error = str(e)
+    states = {
+        group: {
+            'news': [],
+            'pending': [],
+            'batcher': InsightBatcher(model, model_name, analysis_deadline, budget=budget, reserve=reserve) if model else None,
+        }
+        for group in target_groups
+    }
+
+    seen = set()
+    arrived = 0
+    for url, items in iter_rss_news(target_feeds, feed_health=feeds.setdefault('health', {})):
+        arrived += 1
+        state = states[feed_group[url]]
+        fresh = []
+        for news in items:
+            news_id = article_id(news)
+            if news_id in seen:
+                continue
+            seen.add(news_id)
+            # 같은 날 이미 분석한 기사는 다시 분석하지 않음
+            if stored.get(news['link'], {}).get('ai_analysis'):
+                news['ai_analysis'] = stored[news['link']]['ai_analysis']
+            fresh.append(news)
+        state['news'].extend(fresh)
+        summary['stories_linked'] += link_related_stories(fresh, story_index, date_str)
+        state['pending'].extend(news for news in fresh if not news.get('ai_analysis'))
+        while state['batcher'] and len(state['pending']) >= ARTICLES_PER_CHUNK:
+            state['batcher'].submit(*build_insight_prompt(state['pending'][:ARTICLES_PER_CHUNK]))
+            state['pending'] = state['pending'][ARTICLES_PER_CHUNK:]
+        progress("1단계: 📡 RSS 피드에서 뉴스 수집 중...", 10 + 20 * arrived // max(1, len(target_feeds)),
+                 f"피드 {arrived}/{len(target_feeds)}개 도착 (기사 {len(seen)}개)", 'info')
+
+    if not db.save_json(FEEDS_PATH, feeds, "Update feed health", merge=merge_feeds):
+        summary['errors'].append("피드 상태 저장 실패")
+
+    # 새 기사가 없는 그룹은 기존 브리핑을 유지하고, 나머지는 같은 날 이전 수집분을 합쳐서 다시 브리핑
+    briefed = {}
+    for group, state in states.items():
+        fetched_count = len(state['news'])
+        summary['articles_fetched'] += fetched_count
+        if not fetched_count and _group_record(today, group).get('summary'):
+            continue
+        news_list = _carry_over_articles(state['news'], _group_record(today, group))
+        if not news_list:
+            continue
+        # 남은 기사 (이전 수집분 중 분석이 없는 기사 포함) 전송
+        pending = state['pending'] + [news for news in news_list[fetched_count:] if not news.get('ai_analysis')]
+        for i in range(0, len(pending), ARTICLES_PER_CHUNK) if state['batcher'] else ():
+            state['batcher'].submit(*build_insight_prompt(pending[i:i + ARTICLES_PER_CHUNK]))
+        briefed[group] = news_list
+    summary['articles_total'] = sum(len(record.get('articles', [])) for group, record in group_briefings(today)
+                                    if group not in briefed) + sum(len(news_list) for news_list in briefed.values())
+    summary['timings']['fetch'] = round(time.monotonic() - stage_started, 2)
+    progress("1단계: 📡 RSS 피드에서 뉴스 수집 중...", 30,
+             f"✅ {summary['articles_fetched']}개의 뉴스를 수집했습니다! (오늘 누적 {summary['articles_total']}개)", 'success')
+
+    if not briefed:
+        return finish(STATUS_NO_NEWS)
+
+    # 2~3. 그룹별 Gemini 분석 + 인포그래픽 (그룹끼리 동시에 진행)
+    stage_started = time.monotonic()
+    labels = ", ".join(group_label(group) for group in briefed)
+    progress("2단계: 🤖 AI가 뉴스를 분석하는 중...", 40,
+             f"{len(briefed)}개 그룹({labels})의 뉴스 {sum(map(len, briefed.values()))}개를 분석하고 있습니다. "
+             f"인포그래픽도 함께 생성합니다...", 'info')
+    tasks = {
+        group: (lambda group=group: _brief_group(
+            briefed[group], states[group]['batcher'], model, model_name, analysis_deadline, budget,
+            gemini_key, imagen_key, with_infographic, hedge_infographic, init_error, image_index))
+        for group in briefed
+    }
+    new_images = {}
+    day = today
+    done = 0
+    for group, outcome, error in stream(tasks, Deadline(None), max_workers=len(tasks)):
+        done += 1
+        label = group_label(group)
+        if error is not None:
+            outcome = {'result': failed_summary(error), 'image': None, 'reused_image': None, 'image_error': None,
+                       'timings': {}}
+            outcome['result']['articles'] = [make_article(news, news.get('ai_analysis')) for news in briefed[group]]
+        result = outcome['result']
+        group_summary = {'articles': len(result['articles']), 'analysis_error': result.pop('error', None),
+                         'image_path': None}
+        if group_summary['analysis_error']:
+            summary['analysis_error'] = summary['analysis_error'] or group_summary['analysis_error']
+            summary['errors'].append(f"AI 분석 실패 ({label}): {group_summary['analysis_error']}")
+        for stage, elapsed in outcome['timings'].items():
+            summary['timings'][stage] = max(summary['timings'].get(stage, 0), elapsed)
+
+        if outcome['image_error']:
+            summary['errors'].append(f"인포그래픽 생성 오류 ({label}): {outcome['image_error']}")
+        elif outcome['reused_image']:
+            # 같은 요약/키워드로 만든 인포그래픽이 이미 저장되어 있음 (3단계를 건너뜀)
+            result['image_path'] = group_summary['image_path'] = outcome['reused_image']
+            summary['image_path'] = summary['image_path'] or outcome['reused_image']
+            summary['images_reused'] += 1
+        elif outcome['image']:
+            image_path, image_bytes, is_new = _place_image(image_index, outcome['image_key'], outcome['image'],
+                                                           date, group)
+            if not is_new or db.save_image(image_path, image_bytes, f"Create infographic for {date_str} ({label})"):
+                image_index.add(outcome['image_key'], image_bytes, image_path)
+                result['image_path'] = image_path
+                if is_new:
+                    new_images[image_path] = image_bytes
+                else:
+                    summary['images_reused'] += 1
+                group_summary['image_path'] = image_path
+                summary['image_path'] = summary['image_path'] or image_path
+            else:
+                summary['errors'].append(f"인포그래픽 저장 실패 ({label})")
+
+        day = _store_group_record(day, group, result)
+        summary['groups'][label] = group_summary
+        status = "⚠️ 일부 실패" if group_summary['analysis_error'] else "✅ 완료"
+        progress("2단계: 🤖 AI가 뉴스를 분석하는 중...", 40 + 40 * done // len(tasks),
+                 f"{status}: {label} 브리핑 (기사 {group_summary['articles']}개"
+                 f"{', 인포그래픽 포함' if group_summary['image_path'] else ''}) [{done}/{len(tasks)}]",
+                 'warning' if group_summary['analysis_error'] else 'success')
+    summary['timings']['brief'] = round(time.monotonic() - stage_started, 2)
+
+    # 4. news_data.json에 날짜 Key로 저장
+    stage_started = time.monotonic()
+    progress("4단계: 💾 데이터를 저장하는 중...", 90, "GitHub에 데이터를 저장하고 있습니다...", 'info')
+    news_data[date_str] = day
+    summary['saved'] = db.save_json(NEWS_DATA_PATH, news_data, f"Update daily news for {date_str}", merge=merge_days)
+    summary['timings']['save'] = round(time.monotonic() - stage_started, 2)
+    summary['result'] = day
+    if not summary['saved']:
+        return finish(STATUS_SAVE_FAILED)
+    if not db.save_json(STORY_INDEX_PATH, story_index.to_dict(), f"Update story index for {date_str}",
+                        merge=merge_nested_keys):
+        summary['errors'].append("이야기 인덱스 저장 실패")
+    if image_index.changed and not db.save_json(IMAGE_INDEX_PATH, image_index.to_dict(),
+                                                f"Update image index for {date_str}", merge=merge_nested_keys):
+        summary['errors'].append("인포그래픽 인덱스 저장 실패")
+
+    # 4-1. 주간/월간 다이제스트 (저장된 날짜별 브리핑만 요약, 입력이 바뀐 주/달만 다시 요약)
+    if digests and model:
+        stage_started = time.monotonic()
+        progress("4단계: 💾 데이터를 저장하는 중...", 92, "이번 주와 이번 달 다이제스트를 갱신하고 있습니다...", 'info')
+        try:
+            weeks, months = periods_for_dates([date_str])
+            updated = update_digests(db, model, model_name, news_data, weeks, months, budget=budget)
+            summary['digests'] = updated['updated']
+            summary['errors'].extend(updated['errors'])
+        except Exception as e:
+            summary['errors'].append(f"다이제스트 갱신 오류: {e}")
+        summary['timings']['digest'] = round(time.monotonic() - stage_started, 2)
+
+    # 5. 정적 사이트 내보내기 (바뀐 페이지만 저장)
+    if export:
+        stage_started = time.monotonic()
+        progress("5단계: 🌐 정적 사이트 내보내는 중...", 95, "바뀐 페이지를 내보내고 있습니다...", 'info')
+        try:
+            exported = export_site(db, news_data, images=new_images, site_url=site_url)
+            summary['pages_exported'] = len(exported['written'])
+            if not exported['ok']:
+                summary['errors'].append("정적 사이트 일부 저장 실패")
+        except Exception as e:
+            summary['errors'].append(f"정적 사이트 내보내기 오류: {e}")
+        summary['timings']['export'] = round(time.monotonic() - stage_started, 2)
+
+    progress("✅ 완료!", 100, "모든 작업이 완료되었습니다!", 'success')
+    return finish(STATUS_PARTIAL if summary['errors'] else STATUS_OK)
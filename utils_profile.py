@@ -0,0 +1,297 @@
+"""
+선택적 프로파일링 (Streamlit 재실행, 수집 파이프라인)
+
+대시보드의 관리자 토글(세션별) 또는 NEWSROOM_PROFILE 환경 변수(1/true/yes, 프로세스 전체)로 켭니다.
+cProfile(결정적 프로파일러)로 측정하며, 측정 중 그 스레드가 시작한 작업자 스레드(피드 수집, Gemini 호출
+작업자, 인포그래픽 렌더링)도 스레드별로 측정해서 합칩니다. 같은 스레드에서 측정을 겹쳐 시작하면
+바깥 측정은 안쪽 측정이 끝날 때까지 멈춥니다 (예: 재실행 측정 중 수집 버튼).
+
+- 재실행 프로파일: 서버 프로세스 메모리에 최근 MAX_RECENT_PROFILES개만 보관 (재실행마다 커밋하지 않음)
+- 수집 프로파일: data/profiles/에 저장 (collect.py처럼 다른 프로세스에서 실행해도 대시보드에서 조회)
+  요약은 index.json에, 원본(pstats 형식, gzip 압축)은 슬롯 파일 MAX_SAVED_PROFILES개를 돌려 씁니다.
+
+내려받은 원본은 `python -m pstats profile.prof` 또는 snakeviz 등으로 열 수 있습니다.
+"""
+import collections
+import cProfile
+import datetime
+import gzip
+import hashlib
+import marshal
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from utils_merge import merge_nested_keys
+from utils_resilience import set_thread_hook
+
+
+PROFILE_ENV = "NEWSROOM_PROFILE"
+PROFILE_DIR = "data/profiles"
+PROFILE_INDEX_PATH = f"{PROFILE_DIR}/index.json"
+TOP_N = 25                  # 요약에 남길 함수 수
+MAX_RECENT_PROFILES = 20    # 메모리에 보관할 최근 프로파일 수
+MAX_SAVED_PROFILES = 10     # 저장소에 보관할 프로파일 수 (원본 슬롯 파일 수)
+WORKER_WAIT = 1.0           # 측정을 끝낼 때 실행 중인 작업자 스레드를 기다리는 최대 시간 (초)
+
+_active = threading.local()
+_recent = collections.deque(maxlen=MAX_RECENT_PROFILES)
+_recent_lock = threading.Lock()
+
+
+def profiling_enabled(session_flag: bool = False) -> bool:
+    """관리자 토글이 켜져 있거나 NEWSROOM_PROFILE 환경 변수가 설정되어 있으면 True"""
+    return session_flag or os.environ.get(PROFILE_ENV, '').strip().lower() in ('1', 'true', 'yes')
+
+
+def _function_label(func) -> str:
+    """pstats 함수 키 (파일, 줄, 이름)를 읽기 쉬운 문자열로"""
+    filename, line, name = func
+    if filename == '~':
+        return name  # 내장 함수
+    parts = filename.replace('\\', '/').split('/')
+    return f"{'/'.join(parts[-2:])}:{line}({name})"
+
+
+def _top_rows(stats: pstats.Stats, sort_index: int, top_n: int) -> List[Dict[str, Any]]:
+    """
+    가장 오래 걸린 함수 목록
+
+    Args:
+        sort_index: 2 = 자체 시간(tottime), 3 = 누적 시간(cumtime)
+    """
+    items = sorted(stats.stats.items(), key=lambda item: item[1][sort_index], reverse=True)[:top_n]
+    return [
+        {'function': _function_label(func), 'calls': nc, 'self': round(tt, 4), 'cumulative': round(ct, 4)}
+        for func, (cc, nc, tt, ct, callers) in items
+    ]
+
+
+class Profiler:
+    """
+    cProfile 측정 하나 (start → stop)
+
+    측정을 시작한 스레드와, 측정하는 동안 그 스레드가 utils_resilience로 시작한 작업자 스레드(와 그 작업자가
+    다시 시작한 스레드)만 측정합니다. 작업자 스레드는 작업마다 별도의 cProfile로 측정해서 작업이 끝나면
+    그 스레드에서 멈추고 stop에서 합칩니다. 프로세스 전체 훅을 쓰지 않으므로 다른 세션의 스레드에는
+    영향이 없습니다.
+    """
+
+    def __init__(self, label: str, kind: str = 'rerun'):
+        """
+        Args:
+            label: 표시할 이름 (예: "재실행 (뉴스룸)")
+            kind: 'rerun' 또는 'collection'
+        """
+        self.label = label
+        self.kind = kind
+        self._profile = cProfile.Profile()
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._running = 0           # 측정 중인 작업자 스레드 수
+        self._stopped = False
+        self._lock = threading.Condition()
+        self._outer: Optional['Profiler'] = None
+        self._previous_hook = None
+        self._started = None
+        self._start_time = 0.0
+        self._enabled = False
+
+    def _wrap_worker(self, target):
+        """작업자 스레드의 실행 함수를 감싸서 그 스레드도 측정 (utils_resilience.set_thread_hook의 훅)"""
+        def run(*args):
+            with self._lock:
+                if self._stopped:
+                    profile = None
+                else:
+                    profile = cProfile.Profile()
+                    try:
+                        profile.enable()
+                        self._running += 1
+                    except ValueError:
+                        # Python 3.12+는 프로파일러 하나가 모든 스레드를 측정하므로 스레드별 측정이 필요 없음
+                        profile = None
+            if profile is None:
+                return target(*args)
+            previous = set_thread_hook(self._wrap_worker)
+            try:
+                return target(*args)
+            finally:
+                # 측정을 켠 스레드에서 멈춤 (다른 스레드에서는 이 스레드의 프로파일러를 멈출 수 없음)
+                profile.disable()
+                set_thread_hook(previous)
+                with self._lock:
+                    self._running -= 1
+                    if not self._stopped:
+                        self._thread_profiles.append(profile)
+                    self._lock.notify_all()
+        return run
+
+    def start(self) -> 'Profiler':
+        """
+        측정 시작
+
+        Python 3.12+에서 다른 스레드(다른 세션)가 이미 측정 중이면 프로파일러를 켤 수 없으므로
+        측정하지 않고 넘어갑니다 (stop은 빈 레코드 반환).
+        """
+        # 같은 스레드에서 이미 측정 중이면 멈춤 (한 스레드에는 프로파일러 하나만 설정 가능)
+        self._outer = getattr(_active, 'profiler', None)
+        if self._outer is not None:
+            self._outer._profile.disable()
+        _active.profiler = self
+        self._started = datetime.datetime.now()
+        self._start_time = time.perf_counter()
+        self._previous_hook = set_thread_hook(self._wrap_worker)
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Python 3.12+: 프로세스에 프로파일러는 하나만 켤 수 있음 → 원래대로 되돌리고 측정 생략
+            self._restore()
+            return self
+        self._enabled = True
+        return self
+
+    def _restore(self) -> None:
+        """start 이전 상태로 되돌림 (작업자 스레드 훅, 바깥 측정)"""
+        set_thread_hook(self._previous_hook)
+        _active.profiler = self._outer
+        if self._outer is not None:
+            self._outer._profile.enable()
+
+    def stop(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """
+        측정을 끝내고 프로파일 레코드 반환
+
+        아직 실행 중인 작업자 스레드는 WORKER_WAIT초까지 기다리고, 그 뒤에 끝나는 작업자의 측정은 버립니다.
+
+        Args:
+            label: 시작할 때 정한 이름 대신 사용할 이름
+
+        Returns:
+            dict: id, label, kind, started, elapsed, threads, total_calls,
+                  top_self/top_cumulative (함수별 호출 수/자체 시간/누적 시간), raw (gzip 압축된 pstats 원본)
+                  — 측정을 시작하지 못했으면 빈 dict
+        """
+        if not self._enabled:
+            return {}
+        self._enabled = False
+        self._profile.disable()
+        elapsed = time.perf_counter() - self._start_time
+        set_thread_hook(self._previous_hook)
+
+        with self._lock:
+            # 결과를 넘긴 직후 정리 중인 작업자도 포함되도록 잠시 기다림
+            self._lock.wait_for(lambda: self._running == 0, timeout=WORKER_WAIT)
+            self._stopped = True
+            thread_profiles = list(self._thread_profiles)
+        stats = pstats.Stats(self._profile)
+        for profile in thread_profiles:
+            stats.add(profile)
+
+        raw = gzip.compress(marshal.dumps(stats.stats), mtime=0)
+        record = {
+            'id': f"{self._started:%Y%m%d-%H%M%S}-{hashlib.sha1(raw).hexdigest()[:6]}",
+            'label': label or self.label,
+            'kind': self.kind,
+            'started': self._started.isoformat(timespec='seconds'),
+            'elapsed': round(elapsed, 3),
+            'threads': len(thread_profiles) + 1,
+            'total_calls': stats.total_calls,
+            'top_self': _top_rows(stats, 2, TOP_N),
+            'top_cumulative': _top_rows(stats, 3, TOP_N),
+            'raw': raw,
+        }
+
+        # 정리가 끝난 뒤에 바깥 측정을 다시 시작 (다른 프로파일을 정리하면 이 스레드의 프로파일러가 해제됨)
+        _active.profiler = self._outer
+        if self._outer is not None:
+            self._outer._profile.enable()
+        return record
+
+
+@contextmanager
+def profiled(label: str, enabled: bool = True, kind: str = 'collection'):
+    """
+    with 블록을 측정 (enabled가 False면 아무것도 하지 않음)
+
+    블록이 끝나면 yield한 dict에 프로파일 레코드(Profiler.stop 반환값)가 채워집니다.
+
+    사용 예:
+        with profiled("수집", enabled=profiling_enabled()) as profile:
+            run_collection(...)
+        if profile:
+            save_profile(db, profile)
+    """
+    record: Dict[str, Any] = {}
+    if not enabled:
+        yield record
+        return
+    profiler = Profiler(label, kind).start()
+    try:
+        yield record
+    finally:
+        record.update(profiler.stop())
+
+
+def remember_profile(record: Dict[str, Any]) -> None:
+    """프로파일을 서버 프로세스 메모리에 보관 (대시보드의 최근 프로파일 목록, 빈 레코드는 무시)"""
+    if not record:
+        return
+    with _recent_lock:
+        _recent.append(record)
+
+
+def recent_profiles() -> List[Dict[str, Any]]:
+    """메모리에 보관된 최근 프로파일 (최신순)"""
+    with _recent_lock:
+        return list(reversed(_recent))
+
+
+def save_profile(db, record: Dict[str, Any]) -> bool:
+    """
+    프로파일을 저장소에 저장 (원본은 슬롯 파일, 요약은 index.json)
+
+    오래된 프로파일부터 지우고 빈 슬롯을 사용하므로 저장소에는 최대 MAX_SAVED_PROFILES개만 남습니다.
+
+    Returns:
+        bool: 성공 여부
+    """
+    index = db.load_json(PROFILE_INDEX_PATH)
+    profiles = index.setdefault('profiles', {})
+    ordered = sorted(profiles, key=lambda key: profiles[key].get('started', ''))
+    for profile_id in ordered[:max(0, len(ordered) - (MAX_SAVED_PROFILES - 1))]:
+        del profiles[profile_id]
+    used = {entry.get('path') for entry in profiles.values()}
+    path = next(f"{PROFILE_DIR}/slot-{slot}.prof.gz" for slot in range(MAX_SAVED_PROFILES)
+                if f"{PROFILE_DIR}/slot-{slot}.prof.gz" not in used)
+
+    raw = record['raw']
+    if not db.save_bytes(path, raw, f"Save profile {record['id']}"):
+        return False
+    entry = {key: value for key, value in record.items() if key != 'raw'}
+    entry.update({'path': path, 'sha1': hashlib.sha1(raw).hexdigest()})
+    profiles[record['id']] = entry
+    return db.save_json(PROFILE_INDEX_PATH, index, f"Add profile {record['id']}", merge=merge_nested_keys)
+
+
+def saved_profiles(db) -> List[Dict[str, Any]]:
+    """저장소에 저장된 프로파일 요약 (최신순)"""
+    profiles = db.load_json(PROFILE_INDEX_PATH).get('profiles', {})
+    return sorted(profiles.values(), key=lambda entry: entry.get('started', ''), reverse=True)
+
+
+def load_profile_raw(db, entry: Dict[str, Any]) -> Optional[bytes]:
+    """
+    프로파일 원본 (pstats 형식, 압축 해제)
+
+    Returns:
+        bytes: 원본 또는 None (파일이 없거나 슬롯이 더 새로운 프로파일로 덮어써진 경우)
+    """
+    raw = entry.get('raw')
+    if raw is None:
+        raw = db.load_bytes(entry['path']) if entry.get('path') else None
+        if raw is None or hashlib.sha1(raw).hexdigest() != entry.get('sha1'):
+            return None
+    return gzip.decompress(raw)
@@ -0,0 +1,248 @@
+"""
+기사 순위 매기기 및 토큰 예산 기반 프롬프트 구성
+"""
+import datetime
+import email.utils
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from utils_text import estimate_tokens, truncate_text
+
+
+# 모델별 프롬프트 입력 토큰 예산 (응답/비용/지연 시간을 고려한 값이며 컨텍스트 한도보다 작게 잡음)
+MODEL_TOKEN_BUDGETS = {
+    'gemini-2.5-flash': 16000,
+    'gemini-2.0-flash': 12000,
+    'gemini-2.0-flash-exp': 12000,
+    'gemini-1.0-pro': 6000,
+}
+DEFAULT_TOKEN_BUDGET = 6000
+
+# 출처별 가중치 (도메인 기준, 없으면 1.0)
+SOURCE_WEIGHTS: Dict[str, float] = {}
+
+ARTICLE_SUMMARY_CHARS = 300   # 프롬프트에 넣을 기사 요약 최대 글자 수
+ONGOING_SUMMARY_CHARS = 80    # 이전 날짜에 이미 다룬 이야기(related가 있는 기사)의 요약 최대 글자 수
+RECENCY_HALF_LIFE_HOURS = 24  # 최신성 점수가 절반이 되는 시간
+RANK_WEIGHTS = {'recency': 1.0, 'coverage': 1.5, 'source': 0.5}
+
+ANALYSIS_PROMPT_TEMPLATE = """다음 IT 뉴스들을 IT 전문가 관점에서 분석해주세요.
+
+{news_text}
+
+다음 JSON 형식으로 응답해주세요:
+{{
+    "summary": "전체 뉴스를 종합한 3줄 요약",
+    "keywords": ["키워드1", "키워드2", "키워드3"],
+    "trends": "주요 트렌드나 인사이트"
+}}
+
+반드시 유효한 JSON 형식으로만 응답해주세요."""
+
+_TITLE_TOKENS = re.compile(r'[0-9a-z가-힣]{2,}')
+
+
+def get_token_budget(model_name: str, token_budget: Optional[int] = None) -> int:
+    """모델의 프롬프트 토큰 예산 (token_budget을 주면 그 값을 우선 사용)"""
+    if token_budget:
+        return token_budget
+    return MODEL_TOKEN_BUDGETS.get(model_name, DEFAULT_TOKEN_BUDGET)
+
+
+def parse_published(value: str) -> Optional[datetime.datetime]:
+    """RSS 발행일 문자열(RFC 822 또는 ISO 형식)을 UTC datetime으로 변환"""
+    if not value:
+        return None
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
+
+
+def _source_of(news: Dict[str, Any]) -> str:
+    return news.get('source') or urlparse(news.get('link', '')).netloc
+
+
+def _title_tokens(title: str) -> set:
+    return set(_TITLE_TOKENS.findall(title.lower()))
+
+
+def rank_articles(news_list: List[Dict[str, Any]],
+                  now: Optional[datetime.datetime] = None) -> List[Tuple[float, int]]:
+    """
+    기사 중요도 점수 계산
+
+    - 최신성: 발행 후 경과 시간에 따라 지수적으로 감소
+    - 교차 보도: 다른 출처에서 비슷한 제목의 기사가 많을수록 높음
+    - 출처 가중치: SOURCE_WEIGHTS
+
+    Args:
+        news_list: 뉴스 리스트
+        now: 기준 시각 (기본값: 현재 UTC 시각)
+
+    Returns:
+        list: (점수, 원래 인덱스) 목록, 점수 내림차순
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    sources = [_source_of(news) for news in news_list]
+    tokens = [_title_tokens(news.get('title', '')) for news in news_list]
+
+    recencies = []
+    for news in news_list:
+        published = parse_published(news.get('published', ''))
+        if published is None:
+            recencies.append(None)
+        else:
+            age_hours = max(0.0, (now - published).total_seconds() / 3600)
+            recencies.append(math.pow(0.5, age_hours / RECENCY_HALF_LIFE_HOURS))
+    # 발행일이 없는 기사는 다른 기사들의 평균 최신성으로 취급
+    known = [r for r in recencies if r is not None]
+    default_recency = sum(known) / len(known) if known else 0.5
+
+    scores = []
+    for i, news in enumerate(news_list):
+        recency = default_recency if recencies[i] is None else recencies[i]
+
+        # 다른 출처의 비슷한 기사 수 (제목 토큰 Jaccard 유사도 기준)
+        covering_sources = set()
+        for j, other in enumerate(tokens):
+            if j == i or sources[j] == sources[i] or not tokens[i] or not other:
+                continue
+            if len(tokens[i] & other) / len(tokens[i] | other) >= 0.25:
+                covering_sources.add(sources[j])
+        coverage = 1 - 1 / (1 + len(covering_sources))
+
+        source_weight = SOURCE_WEIGHTS.get(sources[i], 1.0)
+        score = (RANK_WEIGHTS['recency'] * recency
+                 + RANK_WEIGHTS['coverage'] * coverage
+                 + RANK_WEIGHTS['source'] * source_weight)
+        scores.append((score, i))
+
+    scores.sort(key=lambda item: (-item[0], item[1]))
+    return scores
+
+
+def format_article(news: Dict[str, Any], summary_chars: int = ARTICLE_SUMMARY_CHARS) -> str:
+    """
+    프롬프트에 들어갈 기사 한 건의 텍스트
+
+    이전 날짜에 이미 다룬 이야기는 요약을 줄이고 첫 보도 날짜를 표시해서
+    모델이 새로운 전개에 집중하도록 합니다.
+    """
+    title = news.get('title', '제목 없음')
+    summary = str(news.get('summary', ''))
+    related = news.get('related')
+    if related:
+        summary_chars = min(summary_chars, ONGOING_SUMMARY_CHARS)
+    text = f"제목: {title}"
+    if summary_chars > 0 and summary:
+        text += f"\n요약: {truncate_text(summary, summary_chars)}"
+    if related:
+        text += f"\n이어지는 이야기 (첫 보도: {min(item['date'] for item in related)})"
+    return text
+
+
+def pack_articles(news_list: List[Dict[str, Any]], token_budget: int,
+                  summary_chars: int = ARTICLE_SUMMARY_CHARS) -> Tuple[str, List[int]]:
+    """
+    순위가 높은 기사부터 토큰 예산 안에 들어가도록 채우기
+
+    예산이 부족하면 요약 없이 제목만 넣고, 제목도 들어가지 않으면 멈춥니다.
+
+    Args:
+        news_list: 뉴스 리스트
+        token_budget: 기사 텍스트에 쓸 수 있는 토큰 수
+        summary_chars: 기사당 요약 최대 글자 수
+
+    Returns:
+        tuple: (기사 텍스트, 포함된 기사의 원래 인덱스 목록)
+    """
+    parts = []
+    included = []
+    used = 0
+    for _, index in rank_articles(news_list):
+        for chars in (summary_chars, 0):
+            text = format_article(news_list[index], chars)
+            cost = estimate_tokens(text) + 1
+            if used + cost <= token_budget:
+                parts.append(text)
+                included.append(index)
+                used += cost
+                break
+        else:
+            break
+    return "\n\n".join(parts), included
+
+
+def format_cluster(news_list: List[Dict[str, Any]], cluster: List[int],
+                   summary_chars: int = ARTICLE_SUMMARY_CHARS) -> str:
+    """프롬프트에 들어갈 주제 한 건의 텍스트 (대표 기사 + 관련 보도 수)"""
+    text = format_article(news_list[cluster[0]], summary_chars)
+    if len(cluster) > 1:
+        sources = sorted({_source_of(news_list[i]) for i in cluster if _source_of(news_list[i])})
+        text += f"\n관련 보도: {len(cluster)}건"
+        if sources:
+            text += f" ({', '.join(sources)})"
+    return text
+
+
+def pack_clusters(news_list: List[Dict[str, Any]], clusters: List[List[int]], token_budget: int,
+                  summary_chars: int = ARTICLE_SUMMARY_CHARS) -> Tuple[str, List[int]]:
+    """
+    주제별 대표 기사만 토큰 예산 안에 들어가도록 채우기 (pack_articles의 주제 버전)
+
+    Args:
+        news_list: 뉴스 리스트
+        clusters: 주제별 기사 인덱스 목록 (첫 항목이 대표 기사, 중요한 주제부터)
+        token_budget: 기사 텍스트에 쓸 수 있는 토큰 수
+        summary_chars: 대표 기사당 요약 최대 글자 수
+
+    Returns:
+        tuple: (기사 텍스트, 포함된 주제에 속한 기사의 원래 인덱스 목록)
+    """
+    parts = []
+    included = []
+    used = 0
+    for cluster in clusters:
+        for chars in (summary_chars, 0):
+            text = format_cluster(news_list, cluster, chars)
+            cost = estimate_tokens(text) + 1
+            if used + cost <= token_budget:
+                parts.append(text)
+                included.extend(cluster)
+                used += cost
+                break
+        else:
+            break
+    return "\n\n".join(parts), included
+
+
+def build_analysis_prompt(news_list: List[Dict[str, Any]], model_name: str,
+                          token_budget: Optional[int] = None,
+                          clusters: Optional[List[List[int]]] = None) -> Tuple[str, List[int]]:
+    """
+    전체 분석용 프롬프트 생성
+
+    Args:
+        news_list: 뉴스 리스트
+        model_name: 사용할 Gemini 모델 이름 (토큰 예산 결정)
+        token_budget: 프롬프트 전체 토큰 예산 (기본값: MODEL_TOKEN_BUDGETS)
+        clusters: 주제별 기사 인덱스 목록 (주면 주제별 대표 기사만 포함)
+
+    Returns:
+        tuple: (프롬프트, 포함된 기사의 원래 인덱스 목록)
+    """
+    budget = max(0, get_token_budget(model_name, token_budget) - estimate_tokens(ANALYSIS_PROMPT_TEMPLATE))
+    if clusters:
+        news_text, included = pack_clusters(news_list, clusters, budget)
+    else:
+        news_text, included = pack_articles(news_list, budget)
+    return ANALYSIS_PROMPT_TEMPLATE.format(news_text=news_text), included
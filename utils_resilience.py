@@ -0,0 +1,562 @@
+"""
+외부 호출(RSS 피드, Gemini API)을 위한 공통 복원력 계층
+
+- Deadline: 실행 단위의 마감 시간 (각 호출의 timeout을 남은 시간으로 제한)
+- retry_call: 일시적 오류에 대한 지터 포함 지수 백오프 재시도
+- CircuitBreaker: 계속 실패하는 피드/모델을 쿨다운 동안 건너뛰기
+- race / gather: 마감 시간 안에서 여러 호출을 동시에 실행
+- stream / BackgroundTask: 끝나는 순서대로 결과를 받거나, 다른 단계와 겹쳐서 실행
+- CallBudget: 여러 작업(예: 피드 그룹별 브리핑)이 함께 쓰는 동시 호출 수/총 호출 수 제한
+"""
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+
+class DeadlineExceeded(Exception):
+    """마감 시간이 지나 더 이상 호출을 시도할 수 없을 때 발생"""
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 호출을 건너뛸 때 발생"""
+
+
+class BudgetExhausted(Exception):
+    """실행 단위의 호출 예산을 다 써서 호출을 건너뛸 때 발생"""
+
+
+class Deadline:
+    """실행 단위의 마감 시간"""
+
+    def __init__(self, seconds: Optional[float]):
+        """
+        Args:
+            seconds: 지금부터 허용되는 최대 시간 (None이면 무제한)
+        """
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """남은 시간 (초). 무제한이면 inf"""
+        if self.expires_at is None:
+            return float('inf')
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float) -> float:
+        """
+        개별 호출에 사용할 timeout 계산
+
+        Args:
+            cap: 호출당 최대 timeout (초)
+
+        Returns:
+            float: cap과 남은 시간 중 작은 값
+
+        Raises:
+            DeadlineExceeded: 이미 마감 시간이 지난 경우
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("마감 시간이 지났습니다.")
+        return min(cap, remaining)
+
+
+# 재시도할 가치가 있는 google.api_core 예외 이름 (라이브러리 import 없이 이름으로 판별)
+_TRANSIENT_ERROR_NAMES = {
+    'ServiceUnavailable',
+    'ResourceExhausted',
+    'TooManyRequests',
+    'InternalServerError',
+    'DeadlineExceeded',
+    'GatewayTimeout',
+    'Aborted',
+    'Timeout',
+    'ConnectTimeout',
+    'ReadTimeout',
+    'ConnectionError',
+    'ChunkedEncodingError',
+}
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    일시적인 오류(타임아웃, 연결 오류, 429/5xx)인지 판별
+
+    Args:
+        exc: 발생한 예외
+
+    Returns:
+        bool: 재시도하면 성공할 가능성이 있는 오류이면 True
+    """
+    if isinstance(exc, (DeadlineExceeded, CircuitOpenError, BudgetExhausted)):
+        return False
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    if type(exc).__name__ in _TRANSIENT_ERROR_NAMES:
+        return True
+
+    # requests.HTTPError 등 응답 코드가 있는 예외
+    response = getattr(exc, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(exc, 'code', None)
+    if isinstance(status, int):
+        return status == 429 or 500 <= status < 600
+    return False
+
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 8.0) -> float:
+    """
+    지터 포함 지수 백오프 대기 시간 (full jitter)
+
+    Args:
+        attempt: 0부터 시작하는 재시도 횟수
+        base_delay: 첫 재시도 기준 대기 시간 (초)
+        max_delay: 최대 대기 시간 (초)
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def retry_call(func: Callable[..., Any], *args,
+               attempts: int = 3,
+               base_delay: float = 1.0,
+               max_delay: float = 8.0,
+               deadline: Optional[Deadline] = None,
+               retry_on: Callable[[BaseException], bool] = is_transient_error,
+               **kwargs) -> Any:
+    """
+    일시적 오류에 대해 지수 백오프로 재시도하며 함수 호출
+
+    Args:
+        func: 호출할 함수
+        attempts: 최대 시도 횟수
+        base_delay: 백오프 기준 대기 시간 (초)
+        max_delay: 백오프 최대 대기 시간 (초)
+        deadline: 전체 마감 시간 (대기 시간이 남은 시간을 넘으면 재시도하지 않음)
+        retry_on: 재시도 여부를 판별하는 함수
+
+    Returns:
+        func의 반환값
+
+    Raises:
+        마지막 시도에서 발생한 예외, 또는 DeadlineExceeded
+    """
+    for attempt in range(attempts):
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded("마감 시간이 지나 재시도를 중단합니다.")
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == attempts - 1 or not retry_on(e):
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            if deadline is not None and delay >= deadline.remaining():
+                raise
+            time.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 임계값에 도달하면 쿨다운 동안 호출을 차단하는 서킷 브레이커
+
+    - closed: 정상 호출
+    - open: 쿨다운 동안 호출 차단
+    - half-open: 쿨다운 후 한 번의 시험 호출 허용 (성공하면 closed, 실패하면 다시 open)
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown: float = 300.0):
+        """
+        Args:
+            name: 대상 이름 (예: "feed:https://...", "gemini:gemini-2.0-flash")
+            failure_threshold: 차단까지 허용되는 연속 실패 횟수
+            cooldown: 차단 유지 시간 (초)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """호출을 시도해도 되는지 확인 (half-open에서는 한 번만 허용)"""
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        브레이커 상태를 확인하고 함수 호출 (결과에 따라 상태 갱신)
+
+        Raises:
+            CircuitOpenError: 브레이커가 열려 있는 경우
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} 호출이 일시 차단되었습니다 (연속 실패 {self.failures}회).")
+        try:
+            result = func(*args, **kwargs)
+        except DeadlineExceeded:
+            # 대상의 문제가 아니라 실행 시간이 부족한 것이므로 실패로 기록하지 않음
+            with self._lock:
+                self._trial_in_flight = False
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str, failure_threshold: int = 3, cooldown: float = 300.0) -> CircuitBreaker:
+    """
+    이름별 서킷 브레이커 반환 (프로세스 전체에서 공유, 없으면 생성)
+
+    Args:
+        name: 대상 이름
+        failure_threshold: 새로 만들 때 사용할 연속 실패 임계값
+        cooldown: 새로 만들 때 사용할 쿨다운 (초)
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, failure_threshold, cooldown)
+            _breakers[name] = breaker
+        return breaker
+
+
+def call_with_policy(breaker: CircuitBreaker, func: Callable[..., Any], *args,
+                     attempts: int = 3,
+                     deadline: Optional[Deadline] = None,
+                     **kwargs) -> Any:
+    """
+    서킷 브레이커 + 재시도 정책으로 함수 호출
+
+    재시도를 모두 소진한 뒤에만 브레이커에 실패 1회로 기록됩니다.
+
+    Args:
+        breaker: 대상의 서킷 브레이커
+        func: 호출할 함수
+        attempts: 최대 시도 횟수
+        deadline: 전체 마감 시간
+
+    Raises:
+        CircuitOpenError: 브레이커가 열려 있는 경우
+        DeadlineExceeded: 마감 시간이 지난 경우
+    """
+    return breaker.call(retry_call, func, *args, attempts=attempts, deadline=deadline, **kwargs)
+
+
+def _wait_timeout(deadline: Deadline) -> Optional[float]:
+    """queue 대기 timeout (무제한 마감이면 None)"""
+    remaining = deadline.remaining()
+    return None if remaining == float('inf') else remaining
+
+
+_thread_hooks = threading.local()
+
+
+def set_thread_hook(hook: Optional[Callable[[Callable], Callable]]) -> Optional[Callable[[Callable], Callable]]:
+    """
+    이 스레드가 race/gather/stream/BackgroundTask로 시작하는 작업자 스레드의 실행 함수를 감쌀 훅 설정
+
+    예: 프로파일러가 측정을 시작한 스레드의 작업자 스레드만 측정 (다른 세션의 스레드는 그대로)
+
+    Args:
+        hook: 실행 함수를 받아 감싼 함수를 반환하는 함수 (None이면 해제)
+
+    Returns:
+        이전 훅 (복원용)
+    """
+    previous = getattr(_thread_hooks, 'hook', None)
+    _thread_hooks.hook = hook
+    return previous
+
+
+def _start_thread(target: Callable, args: tuple, name: str):
+    """daemon 작업자 스레드 시작 (이 스레드에 훅이 있으면 실행 함수를 감쌈)"""
+    hook = getattr(_thread_hooks, 'hook', None)
+    threading.Thread(target=hook(target) if hook else target, args=args, name=name, daemon=True).start()
+
+
+def race(tasks: Dict[str, Callable[[], Any]], deadline: Deadline) -> Optional[Tuple[str, Any]]:
+    """
+    여러 작업을 동시에 실행하고 먼저 성공한 결과 반환
+
+    작업은 daemon 스레드에서 실행되므로, 마감 시간이 지나도 끝나지 않은 작업이
+    프로세스 종료를 막지 않습니다. (각 작업은 자체 timeout으로 정리되어야 함)
+
+    Args:
+        tasks: {작업 이름: 인자 없는 호출 함수}
+        deadline: 결과를 기다리는 마감 시간
+
+    Returns:
+        tuple: (작업 이름, 결과) — None이 아닌 결과를 처음 반환한 작업.
+               모두 실패했거나 마감 시간이 지나면 None
+    """
+    results: "queue.Queue[Tuple[str, Any, Optional[BaseException]]]" = queue.Queue()
+
+    def _run(name: str, func: Callable[[], Any]):
+        try:
+            results.put((name, func(), None))
+        except Exception as e:
+            results.put((name, None, e))
+
+    for name, func in tasks.items():
+        _start_thread(_run, (name, func), f"race:{name}")
+
+    remaining = len(tasks)
+    while remaining and not deadline.expired():
+        try:
+            name, result, error = results.get(timeout=_wait_timeout(deadline))
+        except queue.Empty:
+            break
+        remaining -= 1
+        if error is not None:
+            print(f"{name} 작업 실패: {error}")
+            continue
+        if result is not None:
+            return name, result
+    return None
+
+
+def gather(tasks: Dict[str, Callable[[], Any]], deadline: Deadline) -> Dict[str, Tuple[Any, Optional[BaseException]]]:
+    """
+    여러 작업을 동시에 실행하고 마감 시간 안에 끝난 결과를 모두 반환
+
+    race()와 마찬가지로 daemon 스레드에서 실행됩니다.
+
+    Args:
+        tasks: {작업 이름: 인자 없는 호출 함수}
+        deadline: 결과를 기다리는 마감 시간
+
+    Returns:
+        dict: {작업 이름: (결과, 예외)} — 마감 시간까지 끝나지 않은 작업은
+              (None, DeadlineExceeded)
+    """
+    results: "queue.Queue[Tuple[str, Any, Optional[BaseException]]]" = queue.Queue()
+
+    def _run(name: str, func: Callable[[], Any]):
+        try:
+            results.put((name, func(), None))
+        except Exception as e:
+            results.put((name, None, e))
+
+    for name, func in tasks.items():
+        _start_thread(_run, (name, func), f"gather:{name}")
+
+    done: Dict[str, Tuple[Any, Optional[BaseException]]] = {}
+    while len(done) < len(tasks) and not deadline.expired():
+        try:
+            name, result, error = results.get(timeout=_wait_timeout(deadline))
+        except queue.Empty:
+            break
+        done[name] = (result, error)
+    for name in tasks:
+        done.setdefault(name, (None, DeadlineExceeded(f"{name} 작업이 마감 시간 안에 끝나지 않았습니다.")))
+    return done
+
+
+def stream(tasks: Dict[str, Callable[[], Any]], deadline: Deadline,
+           max_workers: int = 8) -> Iterator[Tuple[str, Any, Optional[BaseException]]]:
+    """
+    여러 작업을 최대 max_workers개씩 동시에 실행하고 끝나는 순서대로 결과를 내보내기
+
+    gather()와 달리 모든 작업을 기다리지 않으므로, 먼저 끝난 결과를 바로 다음 단계에서
+    처리할 수 있습니다. 마감 시간이 지나면 아직 시작하지 않은 작업은 실행하지 않습니다.
+
+    Args:
+        tasks: {작업 이름: 인자 없는 호출 함수}
+        deadline: 결과를 기다리는 마감 시간
+        max_workers: 동시에 실행할 최대 작업 수
+
+    Yields:
+        tuple: (작업 이름, 결과, 예외) — 마감 시간까지 끝나지 않은 작업은
+               (작업 이름, None, DeadlineExceeded)
+    """
+    results: "queue.Queue[Tuple[str, Any, Optional[BaseException]]]" = queue.Queue()
+    waiting = list(tasks.items())
+
+    def _run(name: str, func: Callable[[], Any]):
+        try:
+            results.put((name, func(), None))
+        except Exception as e:
+            results.put((name, None, e))
+
+    def _start_next():
+        name, func = waiting.pop(0)
+        _start_thread(_run, (name, func), f"stream:{name}")
+
+    for _ in range(min(max_workers, len(waiting))):
+        _start_next()
+
+    done = set()
+    while len(done) < len(tasks) and not deadline.expired():
+        try:
+            name, result, error = results.get(timeout=_wait_timeout(deadline))
+        except queue.Empty:
+            break
+        done.add(name)
+        if waiting and not deadline.expired():
+            _start_next()
+        yield name, result, error
+    for name in tasks:
+        if name not in done:
+            yield name, None, DeadlineExceeded(f"{name} 작업이 마감 시간 안에 끝나지 않았습니다.")
+
+
+class BackgroundTask:
+    """
+    daemon 스레드에서 바로 실행을 시작하고, 결과는 나중에 받는 작업
+
+    예: 인포그래픽 대체 이미지를 먼저 렌더링해 두고, 원격 생성이 실패했을 때만 사용
+    """
+
+    def __init__(self, func: Callable[[], Any], name: str = "background"):
+        self.name = name
+        self._done = threading.Event()
+        self._result: Any = None
+        self._error: Optional[BaseException] = None
+        _start_thread(self._run, (func,), f"background:{name}")
+
+    def _run(self, func: Callable[[], Any]):
+        try:
+            self._result = func()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self, deadline: Optional[Deadline] = None) -> Any:
+        """
+        작업 결과 기다리기
+
+        Args:
+            deadline: 기다릴 마감 시간 (없으면 끝날 때까지)
+
+        Raises:
+            DeadlineExceeded: 마감 시간까지 끝나지 않은 경우
+            Exception: 작업에서 발생한 예외
+        """
+        if not self._done.wait(_wait_timeout(deadline or Deadline(None))):
+            raise DeadlineExceeded(f"{self.name} 작업이 마감 시간 안에 끝나지 않았습니다.")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class CallBudget:
+    """
+    실행 단위에서 여러 작업이 함께 쓰는 외부 호출 예산
+
+    - max_concurrent: 동시에 진행 중인 호출 수 (API 속도 제한 대응)
+    - max_calls: 실행 전체의 최대 호출 수 (재시도는 한 번으로 셈)
+    - per_minute: 분당 최대 호출 시작 수 (호출 시작 간격을 고르게 벌림, 백필처럼 오래 도는 작업용)
+
+    중요도가 낮은 호출(예: 기사별 분석)은 reserve를 주어, 중요한 호출(전체 요약)을 위해
+    남겨둔 몫까지는 쓰지 않도록 합니다.
+    """
+
+    def __init__(self, max_calls: Optional[int] = None, max_concurrent: int = 4,
+                 per_minute: Optional[float] = None):
+        self.max_calls = max_calls
+        self.used = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._interval = 60.0 / per_minute if per_minute else 0.0
+        self._next_start = 0.0
+
+    def remaining(self) -> float:
+        """남은 호출 수 (무제한이면 inf)"""
+        if self.max_calls is None:
+            return float('inf')
+        with self._lock:
+            return max(0, self.max_calls - self.used)
+
+    def take(self, reserve: int = 0) -> bool:
+        """
+        호출 1회분 차감
+
+        Args:
+            reserve: 남겨둘 호출 수 (남은 호출이 이보다 많을 때만 차감)
+
+        Returns:
+            bool: 차감했으면 True
+        """
+        with self._lock:
+            if self.max_calls is not None and self.max_calls - self.used <= reserve:
+                return False
+            self.used += 1
+            return True
+
+    def _wait_for_rate(self, deadline: Deadline):
+        """분당 호출 수 제한에 맞춰 다음 시작 시각까지 대기"""
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+        if start - now > deadline.remaining():
+            raise DeadlineExceeded("호출 속도 제한을 기다리다 마감 시간이 지났습니다.")
+        time.sleep(start - now)
+
+    @contextmanager
+    def slot(self, reserve: int = 0, deadline: Optional[Deadline] = None):
+        """
+        호출 1회분을 차감하고 동시 실행 자리를 얻은 뒤 (속도 제한이 있으면 차례를 기다려) 실행
+
+        Raises:
+            BudgetExhausted: 남은 호출이 없는 경우
+            DeadlineExceeded: 마감 시간까지 자리나 차례가 오지 않은 경우
+        """
+        deadline = deadline or Deadline(None)
+        if not self.take(reserve):
+            raise BudgetExhausted(f"호출 예산이 부족합니다 (사용 {self.used}/{self.max_calls}회, 남겨둘 호출 {reserve}회)")
+        if not self._slots.acquire(timeout=_wait_timeout(deadline)):
+            raise DeadlineExceeded("호출 자리를 기다리다 마감 시간이 지났습니다.")
+        try:
+            self._wait_for_rate(deadline)
+            yield
+        finally:
+            self._slots.release()
@@ -0,0 +1,162 @@
+"""
+빠른 RSS/Atom 파서 (iterparse 스트리밍, 실패 시 feedparser로 대체)
+
+fetch_rss_news는 항목의 제목/링크/요약/발행일만 사용하고 앞쪽 몇 개만 필요하므로,
+문서 전체를 feedparser의 풍부한 구조로 만들지 않고 필요한 필드만 뽑은 뒤
+max_items개를 채우면 바로 멈춥니다.
+
+지원 형식: RSS 2.0, RSS 1.0(RDF), Atom 1.0
+XML 문법 오류(정의되지 않은 HTML 엔티티 등)가 있거나 항목을 찾지 못하면 feedparser를 사용합니다.
+"""
+import datetime
+import io
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional
+
+import feedparser
+
+from utils_prompt import parse_published
+
+
+_ITEM_TAGS = {'item', 'entry'}
+_FEED_ROOTS = {'rss', 'RDF', 'feed'}
+# 같은 필드에 여러 태그가 있으면 앞쪽 태그를 우선 사용
+_SUMMARY_TAGS = ('description', 'summary', 'encoded', 'content')
+_PUBLISHED_TAGS = ('pubDate', 'published', 'date', 'updated', 'issued', 'modified')
+
+
+class FeedFormatError(ValueError):
+    """빠른 파서가 처리할 수 없는 문서 (feedparser로 대체)"""
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _entry_link(element: ET.Element) -> str:
+    """RSS의 <link>텍스트</link> 또는 Atom의 <link rel="alternate" href="..."/>"""
+    fallback = ''
+    for child in element:
+        if _local_name(child.tag) != 'link':
+            continue
+        href = child.get('href')
+        if href is None:
+            if child.text and child.text.strip():
+                return child.text.strip()
+            continue
+        if child.get('rel', 'alternate') == 'alternate':
+            return href
+        fallback = fallback or href
+    if not fallback:
+        # RSS 2.0에서 <link>가 없고 permalink guid만 있는 경우
+        for child in element:
+            if _local_name(child.tag) == 'guid' and child.get('isPermaLink', 'true') == 'true' and child.text:
+                return child.text.strip()
+    return fallback
+
+
+def _element_fields(element: ET.Element) -> Dict[str, str]:
+    """항목 요소에서 필요한 필드의 텍스트만 추출 (같은 태그는 처음 것)"""
+    fields: Dict[str, str] = {}
+    for child in element:
+        name = _local_name(child.tag)
+        if name in fields:
+            continue
+        text = ''.join(child.itertext()) if len(child) else (child.text or '')
+        fields[name] = text.strip()
+    return fields
+
+
+def _make_entry(title: str, link: str, summary: str, published: str,
+                published_at: Optional[datetime.datetime]) -> Dict[str, Any]:
+    return {
+        'title': title,
+        'link': link,
+        'summary': summary,
+        'published': published,
+        'published_at': published_at,
+    }
+
+
+def parse_fast(content: bytes, max_items: int) -> List[Dict[str, Any]]:
+    """
+    iterparse로 앞쪽 max_items개 항목만 추출
+
+    Args:
+        content: 피드 문서 bytes
+        max_items: 최대 항목 수
+
+    Returns:
+        list: 항목 목록 (title, link, summary, published, published_at)
+
+    Raises:
+        FeedFormatError: XML 오류이거나 RSS/Atom 문서가 아닌 경우, 항목을 찾지 못한 경우
+    """
+    entries: List[Dict[str, Any]] = []
+    depth = 0
+    root_checked = False
+    try:
+        for event, element in ET.iterparse(io.BytesIO(content), events=('start', 'end')):
+            name = _local_name(element.tag)
+            if event == 'start':
+                if not root_checked:
+                    if name not in _FEED_ROOTS:
+                        raise FeedFormatError(f"RSS/Atom 문서가 아닙니다 (<{name}>)")
+                    root_checked = True
+                if name in _ITEM_TAGS:
+                    depth += 1
+                continue
+
+            if name not in _ITEM_TAGS or depth != 1:
+                if name in _ITEM_TAGS:
+                    depth -= 1
+                continue
+            depth -= 1
+
+            fields = _element_fields(element)
+            summary = next((fields[tag] for tag in _SUMMARY_TAGS if fields.get(tag)), '')
+            published = next((fields[tag] for tag in _PUBLISHED_TAGS if fields.get(tag)), '')
+            entries.append(_make_entry(fields.get('title', ''), _entry_link(element), summary,
+                                       published, parse_published(published)))
+            # 처리한 항목은 바로 비워서 메모리를 일정하게 유지
+            element.clear()
+            if len(entries) >= max_items:
+                break
+    except ET.ParseError as e:
+        raise FeedFormatError(f"XML 파싱 오류: {e}")
+
+    if not entries:
+        # 빠른 파서가 모르는 형식일 수 있으므로 feedparser로 다시 확인하도록 함
+        raise FeedFormatError("항목을 찾을 수 없습니다.")
+    return entries
+
+
+def parse_with_feedparser(content: bytes, max_items: int) -> List[Dict[str, Any]]:
+    """feedparser로 파싱 (느리지만 깨진 문서도 최대한 처리)"""
+    feed = feedparser.parse(content)
+    entries = []
+    for entry in feed.entries[:max_items]:
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        published_at = datetime.datetime(*parsed[:6], tzinfo=datetime.timezone.utc) if parsed else None
+        entries.append(_make_entry(entry.get('title', ''), entry.get('link', ''),
+                                   entry.get('summary', entry.get('description', '')),
+                                   entry.get('published', ''), published_at))
+    return entries
+
+
+def parse_feed(content: bytes, max_items: int = 10) -> List[Dict[str, Any]]:
+    """
+    피드 문서에서 앞쪽 max_items개 항목 추출 (빠른 파서 → 실패 시 feedparser)
+
+    Args:
+        content: 피드 문서 bytes
+        max_items: 최대 항목 수
+
+    Returns:
+        list: 항목 목록 (title, link, summary, published, published_at)
+    """
+    try:
+        return parse_fast(content, max_items)
+    except FeedFormatError as e:
+        print(f"빠른 RSS 파서 실패, feedparser 사용: {e}")
+        return parse_with_feedparser(content, max_items)
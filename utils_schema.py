@@ -0,0 +1,165 @@
+"""
+news_data.json 날짜별 레코드 스키마 및 마이그레이션
+
+스키마 버전 2 (날짜별 레코드):
+{
+    "schema_version": 2,
+    "summary": "...",
+    "keywords": ["..."],
+    "trends": "...",
+    "image_path": "images/2025/12/2025-12-06.png",
+    "articles": [
+        {
+            "title": "...",
+            "link": "https://...",
+            "summary": "...",          # 정규화된 RSS 요약 (한 번만 저장)
+            "published": "...",        # 있는 경우만
+            "source": "www.bloter.net",# 있는 경우만
+            "ai_analysis": "...",      # 실제 AI 분석이 있는 경우만 (요약 복사본은 저장하지 않음)
+            "related": [               # 이전 날짜의 관련 보도가 있는 경우만 (이어지는 이야기)
+                {"title": "...", "link": "https://...", "date": "2025-12-05"}
+            ]
+        }
+    ],
+    "topics": [                        # 주제별 기사 묶음 (없을 수 있음)
+        {"label": "대표 기사 제목", "articles": [0, 3, 7]}   # articles의 인덱스, 첫 항목이 대표 기사
+    ],
+    "groups": {                        # 피드 그룹별 브리핑 (feeds.json의 groups, 없을 수 있음)
+        "해외 테크": {"summary": "...", "keywords": [...], "trends": "...", "image_path": "...",
+                    "articles": [...], "topics": [...]}
+    }
+}
+
+최상위 필드는 그룹이 지정되지 않은 피드(기본 그룹)의 브리핑입니다.
+
+버전 1은 모든 기사에 summary와 그 복사본(summary[:300] 또는 전체)인 ai_analysis를 함께 저장했습니다.
+화면에 표시할 텍스트는 article_display_text()로 렌더링 시점에 만듭니다.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils_text import truncate_text
+
+
+SCHEMA_VERSION = 2
+DISPLAY_SUMMARY_CHARS = 300
+EMPTY_SUMMARY = '요약 없음'
+
+_OPTIONAL_ARTICLE_FIELDS = ('published', 'source', 'related')
+
+
+def make_article(news: Dict[str, Any], ai_analysis: Optional[str] = None) -> Dict[str, Any]:
+    """
+    수집된 뉴스 항목을 저장용 기사 레코드로 변환 (빈 필드와 중복 텍스트는 저장하지 않음)
+
+    Args:
+        news: fetch_rss_news가 반환한 뉴스 항목
+        ai_analysis: 기사별 AI 분석 (요약과 다른 실제 분석 결과만)
+
+    Returns:
+        dict: 기사 레코드
+    """
+    article = {
+        'title': news.get('title', '제목 없음'),
+        'link': news.get('link', ''),
+        'summary': news.get('summary', '') or EMPTY_SUMMARY,
+    }
+    for field in _OPTIONAL_ARTICLE_FIELDS:
+        if news.get(field):
+            article[field] = news[field]
+    if ai_analysis and ai_analysis != article['summary']:
+        article['ai_analysis'] = ai_analysis
+    return article
+
+
+def article_display_text(article: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    기사 카드에 표시할 (제목 라벨, 본문) 반환
+
+    AI 분석이 있으면 그대로, 없으면 요약을 표시 길이로 잘라서 보여줍니다.
+    """
+    if article.get('ai_analysis'):
+        return 'AI 분석', article['ai_analysis']
+    summary = article.get('summary') or EMPTY_SUMMARY
+    return '요약', truncate_text(summary, DISPLAY_SUMMARY_CHARS)
+
+
+def group_articles(day: Dict[str, Any]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    날짜별 레코드의 기사를 주제별로 묶어서 반환
+
+    기사가 2개 이상인 주제는 (주제 이름, 기사 목록)으로, 나머지 기사는
+    마지막에 ('', 기사 목록) 하나로 모읍니다. topics가 없으면 전체가 한 묶음입니다.
+
+    Returns:
+        list: (주제 이름, 기사 목록) 목록
+    """
+    articles = day.get('articles', [])
+    groups = []
+    grouped = set()
+    for topic in day.get('topics', []):
+        indices = [i for i in topic.get('articles', [])
+                   if isinstance(i, int) and 0 <= i < len(articles) and i not in grouped]
+        if len(indices) < 2:
+            continue
+        grouped.update(indices)
+        groups.append((topic.get('label') or articles[indices[0]].get('title', ''), [articles[i] for i in indices]))
+    rest = [article for i, article in enumerate(articles) if i not in grouped]
+    if rest:
+        groups.append(('', rest))
+    return groups
+
+
+def group_briefings(day: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    날짜별 레코드의 브리핑 목록 (기본 그룹 → 피드 그룹 이름 순)
+
+    Returns:
+        list: (그룹 이름, 브리핑 레코드) 목록 — 기본 그룹의 이름은 '' 이고,
+              기본 그룹은 요약이나 기사가 있을 때만 포함
+    """
+    briefings = []
+    if day.get('summary') or day.get('articles'):
+        briefings.append(('', day))
+    for name in sorted(day.get('groups', {})):
+        if isinstance(day['groups'][name], dict):
+            briefings.append((name, day['groups'][name]))
+    return briefings
+
+
+def _is_summary_copy(ai_analysis: str, summary: str) -> bool:
+    """버전 1에서 요약을 복사해 만든 ai_analysis인지 확인"""
+    if not ai_analysis or ai_analysis == EMPTY_SUMMARY:
+        return True
+    if ai_analysis == summary:
+        return True
+    return ai_analysis.endswith('...') and summary.startswith(ai_analysis[:-3])
+
+
+def migrate_day(day: Dict[str, Any]) -> bool:
+    """
+    날짜별 레코드를 현재 스키마로 변환 (제자리에서 수정)
+
+    Returns:
+        bool: 변경되었으면 True
+    """
+    if day.get('schema_version', 1) >= SCHEMA_VERSION:
+        return False
+    articles = []
+    for article in day.get('articles', []):
+        ai_analysis = article.get('ai_analysis', '')
+        if _is_summary_copy(ai_analysis, article.get('summary', '')):
+            ai_analysis = None
+        articles.append(make_article(article, ai_analysis))
+    day['articles'] = articles
+    day['schema_version'] = SCHEMA_VERSION
+    return True
+
+
+def migrate_news_data(news_data: Dict[str, Any]) -> int:
+    """
+    news_data.json 전체를 현재 스키마로 변환 (제자리에서 수정)
+
+    Returns:
+        int: 변환된 날짜 수
+    """
+    return sum(1 for day in news_data.values() if isinstance(day, dict) and migrate_day(day))
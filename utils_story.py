@@ -0,0 +1,227 @@
+"""
+여러 날에 걸친 이야기 추적 (MinHash + LSH 유사도 인덱스)
+
+- 기사 제목/요약 앞부분의 토큰 집합으로 MinHash 서명을 만들고
+- 서명을 BANDS개 구간으로 나눈 버킷(LSH)에서 후보만 비교하므로
+  인덱스 크기와 관계없이 기사당 조회 비용이 거의 일정함
+- 인덱스는 data/story_index.json에 저장 (버킷은 로드할 때 서명으로 다시 만듦)
+
+인덱스 파일 형식:
+{
+    "version": 1,
+    "num_perm": 64,
+    "bands": 32,
+    "articles": {
+        "기사 ID": {"date": "2025-12-06", "title": "...", "link": "...", "sig": "base64 서명"}
+    }
+}
+"""
+import base64
+import datetime
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils_cluster import tokenize
+from utils_insights import article_id
+
+
+STORY_INDEX_PATH = "data/story_index.json"
+STORY_INDEX_VERSION = 1
+NUM_PERM = 64                 # MinHash 서명 길이
+BANDS = 32                    # LSH 구간 수 (구간당 NUM_PERM / BANDS개 값)
+RELATED_THRESHOLD = 0.2       # 이어지는 이야기로 볼 최소 추정 Jaccard 유사도
+MAX_RELATED = 3               # 기사당 저장할 이전 보도 수
+STORY_WINDOW_DAYS = 14        # 인덱스에 유지할 기간 (일)
+SHINGLE_SUMMARY_CHARS = 200   # 서명에 사용할 요약 앞부분 글자 수
+
+# 어느 기사에나 나오는 영어 기능어 (서명에서 제외)
+_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'from', 'that', 'this', 'are', 'was', 'were', 'its', 'has', 'have',
+    'will', 'can', 'not', 'but', 'you', 'your', 'our', 'their', 'into', 'about', 'more', 'new',
+    'in', 'on', 'of', 'to', 'at', 'by', 'as', 'is', 'it', 'an', 'or', 'be', 'we', 'how', 'why', 'what',
+}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# 고정 시드: 서명이 실행마다 같아야 저장된 인덱스와 비교할 수 있음
+_rng = np.random.RandomState(20251206)
+_PERM_A = _rng.randint(1, _MAX_HASH, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, _MAX_HASH, size=NUM_PERM, dtype=np.uint64)
+
+
+def _shingles(news: Dict[str, Any]) -> set:
+    summary = str(news.get('summary', ''))[:SHINGLE_SUMMARY_CHARS]
+    return (set(tokenize(news.get('title', ''))) | set(tokenize(summary))) - _STOPWORDS
+
+
+def minhash_signature(news: Dict[str, Any]) -> Optional[np.ndarray]:
+    """
+    기사의 MinHash 서명
+
+    Returns:
+        np.ndarray: uint32 NUM_PERM개 (토큰이 없으면 None)
+    """
+    shingles = _shingles(news)
+    if not shingles:
+        return None
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles],
+        dtype=np.uint64
+    )
+    # (a * x + b) mod p 를 32비트로 줄인 값의 최솟값 (a, x, b < 2^32 이므로 uint64 안에서 넘치지 않음)
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % np.uint64(_MERSENNE_PRIME) & np.uint64(_MAX_HASH)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def _encode_signature(signature: np.ndarray) -> str:
+    return base64.b64encode(signature.astype('<u4').tobytes()).decode('ascii')
+
+
+def _decode_signature(value: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(value), dtype='<u4').astype(np.uint32)
+
+
+def _band_keys(signature: np.ndarray) -> List[str]:
+    rows = NUM_PERM // BANDS
+    return [f"{band}:{signature[band * rows:(band + 1) * rows].tobytes().hex()}" for band in range(BANDS)]
+
+
+class StoryIndex:
+    """기사 서명과 LSH 버킷"""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            data: story_index.json 내용 (형식이 다르거나 없으면 빈 인덱스)
+        """
+        data = data or {}
+        compatible = (data.get('version') == STORY_INDEX_VERSION
+                      and data.get('num_perm') == NUM_PERM and data.get('bands') == BANDS)
+        self.articles: Dict[str, Dict[str, Any]] = dict(data.get('articles', {})) if compatible else {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[str, List[str]] = defaultdict(list)
+        for news_id, entry in self.articles.items():
+            self._add_to_buckets(news_id, _decode_signature(entry['sig']))
+
+    def _add_to_buckets(self, news_id: str, signature: np.ndarray):
+        self._signatures[news_id] = signature
+        for key in _band_keys(signature):
+            self._buckets[key].append(news_id)
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def add(self, news: Dict[str, Any], date: str) -> bool:
+        """
+        기사를 인덱스에 추가 (이미 있는 기사는 처음 본 날짜를 유지)
+
+        Returns:
+            bool: 새로 추가되었으면 True
+        """
+        news_id = article_id(news)
+        if news_id in self.articles:
+            return False
+        signature = minhash_signature(news)
+        if signature is None:
+            return False
+        self.articles[news_id] = {
+            'date': date,
+            'title': news.get('title', ''),
+            'link': news.get('link', ''),
+            'sig': _encode_signature(signature),
+        }
+        self._add_to_buckets(news_id, signature)
+        return True
+
+    def query(self, news: Dict[str, Any], before: str,
+              threshold: float = RELATED_THRESHOLD, limit: int = MAX_RELATED) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        이전 날짜의 비슷한 기사 찾기
+
+        Args:
+            news: 기준 기사
+            before: 이 날짜("YYYY-MM-DD")보다 이전 기사만 찾음
+            threshold: 최소 추정 Jaccard 유사도
+            limit: 최대 결과 수
+
+        Returns:
+            list: (유사도, 인덱스 항목) 목록, 유사도 내림차순
+        """
+        signature = minhash_signature(news)
+        if signature is None:
+            return []
+        own_id = article_id(news)
+        candidates = set()
+        for key in _band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+
+        matches = []
+        for news_id in candidates:
+            entry = self.articles[news_id]
+            if news_id == own_id or entry['date'] >= before:
+                continue
+            similarity = float(np.mean(self._signatures[news_id] == signature))
+            if similarity >= threshold:
+                matches.append((similarity, entry))
+        matches.sort(key=lambda item: (-item[0], item[1]['date']))
+        return matches[:limit]
+
+    def prune(self, today: str, window_days: int = STORY_WINDOW_DAYS) -> int:
+        """
+        오래된 기사 제거
+
+        Returns:
+            int: 제거된 기사 수
+        """
+        cutoff = (datetime.date.fromisoformat(today) - datetime.timedelta(days=window_days)).isoformat()
+        stale = [news_id for news_id, entry in self.articles.items() if entry['date'] < cutoff]
+        if not stale:
+            return 0
+        for news_id in stale:
+            del self.articles[news_id]
+            del self._signatures[news_id]
+        stale_ids = set(stale)
+        for key in list(self._buckets):
+            ids = [news_id for news_id in self._buckets[key] if news_id not in stale_ids]
+            if ids:
+                self._buckets[key] = ids
+            else:
+                del self._buckets[key]
+        return len(stale)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': STORY_INDEX_VERSION,
+            'num_perm': NUM_PERM,
+            'bands': BANDS,
+            'articles': self.articles,
+        }
+
+
+def link_related_stories(news_list: List[Dict[str, Any]], index: StoryIndex, date: str) -> int:
+    """
+    기사마다 이전 날짜의 관련 보도를 찾아 'related'에 기록하고, 기사를 인덱스에 추가 (제자리에서 수정)
+
+    Args:
+        news_list: 오늘 기사 리스트
+        index: 이야기 인덱스
+        date: 오늘 날짜 ("YYYY-MM-DD")
+
+    Returns:
+        int: 이어지는 이야기로 연결된 기사 수
+    """
+    linked = 0
+    for news in news_list:
+        matches = index.query(news, before=date)
+        if matches:
+            news['related'] = [
+                {'title': entry['title'], 'link': entry['link'], 'date': entry['date']}
+                for _, entry in matches
+            ]
+            linked += 1
+    for news in news_list:
+        index.add(news, date)
+    return linked
@@ -0,0 +1,143 @@
+"""
+RSS 기사 텍스트 정규화 (HTML 제거, 공백 정리, 상투 문구 제거, 길이 제한)
+"""
+import html
+import math
+import re
+from typing import Optional
+
+
+SUMMARY_MAX_CHARS = 500    # 저장/프롬프트에 사용할 요약 최대 글자 수
+SUMMARY_MAX_TOKENS = 300   # 저장/프롬프트에 사용할 요약 최대 토큰 수 (추정치)
+ELLIPSIS = '…'
+
+_DROP_BLOCKS = re.compile(r'<(script|style|noscript|iframe|figure|figcaption)\b.*?</\1\s*>', re.I | re.S)
+_COMMENTS = re.compile(r'<!--.*?-->', re.S)
+_BLOCK_TAGS = re.compile(r'<\s*/?\s*(br|p|div|li|ul|ol|h[1-6]|tr|td|blockquote|section|article)\b[^>]*>', re.I)
+_TAGS = re.compile(r'<[^>]*>')
+_UNCLOSED_TAG = re.compile(r'<[^>]*$')
+_URLS = re.compile(r'https?://\S+')
+_WHITESPACE = re.compile(r'\s+')
+# 붙어 버린 문장 경계: 한글 문장 끝 또는 소문자 단어 끝 + 한글/대문자로 시작하는 단어
+# (U.S.A, Node.JS, v1.2B 같은 약어/버전 표기와 Amazon.Com 같은 도메인은 그대로 둠)
+_SENTENCE_GLUE = re.compile(r'(?<=[가-힣])[.!?](?=[가-힣0-9])'
+                            r'|(?<=[a-z가-힣)\]"”’])[.!?](?=[가-힣]|[A-Z][a-z])'
+                            r'(?!(?i:com|net|org|io|ai|co|kr|dev|app|edu|gov)\b)')
+
+# 피드마다 붙는 상투 문구 (본문 정보가 없는 꼬리말)
+_BOILERPLATE = [
+    re.compile(r'The post .{0,300}? appeared first on .{0,200}?\.?$', re.I),
+    # 본문 뒤의 마지막 문장이 이 문구로 시작하거나 (짧은 꼬리만 허용), 문구로 끝나는 경우만
+    # (문구로 시작하는 요약이나 본문 중간의 "read more"는 유지)
+    re.compile(r'(?<=[.!?…])\s*\b(Continue reading|Read more|Read the full story|Keep reading)\b.{0,80}$', re.I),
+    re.compile(r'\b(Continue reading|Read more|Read the full story|Keep reading)\b\W{0,5}$', re.I),
+    re.compile(r'(\[\s*(…|\.\.\.|&hellip;)\s*\]|\[\s*더보기\s*\])\s*$'),
+    re.compile(r'(ⓒ|©|Copyright).{0,80}?(무단\s*전재|재배포|All rights reserved).*$', re.I),
+    re.compile(r'(무단\s*전재\s*및\s*재배포\s*금지).*$'),
+    re.compile(r'(기사\s*원문\s*보기|원문\s*보기|더\s*보기)\s*$'),
+]
+
+_HANGUL_OR_CJK = re.compile(r'[ᄀ-ᇿ㄰-㆏가-힣぀-ヿ一-鿿]')
+
+
+def strip_html(text: str) -> str:
+    """
+    HTML 마크업을 제거하고 평문으로 변환
+
+    Args:
+        text: HTML이 섞인 문자열
+
+    Returns:
+        str: 태그/엔티티가 제거되고 공백이 정리된 문자열
+    """
+    if not text:
+        return ''
+    text = _COMMENTS.sub(' ', text)
+    text = _DROP_BLOCKS.sub(' ', text)
+    text = _BLOCK_TAGS.sub(' ', text)
+    text = _TAGS.sub('', text)
+    text = _UNCLOSED_TAG.sub('', text)
+    text = html.unescape(text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def remove_boilerplate(text: str) -> str:
+    """피드 꼬리말(원문 보기, 저작권 문구 등) 제거"""
+    for pattern in _BOILERPLATE:
+        text = pattern.sub('', text).strip()
+    return text
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    LLM 토큰 수 추정 (토크나이저 없이 빠르게 계산)
+
+    한글/한자는 글자당 약 0.7토큰, 그 외(영문, 숫자, 공백)는 4글자당 약 1토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    cjk = len(_HANGUL_OR_CJK.findall(text))
+    return math.ceil(cjk * 0.7 + (len(text) - cjk) / 4)
+
+
+def truncate_text(text: str, max_chars: int, max_tokens: Optional[int] = None) -> str:
+    """
+    글자 수/토큰 수 상한에 맞춰 문장 또는 단어 경계에서 자르기
+
+    Args:
+        text: 원본 문자열
+        max_chars: 최대 글자 수
+        max_tokens: 최대 토큰 수 (추정치, 선택적)
+
+    Returns:
+        str: 잘린 경우 끝에 '…'가 붙은 문자열
+    """
+    if max_tokens is not None:
+        # 토큰 밀도에 비례해서 글자 수 상한을 줄임
+        tokens = estimate_tokens(text)
+        if tokens > max_tokens:
+            max_chars = min(max_chars, int(len(text) * max_tokens / tokens))
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max_chars]
+    sentence_end = max(cut.rfind('. '), cut.rfind('? '), cut.rfind('! '))
+    if sentence_end >= max_chars * 0.6:
+        return cut[:sentence_end + 1].rstrip()
+    space = cut.rfind(' ')
+    if space >= max_chars * 0.6:
+        cut = cut[:space]
+    return cut.rstrip(' ,.;:') + ELLIPSIS
+
+
+def normalize_title(text: str) -> str:
+    """기사 제목 정규화 (HTML 제거, 공백 정리)"""
+    return strip_html(text) or '제목 없음'
+
+
+def normalize_summary(text: str, max_chars: int = SUMMARY_MAX_CHARS,
+                      max_tokens: Optional[int] = SUMMARY_MAX_TOKENS) -> str:
+    """
+    RSS 요약을 저장/프롬프트용 평문으로 정규화
+
+    - HTML 태그, 트래킹 이미지, 스크립트 제거
+    - HTML 엔티티 변환 및 공백 정리
+    - 붙어버린 문장 사이에 공백 추가 (예: "완료했다.6일" → "완료했다. 6일")
+    - 상투 문구와 URL 제거
+    - 글자 수/토큰 수 상한 적용
+
+    Args:
+        text: feedparser의 summary/description 원문
+        max_chars: 최대 글자 수
+        max_tokens: 최대 토큰 수 (추정치)
+
+    Returns:
+        str: 정규화된 요약 (내용이 없으면 '요약 없음')
+    """
+    text = strip_html(text)
+    text = _URLS.sub('', text)
+    text = _SENTENCE_GLUE.sub(r'\g<0> ', text)
+    text = remove_boilerplate(_WHITESPACE.sub(' ', text).strip())
+    if not text:
+        return '요약 없음'
+    return truncate_text(text, max_chars, max_tokens)